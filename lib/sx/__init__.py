@@ -109,6 +109,9 @@ class ArchiveLayout:
         rstring += "Extracted Report Path:    %s\n" %(self.getPathToExtractedReports())
         rstring += "Compressed Report Path:   %s\n" %(self.getPathToCompressedReports())
         rstring += "Non-Report Path:          %s\n" %(self.getPathToNonReportFiles())
+        rstring += "Content Store Path:       %s\n" %(self.getPathToContentStore())
+        rstring += "Fingerprint Index Path:   %s\n" %(self.getPathToFingerprintIndex())
+        rstring += "Trash Path:               %s\n" %(self.getPathToTrash())
         return rstring
 
     def getPathToArchiveRoot(self) :
@@ -166,6 +169,36 @@ class ArchiveLayout:
         """
         return  os.path.join(os.path.join(os.path.join(self.getPathToArchiveRoot(), "ereports"), self.getUID()), "files")
 
+    def getPathToContentStore(self):
+        """
+        Returns the path to the content store directory which is shared
+        by all the extracted reports in the archive.
+
+        @return: Returns the path to the content store directory.
+        @rtype: String
+        """
+        return  os.path.join(self.getPathToArchiveRoot(), "cstore")
+
+    def getPathToFingerprintIndex(self):
+        """
+        Returns the path to the index of the fingerprints of the report
+        files that were extracted to the archive.
+
+        @return: Returns the path to the fingerprint index file.
+        @rtype: String
+        """
+        return  os.path.join(self.getPathToArchiveRoot(), "fingerprints.json")
+
+    def getPathToTrash(self):
+        """
+        Returns the path to the directory that the temporary directories
+        are moved to so that they are removed in the background.
+
+        @return: Returns the path to the trash directory.
+        @rtype: String
+        """
+        return  os.path.join(self.getPathToArchiveRoot(), ".sx_trash")
+
 class ArchivedLayout(ArchiveLayout):
     """
     This class takes an existing extracted reports path and creates
@@ -241,6 +274,26 @@ class ModifiedArchiveLayout(ArchiveLayout):
         """
         return  os.path.join(os.path.join(self.getPathToArchiveRoot(), self.getUID()), "files")
 
+    def getPathToContentStore(self):
+        """
+        Returns the path to the content store directory which is shared
+        by all the extracted reports in the archive.
+
+        @return: Returns the path to the content store directory.
+        @rtype: String
+        """
+        return  os.path.join(self.getPathToArchiveRoot(), ".cstore")
+
+    def getPathToFingerprintIndex(self):
+        """
+        Returns the path to the index of the fingerprints of the report
+        files that were extracted to the archive.
+
+        @return: Returns the path to the fingerprint index file.
+        @rtype: String
+        """
+        return  os.path.join(self.getPathToArchiveRoot(), ".fingerprints.json")
+
 class ModifiedArchivedLayout(ModifiedArchiveLayout):
     """
     This class takes an existing extracted reports path and creates
@@ -19,22 +19,33 @@ import logging
 import subprocess
 import shutil
 import time
+import tempfile
+import fnmatch
 
 import sx
 from sx.logwriter import LogWriter
+from sx.extractors.lib.memberindex import MemberIndexCache
 
 class Extractor :
-    """
-    @cvar PATH_TO_TEMP_DIR: This is the path to directory that will
-    @type PATH_TO_TEMP_DIR: String
-    """
-    PATH_TO_TEMP_DIR = "/tmp/sx-%s" %(time.strftime(sx.UID_TIMESTAMP))
+    # The path to the temporary directory of this process. It is created
+    # the first time it is needed so that each run has its own directory.
+    __pathToTempDir = None
 
     def __init__(self, name, pathToFile, pathToCommand):
         # Descriptive name of extractor
         self.__name = name
         self.__pathToFile = pathToFile
         self.__pathToCommand = pathToCommand
+        # The list of path globs for the files that will be extracted. None
+        # means that all the files will be extracted.
+        self.__listOfIncludePathGlobs = None
+        # The policy for the files that will not be extracted. None means
+        # that no files are skipped.
+        self.__exclusionPolicy = None
+        # The store that the files are added to so that identical files are
+        # only written once. None means the files are written to the
+        # report.
+        self.__contentStore = None
 
     def __str__(self):
         rstring = "%s: %s" %(self.getName(), self.getPathToFile())
@@ -49,7 +60,143 @@ class Extractor :
     def getPathToCommand(self):
         return self.__pathToCommand
 
+    def setPathToFile(self, pathToFile):
+        """
+        Sets the path to the archive file. This is used when the archive
+        file is moved after it has been extracted. The index of the
+        archive file is moved as well.
+
+        @param pathToFile: The new path to the archive file.
+        @type pathToFile: String
+        """
+        MemberIndexCache.rename(self.__pathToFile, pathToFile)
+        self.__pathToFile = pathToFile
+
+    def getIncludePathGlobs(self):
+        """
+        Returns the list of path globs for the files that will be
+        extracted. The paths are relative to the root directory of the
+        report. None is returned if all the files will be extracted.
+
+        @return: Returns the list of path globs for the files that will
+        be extracted.
+        @rtype: Array
+        """
+        return self.__listOfIncludePathGlobs
+
+    def setIncludePathGlobs(self, listOfIncludePathGlobs):
+        """
+        Sets the list of path globs for the files that will be
+        extracted. The paths are relative to the root directory of the
+        report. If None then all the files will be extracted.
+
+        @param listOfIncludePathGlobs: The list of path globs for the
+        files that will be extracted.
+        @type listOfIncludePathGlobs: Array
+        """
+        self.__listOfIncludePathGlobs = listOfIncludePathGlobs
+
+    def isIncluded(self, pathToFileInExtractor):
+        """
+        Returns True if the path matches one of the include path globs
+        or there are no include path globs. A directory matches if
+        all of the files in the directory match("etc/cluster/*"
+        matches the directory "etc/cluster").
+
+        @return: Returns True if the path matches one of the include
+        path globs.
+        @rtype: Boolean
+
+        @param pathToFileInExtractor: The path to the file, which is
+        relative to the root directory of the report.
+        @type pathToFileInExtractor: String
+        """
+        if (self.__listOfIncludePathGlobs == None):
+            return True
+        pathToFileInExtractor = pathToFileInExtractor.strip("/")
+        for pathGlob in self.__listOfIncludePathGlobs:
+            if ((fnmatch.fnmatch(pathToFileInExtractor, pathGlob)) or
+                ((pathGlob.endswith("/*")) and (pathToFileInExtractor == pathGlob[:-2]))):
+                return True
+        return False
+
+    def getExclusionPolicy(self):
+        """
+        Returns the policy for the files that will not be extracted.
+        None is returned if no files are skipped.
+
+        @return: Returns the policy for the files that will not be
+        extracted.
+        @rtype: ExclusionPolicy
+        """
+        return self.__exclusionPolicy
+
+    def setExclusionPolicy(self, exclusionPolicy):
+        """
+        Sets the policy for the files that will not be extracted. If
+        None then no files are skipped.
+
+        @param exclusionPolicy: The policy for the files that will not
+        be extracted.
+        @type exclusionPolicy: ExclusionPolicy
+        """
+        self.__exclusionPolicy = exclusionPolicy
+
+    def getContentStore(self):
+        """
+        Returns the store that the extracted files are added to. None is
+        returned if the files are written to the report.
+
+        @return: Returns the store that the extracted files are added
+        to.
+        @rtype: ContentStore
+        """
+        return self.__contentStore
+
+    def setContentStore(self, contentStore):
+        """
+        Sets the store that the extracted files are added to so that
+        identical files are only written once. If None then the files
+        are written to the report.
+
+        @param contentStore: The store that the extracted files are
+        added to.
+        @type contentStore: ContentStore
+        """
+        self.__contentStore = contentStore
+
+    def getMemberIndex(self):
+        """
+        Returns the index of the members in the archive file. The index
+        is created the first time it is needed and then cached for the
+        rest of the run. None is returned if the index cannot be
+        created.
+
+        @return: Returns the index of the members in the archive file.
+        @rtype: MemberIndex
+        """
+        memberIndex = MemberIndexCache.get(self.getPathToFile())
+        if (memberIndex == None):
+            memberIndex = self.buildMemberIndex()
+            if (not memberIndex == None):
+                MemberIndexCache.add(self.getPathToFile(), memberIndex)
+        return memberIndex
+
+    def buildMemberIndex(self):
+        """
+        Returns a new index of the members in the archive file. This
+        function should be overridden by extractors that can index the
+        archive file. None is returned if the index cannot be created.
+
+        @return: Returns a new index of the members in the archive file.
+        @rtype: MemberIndex
+        """
+        return None
+
     def list(self) :
+        memberIndex = self.getMemberIndex()
+        if (not memberIndex == None):
+            return memberIndex.getNames()
         commandOptions = self.getListArgs()
         if (commandOptions == None) :
             message =  "This file is unknown type and will not list the file contents: %s." %(self.getPathToFile())
@@ -69,7 +216,43 @@ class Extractor :
                 return stdout.split()
         return []
 
-    def clean() :
+    def findMemberName(self, matchFunction):
+        """
+        Returns the name of the first member in the archive file that
+        the function returns True for. None is returned if no member
+        matches. Extractors that can read the members in order should
+        override this function so that the archive file is only read
+        until a member matches.
+
+        @return: Returns the name of the first member in the archive
+        file that the function returns True for.
+        @rtype: String
+
+        @param matchFunction: A function that takes the name of a member
+        and returns True if it is the member that is searched for.
+        @type matchFunction: Function
+        """
+        for name in self.list():
+            if (matchFunction(name)):
+                return name
+        return None
+
+    def getPathToTempDir() :
+        """
+        Returns the path to the temporary directory of this process. The
+        directory is created the first time this function is called and
+        has a unique name so that runs that start at the same time do not
+        share it.
+
+        @return: Returns the path to the temporary directory.
+        @rtype: String
+        """
+        if (Extractor.__pathToTempDir == None):
+            Extractor.__pathToTempDir = tempfile.mkdtemp(prefix="sx-%s-" %(time.strftime(sx.UID_TIMESTAMP)))
+        return Extractor.__pathToTempDir
+    getPathToTempDir = staticmethod(getPathToTempDir)
+
+    def clean(trashCan=None) :
         """
         This function will remove any temporary files that were
         created. Returns True if the temporary directory no longer
@@ -78,15 +261,25 @@ class Extractor :
         @return: Returns True if the temporary directory no longer
         exists.
         @rtype: Boolean
+
+        @param trashCan: If not None then the temporary directory is
+        moved to the trash to be removed in the background.
+        @type trashCan: TrashCan
         """
-        if (os.path.isdir(Extractor.PATH_TO_TEMP_DIR)):
+        pathToTempDir = Extractor.__pathToTempDir
+        if (pathToTempDir == None):
+            return True
+        elif (not trashCan == None):
+            trashCan.add(pathToTempDir)
+        elif (os.path.isdir(pathToTempDir)):
             try:
-                # There might be a better way to handle this clean
-                shutil.rmtree(Extractor.PATH_TO_TEMP_DIR)
+                shutil.rmtree(pathToTempDir)
             except (IOError, os.error):
-                message = "Could not remove the temporary directory: %s" % (Extractor.PATH_TO_TEMP_DIR)
+                message = "Could not remove the temporary directory: %s" % (pathToTempDir)
                 logging.getLogger(sx.MAIN_LOGGER_NAME).error(message)
-        return (not os.path.isdir(Extractor.PATH_TO_TEMP_DIR))
+                return False
+        Extractor.__pathToTempDir = None
+        return True
     clean = staticmethod(clean)
 
     def isCommandInstalled(self) :
@@ -102,8 +295,208 @@ class Extractor :
         return None
 
     def getDataFromFile(self, pathToFileInExtractor) :
-        return []
+        """
+        Returns the data of a file in the archive file as an array where
+        each line of the file is an item in the array. An empty array is
+        returned if the file does not exist or could not be read.
+
+        @return: Returns the lines of a file in the archive file.
+        @rtype: Array
+
+        @param pathToFileInExtractor: The path to the file, which is
+        relative to the root directory of the report.
+        @type pathToFileInExtractor: String
+        """
+        data = self.readMember(pathToFileInExtractor)
+        if (data == None):
+            return []
+        return data.splitlines(True)
+
+    def getMember(self, pathToFileInExtractor):
+        """
+        Returns the member in the index of the archive file for the
+        path. None is returned if the archive file does not contain the
+        path or cannot be indexed.
+
+        @return: Returns the member in the index of the archive file.
+        @rtype: ArchiveMember
+
+        @param pathToFileInExtractor: The path to the file, which is
+        relative to the root directory of the report.
+        @type pathToFileInExtractor: String
+        """
+        memberIndex = self.getMemberIndex()
+        if (memberIndex == None):
+            return None
+        return memberIndex.findMember(pathToFileInExtractor)
+
+    def readMember(self, pathToFileInExtractor, maxSize=0):
+        """
+        Returns the data of a file in the archive file as a string. The
+        data is decompressed into memory so no temporary file is
+        written. None is returned if the file does not exist or the data
+        could not be read.
+
+        @return: Returns the data of a file in the archive file.
+        @rtype: String
+
+        @param pathToFileInExtractor: The path to the file, which is
+        relative to the root directory of the report.
+        @type pathToFileInExtractor: String
+        @param maxSize: The largest number of bytes that are read from
+        the start of the file. If 0 then all of the file is read.
+        @type maxSize: Int
+        """
+        member = self.getMember(pathToFileInExtractor)
+        if ((member == None) or (not member.isFile())):
+            message = "The path to the file does not exist: %s" %(pathToFileInExtractor)
+            logging.getLogger(sx.MAIN_LOGGER_NAME).debug(message)
+            return None
+        return self.getDataFromMember(member, maxSize)
+
+    def getDataFromMember(self, member, maxSize=0):
+        """
+        Returns the data of a file in the archive file as a
+        string. None is returned if the data could not be read. This
+        function should be overridden by extractors that can read the
+        data of a member.
+
+        @return: Returns the data of a file in the archive file.
+        @rtype: String
+
+        @param member: The member in the index of the archive file.
+        @type member: ArchiveMember
+        @param maxSize: The largest number of bytes that are read from
+        the start of the file. If 0 then all of the file is read.
+        @type maxSize: Int
+        """
+        return None
+
+    def extractMemberToFile(self, member, pathToFile):
+        """
+        Writes the data of a file in the archive file to a file without
+        extracting the other files in the archive file. The data is
+        streamed to the file so that large files such as a report that
+        is within a report are not read into memory. Returns True if the
+        file was written. This function should be overridden by
+        extractors that can stream the data of a member.
+
+        @return: Returns True if the file was written.
+        @rtype: Boolean
+
+        @param member: The member in the index of the archive file.
+        @type member: ArchiveMember
+        @param pathToFile: The path to the file that will be written.
+        @type pathToFile: String
+        """
+        return False
+
+    def getRelativePath(self, pathInExtractor, stripDirectoriesDepth=1):
+        """
+        Returns the path of a member in the archive file with the
+        leading directories removed which is the path the member is
+        extracted to. An empty string is returned if nothing is left
+        after the directories are stripped or the path is not safe to
+        extract.
+
+        @return: Returns the path of the member with the leading
+        directories removed.
+        @rtype: String
+
+        @param pathInExtractor: The path of the member in the archive
+        file.
+        @type pathInExtractor: String
+        @param stripDirectoriesDepth: The number of leading directories
+        to remove.
+        @type stripDirectoriesDepth: Int
+        """
+        splitPath = []
+        for item in pathInExtractor.split("/"):
+            if (item == ".."):
+                # Never write outside of the extraction directory.
+                return ""
+            elif ((len(item) > 0) and (not item == ".")):
+                splitPath.append(item)
+        return "/".join(splitPath[stripDirectoriesDepth:])
+
+    def isPathSafe(self, extractDir, relativePath):
+        """
+        Returns True if the member can be written to the path in the
+        extraction directory. The path is not safe if one of the paths
+        from the extraction directory to the path that exists is a
+        symbolic link that leads outside of the extraction directory,
+        since the member would be written through the symbolic link.
+
+        @return: Returns True if the member can be written to the path.
+        @rtype: Boolean
+
+        @param extractDir: The full path to directory for extraction.
+        @type extractDir: String
+        @param relativePath: The path of the member with the leading
+        directories removed.
+        @type relativePath: String
+        """
+        pathToRoot = os.path.realpath(extractDir)
+        pathToFile = extractDir
+        for item in relativePath.split("/"):
+            pathToFile = os.path.join(pathToFile, item)
+            if (os.path.islink(pathToFile)):
+                realPath = os.path.realpath(pathToFile)
+                if ((not realPath == pathToRoot) and (not realPath.startswith("%s/" %(pathToRoot.rstrip("/"))))):
+                    return False
+            elif (not os.path.lexists(pathToFile)):
+                break
+        return True
+
+    def isLinknameEscaping(self, relativePath, linkname):
+        """
+        Returns True if the target of a symbolic link is an absolute path
+        or a path that leads outside of the extraction directory.
+
+        @return: Returns True if the target of the symbolic link is not in
+        the extraction directory.
+        @rtype: Boolean
+
+        @param relativePath: The path of the symbolic link with the
+        leading directories removed.
+        @type relativePath: String
+        @param linkname: The target of the symbolic link.
+        @type linkname: String
+        """
+        if (linkname.startswith("/")):
+            return True
+        pathToTarget = os.path.normpath(os.path.join(os.path.dirname(relativePath), linkname))
+        return ((pathToTarget == "..") or (pathToTarget.startswith("../")))
+
+    def close(self):
+        """
+        Releases any open files or cached data that are used to read
+        the archive file.
+        """
+        pass
 
     def extract(self, extractDir, stripDirectoriesDepth=1) :
         return False
 
+    def extractMembers(self, extractDir, listOfPaths, stripDirectoriesDepth=1) :
+        """
+        Extracts the files in the list and all the files in any
+        directory in the list to the extract directory. The paths are
+        relative to the root directory of the report. This function
+        should be overridden by extractors that can extract single files.
+
+        @return: Returns True if any file was extracted.
+        @rtype: Boolean
+
+        @param extractDir: The path to the directory for extraction.
+        @type extractDir: String
+        @param listOfPaths: The list of paths to the files or
+        directories which are relative to the root directory of the
+        report.
+        @type listOfPaths: Array
+        @param stripDirectoriesDepth: The number of leading directories
+        that are removed from the path of each file.
+        @type stripDirectoriesDepth: Int
+        """
+        return False
+
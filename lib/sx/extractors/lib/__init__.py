@@ -0,0 +1,8 @@
+#!/usr/bin/env python
+"""
+@author    :  Shane Bradley
+@contact   :  sbradley@redhat.com
+@version   :  2.17
+@copyright :  GPLv2
+"""
+
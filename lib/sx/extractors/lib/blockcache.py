@@ -0,0 +1,132 @@
+#!/usr/bin/env python
+"""
+This is a cache of the decompressed blocks of a compressed archive
+file. The data of the members in the archive is read through the cache
+so that reading many small members that are near each other does not
+restart the decompression for each member.
+
+@author    :  Shane Bradley
+@contact   :  sbradley@redhat.com
+@version   :  2.17
+@copyright :  GPLv2
+"""
+import os
+import zlib
+
+import sx
+from sx.logwriter import LogWriter
+from sx.extractors.lib.seekindex import CompressedFileReader
+
+class BlockCache:
+    """
+    This class reads the uncompressed data of a compressed file in
+    fixed size blocks and keeps the blocks that were used last in
+    memory. A single reader is kept open so that blocks that follow each
+    other are decompressed in one pass.
+
+    @cvar BLOCK_SIZE: The number of uncompressed bytes in a block.
+    @type BLOCK_SIZE: Int
+    @cvar MAX_SIZE: The default number of uncompressed bytes that are
+    kept in memory.
+    @type MAX_SIZE: Int
+    """
+    BLOCK_SIZE = 1048576
+    MAX_SIZE = 64 * 1048576
+
+    def __init__(self, pathToFile, compressionType, seekIndex=None, maxSize=MAX_SIZE):
+        """
+        @param pathToFile: The path to the compressed file.
+        @type pathToFile: String
+        @param compressionType: The compression type: gzip, bzip2, xz,
+        zstd, or None if the file is not compressed.
+        @type compressionType: String
+        @param seekIndex: The index of the restart points in the file.
+        @type seekIndex: SeekIndex
+        @param maxSize: The number of uncompressed bytes that are kept in
+        memory.
+        @type maxSize: Int
+        """
+        self.__pathToFile = pathToFile
+        self.__compressionType = compressionType
+        self.__seekIndex = seekIndex
+        self.__maxBlocks = max(maxSize / BlockCache.BLOCK_SIZE, 1)
+        # Map of the block number to the data in the block.
+        self.__blocksMap = {}
+        # The block numbers in the order they were used with the last used
+        # block at the end.
+        self.__listOfBlockNumbers = []
+        self.__fin = None
+        self.__hits = 0
+        self.__misses = 0
+
+    def getHits(self):
+        return self.__hits
+
+    def getMisses(self):
+        return self.__misses
+
+    def close(self):
+        if (not self.__fin == None):
+            self.__fin.close()
+            self.__fin = None
+        self.__blocksMap = {}
+        self.__listOfBlockNumbers = []
+
+    def __getBlock(self, blockNumber):
+        """
+        Returns the data in the block. The data is decompressed if the
+        block is not in the cache.
+
+        @return: Returns the data in the block.
+        @rtype: String
+
+        @param blockNumber: The number of the block.
+        @type blockNumber: Int
+        """
+        if (self.__blocksMap.has_key(blockNumber)):
+            self.__hits += 1
+            self.__listOfBlockNumbers.remove(blockNumber)
+            self.__listOfBlockNumbers.append(blockNumber)
+            return self.__blocksMap.get(blockNumber)
+        self.__misses += 1
+        offset = blockNumber * BlockCache.BLOCK_SIZE
+        try:
+            if (self.__fin == None):
+                self.__fin = CompressedFileReader(self.__pathToFile, self.__compressionType, self.__seekIndex)
+            if (not self.__fin.tell() == offset):
+                self.__fin.seek(offset)
+            data = self.__fin.read(BlockCache.BLOCK_SIZE)
+        except (IOError, os.error, EOFError, zlib.error):
+            # The reader cannot be used after an error.
+            self.close()
+            raise
+        if (len(self.__listOfBlockNumbers) >= self.__maxBlocks):
+            del self.__blocksMap[self.__listOfBlockNumbers.pop(0)]
+        self.__blocksMap[blockNumber] = data
+        self.__listOfBlockNumbers.append(blockNumber)
+        return data
+
+    def read(self, offset, size):
+        """
+        Returns the uncompressed data at the offset. Less data is
+        returned if the end of the file is reached.
+
+        @return: Returns the uncompressed data at the offset.
+        @rtype: String
+
+        @param offset: The offset in the uncompressed data.
+        @type offset: Int
+        @param size: The number of bytes to read.
+        @type size: Int
+        """
+        listOfData = []
+        while (size > 0):
+            blockNumber = offset / BlockCache.BLOCK_SIZE
+            blockOffset = offset - (blockNumber * BlockCache.BLOCK_SIZE)
+            data = self.__getBlock(blockNumber)[blockOffset:blockOffset + size]
+            if (not len(data) > 0):
+                break
+            listOfData.append(data)
+            offset += len(data)
+            size -= len(data)
+        return "".join(listOfData)
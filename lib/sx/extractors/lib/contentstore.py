@@ -0,0 +1,196 @@
+#!/usr/bin/env python
+"""
+This is a content-addressed store for the files that are extracted from
+reports. Each file is stored once under the digest of its contents and
+is hard linked into each extracted report that contains it. Most of the
+files in the reports of a cluster are the same on every node, so only
+one copy of them is written.
+
+The files in the store are read-only since every report that contains a
+file shares the same copy.
+
+@author    :  Shane Bradley
+@contact   :  sbradley@redhat.com
+@version   :  2.17
+@copyright :  GPLv2
+"""
+import os
+import os.path
+import hashlib
+import tempfile
+import shutil
+import errno
+
+import sx
+from sx.logwriter import LogWriter
+from sx.tools import FileTransfer
+
+class ContentStore:
+    """
+    This class stores a file once under the digest of its contents and
+    links it into each extracted report that contains it. A hard link is
+    used if possible, then a reflink, and the file is copied if neither
+    is supported.
+    """
+    # Map of the real path of a file that was added to the store to the
+    # digest of its contents.
+    __digestsMap = {}
+
+    def __init__(self, pathToStore):
+        """
+        @param pathToStore: The path to the root directory of the store.
+        @type pathToStore: String
+        """
+        self.__pathToStore = pathToStore
+
+    def __str__(self):
+        return self.__pathToStore
+
+    def getPathToStore(self):
+        return self.__pathToStore
+
+    def getPathToObject(self, digest):
+        """
+        Returns the path to the file in the store for the digest.
+
+        @return: Returns the path to the file in the store for the
+        digest.
+        @rtype: String
+
+        @param digest: The digest of the contents of the file.
+        @type digest: String
+        """
+        return os.path.join(self.__pathToStore, "objects", digest[:2], digest[2:])
+
+    def __link(self, pathToObject, pathToFile):
+        """
+        Links the file in the store to the path. A hard link is used if
+        possible, then a reflink, and then the file is copied.
+
+        @param pathToObject: The path to the file in the store.
+        @type pathToObject: String
+        @param pathToFile: The path that the file will be linked to.
+        @type pathToFile: String
+        """
+        if (os.path.lexists(pathToFile)):
+            os.remove(pathToFile)
+        try:
+            os.link(pathToObject, pathToFile)
+            return
+        except OSError, e:
+            # The store is on another file system or the file has too many
+            # links.
+            if (not e.errno in [errno.EXDEV, errno.EMLINK, errno.EPERM]):
+                raise
+        if (not FileTransfer.reflink(pathToObject, pathToFile)):
+            shutil.copyfile(pathToObject, pathToFile)
+
+    def add(self, fin, size, pathToFile):
+        """
+        Reads the data of the file, adds it to the store if the store
+        does not have a file with the same contents, and links the file
+        in the store to the path. Returns the digest of the contents.
+
+        @return: Returns the digest of the contents of the file.
+        @rtype: String
+
+        @param fin: The file object that the data is read from. Only
+        size bytes are read.
+        @type fin: File
+        @param size: The size of the file in bytes.
+        @type size: Int
+        @param pathToFile: The path that the file will be linked to.
+        @type pathToFile: String
+        """
+        pathToTmpDir = os.path.join(self.__pathToStore, "tmp")
+        if (not os.path.isdir(pathToTmpDir)):
+            try:
+                os.makedirs(pathToTmpDir)
+            except OSError:
+                # Another process could have created the directory.
+                if (not os.path.isdir(pathToTmpDir)):
+                    raise
+        # The data is written to a temporary file while the digest is
+        # created so that the data is only read once.
+        (fd, pathToTmpFile) = tempfile.mkstemp(dir=pathToTmpDir)
+        try:
+            sha1sum = hashlib.sha1()
+            fout = os.fdopen(fd, "wb")
+            try:
+                remaining = size
+                while (remaining > 0):
+                    data = fin.read(min(remaining, 1048576))
+                    if (not len(data) > 0):
+                        raise IOError("The file ended before all the data was read: %s." %(pathToFile))
+                    sha1sum.update(data)
+                    fout.write(data)
+                    remaining -= len(data)
+            finally:
+                fout.close()
+            digest = sha1sum.hexdigest()
+            pathToObject = self.getPathToObject(digest)
+            if (not os.path.exists(pathToObject)):
+                if (not os.path.isdir(os.path.dirname(pathToObject))):
+                    try:
+                        os.makedirs(os.path.dirname(pathToObject))
+                    except OSError:
+                        if (not os.path.isdir(os.path.dirname(pathToObject))):
+                            raise
+                os.chmod(pathToTmpFile, 0444)
+                try:
+                    # A link fails if another process added the same file.
+                    os.link(pathToTmpFile, pathToObject)
+                except OSError, e:
+                    if (not e.errno == errno.EEXIST):
+                        raise
+        finally:
+            os.remove(pathToTmpFile)
+        self.__link(pathToObject, pathToFile)
+        ContentStore.__digestsMap[os.path.realpath(pathToFile)] = digest
+        return digest
+
+    def getDigest(pathToFile):
+        """
+        Returns the digest of the contents of a file that was added to a
+        store in this run. None is returned if the file was not added to
+        a store.
+
+        @return: Returns the digest of the contents of the file.
+        @rtype: String
+
+        @param pathToFile: The path to the file.
+        @type pathToFile: String
+        """
+        return ContentStore.__digestsMap.get(os.path.realpath(pathToFile))
+    getDigest = staticmethod(getDigest)
+
+    def isSameContent(listOfFiles):
+        """
+        Returns True if the files are known to have the same contents
+        without reading them. That is known if all the files are hard
+        links to the same file in a store or have the same digest. False
+        is returned if that is not known, so the contents might still be
+        the same.
+
+        @return: Returns True if the files are known to have the same
+        contents.
+        @rtype: Boolean
+
+        @param listOfFiles: The list of paths to the files.
+        @type listOfFiles: Array
+        """
+        if (not len(listOfFiles) > 1):
+            return False
+        listOfDigests = []
+        listOfInodes = []
+        for pathToFile in listOfFiles:
+            listOfDigests.append(ContentStore.getDigest(pathToFile))
+            try:
+                stat = os.stat(pathToFile)
+                listOfInodes.append((stat.st_dev, stat.st_ino))
+            except OSError:
+                return False
+        if (len(set(listOfInodes)) == 1):
+            return True
+        return ((not None in listOfDigests) and (len(set(listOfDigests)) == 1))
+    isSameContent = staticmethod(isSameContent)
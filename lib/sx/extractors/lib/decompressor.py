@@ -0,0 +1,187 @@
+#!/usr/bin/env python
+"""
+This is a collection of classes for the commands that can decompress a
+file to stdout. The commands that can use more than 1 cpu are preferred
+over the single threaded commands for the same compression type.
+
+Each command is only checked once to see if it is installed and the
+result is cached for the whole run.
+
+@author    :  Shane Bradley
+@contact   :  sbradley@redhat.com
+@version   :  2.17
+@copyright :  GPLv2
+"""
+import logging
+import subprocess
+from distutils.spawn import find_executable
+
+import sx
+from sx.logwriter import LogWriter
+
+class Decompressor:
+    """
+    This class is a container for a command that decompresses a file to
+    stdout.
+    """
+    def __init__(self, name, compressionType, command, isParallel=True, probeArgs=[]):
+        """
+        @param name: The name of the decompressor.
+        @type name: String
+        @param compressionType: The compression type that the command
+        decompresses: gzip, bzip2, xz, or zstd.
+        @type compressionType: String
+        @param command: The command and options that will decompress
+        stdin to stdout.
+        @type command: Array
+        @param isParallel: True if the command uses more than 1 cpu.
+        @type isParallel: Boolean
+        @param probeArgs: If not empty then these options are passed to
+        the command to check that the installed version supports the
+        options in the command. The command must return 0.
+        @type probeArgs: Array
+        """
+        self.__name = name
+        self.__compressionType = compressionType
+        self.__command = command
+        self.__isParallel = isParallel
+        self.__probeArgs = probeArgs
+
+    def __str__(self):
+        return "%s(%s): %s" %(self.getName(), self.getCompressionType(), " ".join(self.getCommand()))
+
+    def getName(self):
+        return self.__name
+
+    def getCompressionType(self):
+        return self.__compressionType
+
+    def getCommand(self):
+        return self.__command
+
+    def getCompressProgram(self):
+        """
+        Returns the string that is passed to the --use-compress-program
+        option of GNU tar. GNU tar will add the -d option.
+
+        @return: Returns the string that is passed to the
+        --use-compress-program option of GNU tar.
+        @rtype: String
+        """
+        listOfArgs = []
+        for arg in self.__command:
+            if (not arg in ["-d", "-c", "-dc"]):
+                listOfArgs.append(arg)
+        return " ".join(listOfArgs)
+
+    def isParallel(self):
+        return self.__isParallel
+
+    def isInstalled(self):
+        """
+        Returns True if the command is installed and the options in the
+        command are supported.
+
+        @return: Returns True if the command is installed.
+        @rtype: Boolean
+        """
+        if (find_executable(self.__command[0]) == None):
+            return False
+        elif (len(self.__probeArgs) > 0):
+            try:
+                task = subprocess.Popen([self.__command[0]] + self.__probeArgs,
+                                        stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+                task.communicate()
+                return (task.returncode == 0)
+            except OSError:
+                return False
+        return True
+
+class DecompressorsHelper:
+    """
+    This class finds the best decompressor that is installed for a
+    compression type.
+
+    @cvar DECOMPRESSORS: The list of decompressors in the order that
+    they are preferred.
+    @type DECOMPRESSORS: Array
+    """
+    DECOMPRESSORS = [Decompressor("pigz", "gzip", ["pigz", "-dc"]),
+                     Decompressor("gzip", "gzip", ["gzip", "-dc"], False),
+                     Decompressor("pbzip2", "bzip2", ["pbzip2", "-dc"]),
+                     Decompressor("lbzip2", "bzip2", ["lbzip2", "-dc"]),
+                     Decompressor("bzip2", "bzip2", ["bzip2", "-dc"], False),
+                     Decompressor("pixz", "xz", ["pixz", "-d"]),
+                     Decompressor("xz-threads", "xz", ["xz", "-T0", "-dc"], True, ["-T0", "--version"]),
+                     Decompressor("xz", "xz", ["xz", "-dc"], False),
+                     Decompressor("zstd-threads", "zstd", ["zstd", "-T0", "-dc"], True, ["-T0", "--version"]),
+                     Decompressor("zstd", "zstd", ["zstd", "-dc"], False)]
+    # Map of the name of the decompressor to whether it is installed.
+    __installedMap = {}
+
+    def addDecompressor(decompressor):
+        """
+        Adds a decompressor that will be preferred over the other
+        decompressors for the same compression type.
+
+        @param decompressor: The decompressor that will be added.
+        @type decompressor: Decompressor
+        """
+        DecompressorsHelper.DECOMPRESSORS.insert(0, decompressor)
+    addDecompressor = staticmethod(addDecompressor)
+
+    def isInstalled(decompressor):
+        """
+        Returns True if the decompressor is installed. The decompressor
+        is only checked the first time.
+
+        @return: Returns True if the decompressor is installed.
+        @rtype: Boolean
+
+        @param decompressor: The decompressor that will be checked.
+        @type decompressor: Decompressor
+        """
+        if (not DecompressorsHelper.__installedMap.has_key(decompressor.getName())):
+            isInstalled = decompressor.isInstalled()
+            DecompressorsHelper.__installedMap[decompressor.getName()] = isInstalled
+            if (isInstalled):
+                message = "The decompressor is installed: %s" %(str(decompressor))
+                logging.getLogger(sx.MAIN_LOGGER_NAME).debug(message)
+        return DecompressorsHelper.__installedMap.get(decompressor.getName())
+    isInstalled = staticmethod(isInstalled)
+
+    def getDecompressor(compressionType, parallelOnly=False):
+        """
+        Returns the first decompressor that is installed for the
+        compression type. None is returned if no decompressor is
+        installed.
+
+        @return: Returns the first decompressor that is installed for
+        the compression type.
+        @rtype: Decompressor
+
+        @param compressionType: The compression type: gzip, bzip2, xz,
+        or zstd.
+        @type compressionType: String
+        @param parallelOnly: If True then only the decompressors that
+        use more than 1 cpu are returned.
+        @type parallelOnly: Boolean
+        """
+        for decompressor in DecompressorsHelper.DECOMPRESSORS:
+            if (not decompressor.getCompressionType() == compressionType):
+                continue
+            elif ((parallelOnly) and (not decompressor.isParallel())):
+                continue
+            elif (DecompressorsHelper.isInstalled(decompressor)):
+                return decompressor
+        return None
+    getDecompressor = staticmethod(getDecompressor)
+
+    def probe():
+        """
+        Checks which decompressors are installed so that the check is
+        not done while the reports are extracted.
+        """
+        for decompressor in DecompressorsHelper.DECOMPRESSORS:
+            DecompressorsHelper.isInstalled(decompressor)
+    probe = staticmethod(probe)
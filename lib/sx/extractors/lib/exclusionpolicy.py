@@ -0,0 +1,261 @@
+#!/usr/bin/env python
+"""
+This is a container for the policy that decides which files are not
+extracted from an archive file. A file is skipped if it matches an
+exclude path glob, is larger than the size ceiling for a single file,
+or would make the total size of the files extracted larger than the
+size budget for the report.
+
+The files that were skipped are written to a manifest in the root
+directory of the extracted report so that plugins can tell the
+difference between a file that is missing from the report and a file
+that was skipped.
+
+@author    :  Shane Bradley
+@contact   :  sbradley@redhat.com
+@version   :  2.17
+@copyright :  GPLv2
+"""
+import os
+import os.path
+import logging
+import fnmatch
+import json
+
+import sx
+from sx.logwriter import LogWriter
+
+class ExclusionPolicy:
+    """
+    This class decides which files are not extracted from an archive
+    file and records the files that were skipped. A new policy should be
+    used for each archive file since the size of the files extracted is
+    counted.
+
+    @cvar MANIFEST_FILENAME: The name of the manifest file that
+    contains the files that were skipped. It is written to the root
+    directory of the extracted report.
+    @type MANIFEST_FILENAME: String
+    @cvar REASON_EXCLUDED: The file matched an exclude path glob.
+    @type REASON_EXCLUDED: String
+    @cvar REASON_MAX_FILE_SIZE: The file was larger than the size
+    ceiling for a single file.
+    @type REASON_MAX_FILE_SIZE: String
+    @cvar REASON_MAX_TOTAL_SIZE: The file would have made the total size
+    of the files extracted larger than the size budget for the report.
+    @type REASON_MAX_TOTAL_SIZE: String
+    @cvar REASON_NESTED_REPORT: The file is a report that is extracted
+    as its own report.
+    @type REASON_NESTED_REPORT: String
+    """
+    MANIFEST_FILENAME = ".sx_skipped_files.json"
+    REASON_EXCLUDED = "excluded"
+    REASON_MAX_FILE_SIZE = "max_file_size"
+    REASON_MAX_TOTAL_SIZE = "max_total_size"
+    REASON_NESTED_REPORT = "nested_report"
+
+    def __init__(self, listOfExcludePathGlobs=[], maxFileSize=0, maxTotalSize=0,
+                 includeReportExcludePathGlobs=True):
+        """
+        @param listOfExcludePathGlobs: The list of path globs for the
+        files that will not be extracted. The paths are relative to the
+        root directory of the report.
+        @type listOfExcludePathGlobs: Array
+        @param maxFileSize: The size in bytes of the largest file that
+        will be extracted. If 0 then there is no limit.
+        @type maxFileSize: Int
+        @param maxTotalSize: The size in bytes of all the files that will
+        be extracted. If 0 then there is no limit.
+        @type maxTotalSize: Int
+        @param includeReportExcludePathGlobs: If True then the exclude
+        path globs of the report type are added to the policy.
+        @type includeReportExcludePathGlobs: Boolean
+        """
+        self.__listOfExcludePathGlobs = []
+        self.addExcludePathGlobs(listOfExcludePathGlobs)
+        self.__maxFileSize = maxFileSize
+        self.__maxTotalSize = maxTotalSize
+        self.__includeReportExcludePathGlobs = includeReportExcludePathGlobs
+        # The total size of the files that were extracted.
+        self.__totalSize = 0
+        # Map of the path of the file that was skipped to a tuple of the
+        # size of the file and the reason it was skipped.
+        self.__skippedFilesMap = {}
+
+    def __str__(self):
+        return "excludes: %s, max file size: %d, max total size: %d" %(", ".join(self.__listOfExcludePathGlobs),
+                                                                        self.__maxFileSize, self.__maxTotalSize)
+
+    def getExcludePathGlobs(self):
+        return self.__listOfExcludePathGlobs
+
+    def addExcludePathGlobs(self, listOfExcludePathGlobs):
+        for pathGlob in listOfExcludePathGlobs:
+            pathGlob = pathGlob.strip().strip("/")
+            if ((len(pathGlob) > 0) and (not pathGlob in self.__listOfExcludePathGlobs)):
+                self.__listOfExcludePathGlobs.append(pathGlob)
+
+    def getMaxFileSize(self):
+        return self.__maxFileSize
+
+    def getMaxTotalSize(self):
+        return self.__maxTotalSize
+
+    def getTotalSize(self):
+        return self.__totalSize
+
+    def isReportExcludePathGlobsIncluded(self):
+        return self.__includeReportExcludePathGlobs
+
+    def isExcludedPath(self, pathToFile):
+        """
+        Returns True if the path matches one of the exclude path globs.
+
+        @return: Returns True if the path matches one of the exclude
+        path globs.
+        @rtype: Boolean
+
+        @param pathToFile: The path to the file, which is relative to
+        the root directory of the report.
+        @type pathToFile: String
+        """
+        pathToFile = pathToFile.strip("/")
+        for pathGlob in self.__listOfExcludePathGlobs:
+            if (fnmatch.fnmatch(pathToFile, pathGlob)):
+                return True
+        return False
+
+    def getExcludeReason(self, pathToFile, size=0):
+        """
+        Returns the reason the file will not be extracted because of the
+        exclude path globs or the size ceiling for a single file. An
+        empty string is returned if the file is not excluded. The size
+        budget for the report is checked with reserve().
+
+        @return: Returns the reason the file will not be extracted.
+        @rtype: String
+
+        @param pathToFile: The path to the file, which is relative to
+        the root directory of the report.
+        @type pathToFile: String
+        @param size: The size of the file in bytes.
+        @type size: Int
+        """
+        if (self.isExcludedPath(pathToFile)):
+            return ExclusionPolicy.REASON_EXCLUDED
+        elif ((self.__maxFileSize > 0) and (size > self.__maxFileSize)):
+            return ExclusionPolicy.REASON_MAX_FILE_SIZE
+        return ""
+
+    def reserve(self, size):
+        """
+        Adds the size of a file that will be extracted to the total
+        size. False is returned and the size is not added if the file
+        would make the total size larger than the size budget.
+
+        @return: Returns True if the file fits in the size budget.
+        @rtype: Boolean
+
+        @param size: The size of the file in bytes.
+        @type size: Int
+        """
+        if ((self.__maxTotalSize > 0) and (self.__totalSize + size > self.__maxTotalSize)):
+            return False
+        self.__totalSize += size
+        return True
+
+    def skip(self, pathToFile, size, reason):
+        """
+        Records that the file was not extracted.
+
+        @param pathToFile: The path to the file, which is relative to
+        the root directory of the report.
+        @type pathToFile: String
+        @param size: The size of the file in bytes.
+        @type size: Int
+        @param reason: The reason the file was not extracted.
+        @type reason: String
+        """
+        self.__skippedFilesMap[pathToFile.strip("/")] = (size, reason)
+
+    def isSkipped(self, pathToFile):
+        return self.__skippedFilesMap.has_key(pathToFile.strip("/"))
+
+    def getSkippedReason(self, pathToFile):
+        return self.__skippedFilesMap.get(pathToFile.strip("/"), (0, ""))[1]
+
+    def getSkippedFilesMap(self):
+        return self.__skippedFilesMap
+
+    def writeManifest(self, pathToReport):
+        """
+        Writes the manifest of the files that were skipped to the root
+        directory of the extracted report. Returns True if the manifest
+        was written or there were no files skipped.
+
+        @return: Returns True if the manifest was written or there were
+        no files skipped.
+        @rtype: Boolean
+
+        @param pathToReport: The path to the root directory of the
+        extracted report.
+        @type pathToReport: String
+        """
+        if (not len(self.__skippedFilesMap.keys()) > 0):
+            return True
+        pathToManifest = os.path.join(pathToReport, ExclusionPolicy.MANIFEST_FILENAME)
+        listOfSkippedFiles = []
+        paths = self.__skippedFilesMap.keys()
+        paths.sort()
+        for path in paths:
+            (size, reason) = self.__skippedFilesMap.get(path)
+            listOfSkippedFiles.append([path, size, reason])
+        manifestMap = {"excludePathGlobs":self.__listOfExcludePathGlobs,
+                       "maxFileSize":self.__maxFileSize,
+                       "maxTotalSize":self.__maxTotalSize,
+                       "skipped":listOfSkippedFiles}
+        try:
+            fout = open(pathToManifest, "w")
+            try:
+                json.dump(manifestMap, fout, encoding="latin-1")
+            finally:
+                fout.close()
+        except (IOError, os.error, UnicodeError):
+            message = "There was an error writing the manifest of skipped files: %s." %(pathToManifest)
+            logging.getLogger(sx.MAIN_LOGGER_NAME).error(message)
+            return False
+        message = "There was %d files skipped during extraction that are listed in the manifest: %s" %(len(listOfSkippedFiles), pathToManifest)
+        logging.getLogger(sx.MAIN_LOGGER_NAME).info(message)
+        return True
+
+    def readManifest(pathToReport):
+        """
+        Returns a map of the path of each file that was skipped to a
+        tuple of the size of the file and the reason it was skipped. An
+        empty map is returned if there is no manifest for the report.
+
+        @return: Returns a map of the path of each file that was skipped
+        to a tuple of the size of the file and the reason it was skipped.
+        @rtype: Dictionary
+
+        @param pathToReport: The path to the root directory of the
+        extracted report.
+        @type pathToReport: String
+        """
+        skippedFilesMap = {}
+        pathToManifest = os.path.join(pathToReport, ExclusionPolicy.MANIFEST_FILENAME)
+        if (not os.path.isfile(pathToManifest)):
+            return skippedFilesMap
+        try:
+            fin = open(pathToManifest, "r")
+            try:
+                manifestMap = json.load(fin)
+            finally:
+                fin.close()
+            for (path, size, reason) in manifestMap.get("skipped", []):
+                skippedFilesMap[path.encode("latin-1")] = (size, str(reason))
+        except (IOError, os.error, ValueError, TypeError, UnicodeError):
+            message = "There was an error reading the manifest of skipped files: %s." %(pathToManifest)
+            logging.getLogger(sx.MAIN_LOGGER_NAME).debug(message)
+        return skippedFilesMap
+    readManifest = staticmethod(readManifest)
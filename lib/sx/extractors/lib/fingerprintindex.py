@@ -0,0 +1,317 @@
+#!/usr/bin/env python
+"""
+This is an index of the fingerprints of the report files that were
+extracted to an archive. The same report file is often added to the
+archive more than once, so a report file that has the same fingerprint
+as a report that was extracted before is linked to that extracted report
+instead of being extracted again.
+
+The fingerprint of a file is a digest of the size of the file and the
+data at the start and end of the file, so only a small part of the file
+is read. A digest of all the data in the file can be compared as well
+before a report is linked.
+
+@author    :  Shane Bradley
+@contact   :  sbradley@redhat.com
+@version   :  2.17
+@copyright :  GPLv2
+"""
+import os
+import os.path
+import errno
+import logging
+import hashlib
+import json
+import fcntl
+
+import sx
+from sx.logwriter import LogWriter
+
+class FingerprintIndex:
+    """
+    This class maps the fingerprint of a report file to the report that
+    was extracted from it. The index is read the first time it is used
+    and the fingerprints added in this run are merged with the index on
+    disk when it is written so that runs at the same time do not lose
+    each other's fingerprints.
+
+    @cvar SAMPLE_SIZE: The number of bytes at the start and at the end of
+    the file that the fingerprint is created from.
+    @type SAMPLE_SIZE: Int
+    @cvar VERSION: The version of the format of the index file.
+    @type VERSION: Int
+    """
+    SAMPLE_SIZE = 1048576
+    VERSION = 1
+
+    def __init__(self, pathToIndex):
+        """
+        @param pathToIndex: The path to the index file.
+        @type pathToIndex: String
+        """
+        self.__pathToIndex = pathToIndex
+        # Map of the fingerprint of a report file to a map of the report
+        # that was extracted from it. None means the index has not been
+        # read.
+        self.__fingerprintsMap = None
+        # The fingerprints that were added in this run.
+        self.__addedMap = {}
+
+    def __str__(self):
+        return self.__pathToIndex
+
+    def getPathToIndex(self):
+        return self.__pathToIndex
+
+    def getFingerprint(pathToFile):
+        """
+        Returns the fingerprint of the file which is a digest of the
+        size of the file and the data at the start and end of the
+        file. An empty string is returned if the file cannot be read.
+
+        @return: Returns the fingerprint of the file.
+        @rtype: String
+
+        @param pathToFile: The path to the file.
+        @type pathToFile: String
+        """
+        try:
+            size = os.path.getsize(pathToFile)
+            sha256sum = hashlib.sha256("%d\n" %(size))
+            fin = open(pathToFile, "rb")
+            try:
+                sha256sum.update(fin.read(FingerprintIndex.SAMPLE_SIZE))
+                if (size > FingerprintIndex.SAMPLE_SIZE):
+                    fin.seek(max(size - FingerprintIndex.SAMPLE_SIZE, FingerprintIndex.SAMPLE_SIZE))
+                    sha256sum.update(fin.read(FingerprintIndex.SAMPLE_SIZE))
+            finally:
+                fin.close()
+        except (IOError, os.error):
+            message = "There was an error creating the fingerprint of the file: %s." %(pathToFile)
+            logging.getLogger(sx.MAIN_LOGGER_NAME).debug(message)
+            return ""
+        return "%d-%s" %(size, sha256sum.hexdigest())
+    getFingerprint = staticmethod(getFingerprint)
+
+    def getChecksum(pathToFile):
+        """
+        Returns the SHA-256 digest of all the data in the file. An empty
+        string is returned if the file cannot be read.
+
+        @return: Returns the SHA-256 digest of the file.
+        @rtype: String
+
+        @param pathToFile: The path to the file.
+        @type pathToFile: String
+        """
+        sha256sum = hashlib.sha256()
+        try:
+            fin = open(pathToFile, "rb")
+            try:
+                while (True):
+                    data = fin.read(1048576)
+                    if (not len(data) > 0):
+                        break
+                    sha256sum.update(data)
+            finally:
+                fin.close()
+        except (IOError, os.error):
+            message = "There was an error creating the checksum of the file: %s." %(pathToFile)
+            logging.getLogger(sx.MAIN_LOGGER_NAME).debug(message)
+            return ""
+        return sha256sum.hexdigest()
+    getChecksum = staticmethod(getChecksum)
+
+    def __read(self):
+        """
+        Returns the map of fingerprints in the index file. An empty map
+        is returned if there is no index file or it cannot be read.
+
+        @return: Returns the map of fingerprints in the index file.
+        @rtype: Dictionary
+        """
+        fingerprintsMap = {}
+        if (not os.path.isfile(self.__pathToIndex)):
+            return fingerprintsMap
+        try:
+            fin = open(self.__pathToIndex, "r")
+            try:
+                indexMap = json.load(fin)
+            finally:
+                fin.close()
+            if ((type(indexMap) == dict) and (indexMap.get("version") == FingerprintIndex.VERSION)):
+                for (fingerprint, entryMap) in indexMap.get("fingerprints", {}).items():
+                    for key in ["name", "pathToExtractedReport", "pathToCompressedReport", "checksum"]:
+                        entryMap[key] = entryMap.get(key, u"").encode("latin-1")
+                    fingerprintsMap[fingerprint.encode("latin-1")] = entryMap
+        except (IOError, os.error, ValueError, AttributeError, UnicodeError):
+            message = "There was an error reading the fingerprint index: %s." %(self.__pathToIndex)
+            logging.getLogger(sx.MAIN_LOGGER_NAME).debug(message)
+        return fingerprintsMap
+
+    def find(self, fingerprint, reportName, pathToFile="", verifyChecksum=False):
+        """
+        Returns the path to the extracted report of the report file that
+        has the same fingerprint. An empty string is returned if no
+        report of the same type was extracted from a file with the same
+        fingerprint or the extracted report no longer exists.
+
+        @return: Returns the path to the extracted report of the report
+        file that has the same fingerprint.
+        @rtype: String
+
+        @param fingerprint: The fingerprint of the report file.
+        @type fingerprint: String
+        @param reportName: The name of the report type of the report
+        file.
+        @type reportName: String
+        @param pathToFile: The path to the report file. It is only used
+        if the checksum is verified.
+        @type pathToFile: String
+        @param verifyChecksum: If True then the SHA-256 digest of all the
+        data in the report file has to be the same as the file that the
+        report was extracted from.
+        @type verifyChecksum: Boolean
+        """
+        if (not len(fingerprint) > 0):
+            return ""
+        if (self.__fingerprintsMap == None):
+            self.__fingerprintsMap = self.__read()
+        entryMap = self.__fingerprintsMap.get(fingerprint)
+        if ((entryMap == None) or (not entryMap.get("name") == reportName)):
+            return ""
+        pathToExtractedReport = entryMap.get("pathToExtractedReport")
+        if (not os.path.isdir(pathToExtractedReport)):
+            return ""
+        if (verifyChecksum):
+            checksum = entryMap.get("checksum")
+            if ((not len(checksum) > 0) and (os.path.isfile(entryMap.get("pathToCompressedReport")))):
+                checksum = FingerprintIndex.getChecksum(entryMap.get("pathToCompressedReport"))
+            if ((not len(checksum) > 0) or (not checksum == FingerprintIndex.getChecksum(pathToFile))):
+                message = "The file has the same fingerprint as a report that was extracted before, but the checksum is different: %s." %(pathToFile)
+                logging.getLogger(sx.MAIN_LOGGER_NAME).debug(message)
+                return ""
+        return pathToExtractedReport
+
+    def add(self, fingerprint, reportName, pathToExtractedReport, pathToCompressedReport, checksum=""):
+        """
+        Adds the report that was extracted from the report file with the
+        fingerprint to the index. The index is not written until
+        write() is called.
+
+        @param fingerprint: The fingerprint of the report file.
+        @type fingerprint: String
+        @param reportName: The name of the report type of the report.
+        @type reportName: String
+        @param pathToExtractedReport: The path to the extracted report.
+        @type pathToExtractedReport: String
+        @param pathToCompressedReport: The path to the report file in the
+        archive.
+        @type pathToCompressedReport: String
+        @param checksum: The SHA-256 digest of all the data in the report
+        file. It is created when it is needed if it is empty.
+        @type checksum: String
+        """
+        if (not len(fingerprint) > 0):
+            return
+        entryMap = {"name":reportName,
+                    "pathToExtractedReport":os.path.abspath(pathToExtractedReport),
+                    "pathToCompressedReport":os.path.abspath(pathToCompressedReport),
+                    "checksum":checksum}
+        self.__addedMap[fingerprint] = entryMap
+        if (not self.__fingerprintsMap == None):
+            self.__fingerprintsMap[fingerprint] = entryMap
+
+    def __getPathToHiddenFile(self, extension):
+        """
+        Returns the path to a hidden file in the same directory as the
+        index file that is named after the index file, such as the lock
+        file. The name starts with a "." whether or not the name of the
+        index file does.
+
+        @return: Returns the path to the hidden file.
+        @rtype: String
+
+        @param extension: The extension that is added to the name of
+        the index file.
+        @type extension: String
+        """
+        (pathToDir, filename) = os.path.split(self.__pathToIndex)
+        return os.path.join(pathToDir, ".%s.%s" %(filename.lstrip("."), extension))
+
+    def __lock(self, pathToLockFile):
+        """
+        Returns the lock file opened and locked. The lock file is removed
+        by the process that has the lock when it is done, so the lock is
+        taken again if the lock file was removed while this process was
+        waiting for the lock.
+
+        @return: Returns the lock file opened and locked.
+        @rtype: File
+
+        @param pathToLockFile: The path to the lock file.
+        @type pathToLockFile: String
+        """
+        while (True):
+            flock = open(pathToLockFile, "a")
+            try:
+                fcntl.flock(flock.fileno(), fcntl.LOCK_EX)
+                if (os.fstat(flock.fileno()).st_ino == os.stat(pathToLockFile).st_ino):
+                    return flock
+            except (IOError, OSError), e:
+                if (not e.errno == errno.ENOENT):
+                    flock.close()
+                    raise
+            flock.close()
+
+    def write(self):
+        """
+        Merges the fingerprints that were added in this run with the
+        index file and writes the index file. The index file is locked
+        with a hidden lock file while it is read and written and the lock
+        file is removed after the index is written. Returns True if the
+        index was written or nothing was added.
+
+        @return: Returns True if the index was written or nothing was
+        added.
+        @rtype: Boolean
+        """
+        if (not len(self.__addedMap.keys()) > 0):
+            return True
+        pathToLockFile = self.__getPathToHiddenFile("lock")
+        try:
+            if (not os.path.isdir(os.path.dirname(self.__pathToIndex))):
+                os.makedirs(os.path.dirname(self.__pathToIndex))
+            flock = self.__lock(pathToLockFile)
+            try:
+                fingerprintsMap = self.__read()
+                fingerprintsMap.update(self.__addedMap)
+                # The reports that were removed from the archive are
+                # removed from the index.
+                for fingerprint in fingerprintsMap.keys():
+                    if (not os.path.isdir(fingerprintsMap.get(fingerprint).get("pathToExtractedReport"))):
+                        del fingerprintsMap[fingerprint]
+                # Write to a temporary file first so a partial index is
+                # never read.
+                pathToTmpFile = self.__getPathToHiddenFile(str(os.getpid()))
+                fout = open(pathToTmpFile, "w")
+                try:
+                    json.dump({"version":FingerprintIndex.VERSION, "fingerprints":fingerprintsMap},
+                              fout, encoding="latin-1")
+                finally:
+                    fout.close()
+                os.rename(pathToTmpFile, self.__pathToIndex)
+            finally:
+                # The lock file is removed while it is still locked so that
+                # it is not left in the archive.
+                try:
+                    os.unlink(pathToLockFile)
+                finally:
+                    flock.close()
+        except (IOError, os.error, UnicodeError):
+            message = "There was an error writing the fingerprint index: %s." %(self.__pathToIndex)
+            logging.getLogger(sx.MAIN_LOGGER_NAME).error(message)
+            return False
+        self.__fingerprintsMap = fingerprintsMap
+        self.__addedMap = {}
+        return True
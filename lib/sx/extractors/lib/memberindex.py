@@ -0,0 +1,472 @@
+#!/usr/bin/env python
+"""
+This is a collection of classes that hold the index of the members
+that are contained in an archive file and a cache of those indexes.
+
+The index for an archive is created once and then any listing or
+lookup of a member in that archive will use the index instead of
+reading the archive again.
+
+@author    :  Shane Bradley
+@contact   :  sbradley@redhat.com
+@version   :  2.17
+@copyright :  GPLv2
+"""
+import os
+import os.path
+import logging
+import hashlib
+import json
+
+import sx
+from sx.logwriter import LogWriter
+from sx.extractors.lib.seekindex import SeekIndex
+
+class ArchiveMember:
+    """
+    This class is a container for a member in an archive file.
+
+    @cvar TYPE_FILE: The member is a regular file.
+    @type TYPE_FILE: String
+    @cvar TYPE_DIR: The member is a directory.
+    @type TYPE_DIR: String
+    @cvar TYPE_SYMLINK: The member is a symbolic link.
+    @type TYPE_SYMLINK: String
+    @cvar TYPE_HARDLINK: The member is a hard link to another member.
+    @type TYPE_HARDLINK: String
+    @cvar TYPE_OTHER: The member is a device file, fifo, or unknown type.
+    @type TYPE_OTHER: String
+    """
+    TYPE_FILE = "file"
+    TYPE_DIR = "dir"
+    TYPE_SYMLINK = "symlink"
+    TYPE_HARDLINK = "hardlink"
+    TYPE_OTHER = "other"
+
+    def __init__(self, name, memberType, size=-1, offset=-1, offsetData=-1, linkname=""):
+        """
+        @param name: The path of the member in the archive. Directories
+        do not end with a slash.
+        @type name: String
+        @param memberType: The type of the member.
+        @type memberType: String
+        @param size: The size of the member's data in bytes. -1 if it is
+        unknown.
+        @type size: Int
+        @param offset: The offset of the member's header in the archive
+        after decompression. -1 if it is unknown.
+        @type offset: Int
+        @param offsetData: The offset of the member's data in the
+        archive after decompression. -1 if it is unknown.
+        @type offsetData: Int
+        @param linkname: The target of the link if the member is a link.
+        @type linkname: String
+        """
+        self.__name = name
+        self.__memberType = memberType
+        self.__size = size
+        self.__offset = offset
+        self.__offsetData = offsetData
+        self.__linkname = linkname
+
+    def __str__(self):
+        return "%s(%s): %d bytes" %(self.getName(), self.getType(), self.getSize())
+
+    def getName(self):
+        return self.__name
+
+    def getType(self):
+        return self.__memberType
+
+    def getSize(self):
+        return self.__size
+
+    def getOffset(self):
+        return self.__offset
+
+    def getOffsetData(self):
+        return self.__offsetData
+
+    def getLinkname(self):
+        return self.__linkname
+
+    def isFile(self):
+        return (self.__memberType == ArchiveMember.TYPE_FILE)
+
+    def isDir(self):
+        return (self.__memberType == ArchiveMember.TYPE_DIR)
+
+    def isSymlink(self):
+        return (self.__memberType == ArchiveMember.TYPE_SYMLINK)
+
+    def isHardlink(self):
+        return (self.__memberType == ArchiveMember.TYPE_HARDLINK)
+
+class MemberIndex:
+    """
+    This class is an index of all the members in an archive file. The
+    members are kept in the order that they are in the archive.
+    """
+    def __init__(self, listOfMembers=[]):
+        """
+        @param listOfMembers: A list of ArchiveMember objects.
+        @type listOfMembers: Array
+        """
+        self.__listOfMembers = []
+        self.__membersMap = {}
+        # Map of the path relative to the root directory of the report to
+        # the member. Created the first time it is needed.
+        self.__relativePathsMap = None
+        # Map of the path of a directory relative to the root directory of
+        # the report to a map of the names in the directory to the member.
+        # Created the first time it is needed.
+        self.__childrenMap = None
+        # The index of the restart points in the compressed archive so that a
+        # member's data can be read without decompressing the whole archive.
+        self.__seekIndex = None
+        for member in listOfMembers:
+            self.add(member)
+
+    def __len__(self):
+        return len(self.__listOfMembers)
+
+    def add(self, member):
+        self.__listOfMembers.append(member)
+        self.__membersMap[member.getName()] = member
+        self.__relativePathsMap = None
+        self.__childrenMap = None
+
+    def getMembers(self):
+        return self.__listOfMembers
+
+    def getSeekIndex(self):
+        return self.__seekIndex
+
+    def setSeekIndex(self, seekIndex):
+        self.__seekIndex = seekIndex
+
+    def getMember(self, name):
+        """
+        Returns the member that has the name. None is returned if there
+        is no member with that name.
+
+        @return: Returns the member that has the name.
+        @rtype: ArchiveMember
+
+        @param name: The path of the member in the archive.
+        @type name: String
+        """
+        return self.__membersMap.get(name.rstrip("/"))
+
+    def getNames(self):
+        """
+        Returns a list of the paths to all the members. The paths to
+        directories will end with a slash like the output of "tar tf".
+
+        @return: Returns a list of the paths to all the members.
+        @rtype: Array
+        """
+        listOfNames = []
+        for member in self.__listOfMembers:
+            if (member.isDir()):
+                listOfNames.append("%s/" %(member.getName()))
+            else:
+                listOfNames.append(member.getName())
+        return listOfNames
+
+    def findMember(self, pathToFileInExtractor):
+        """
+        Returns the member whose path matches the path that is relative
+        to the root directory of the report. The root directory of the
+        report is the first directory in the member's path. If the member
+        has no directory then the whole path is compared. None is
+        returned if no member matches.
+
+        @return: Returns the member whose path matches the path that is
+        relative to the root directory of the report.
+        @rtype: ArchiveMember
+
+        @param pathToFileInExtractor: The path to the file, which is
+        relative to the root directory of the report.
+        @type pathToFileInExtractor: String
+        """
+        if (self.__relativePathsMap == None):
+            self.__relativePathsMap = {}
+            for member in self.__listOfMembers:
+                splitName = member.getName().split("/", 1)
+                relativePath = splitName[-1]
+                # The first member found is kept like a search of the list would.
+                if (not self.__relativePathsMap.has_key(relativePath)):
+                    self.__relativePathsMap[relativePath] = member
+        return self.__relativePathsMap.get(pathToFileInExtractor.strip("/"))
+
+    def __createChildrenMap(self):
+        """
+        Creates the map of each directory to the members in that
+        directory. A directory that is not a member in the archive is
+        added with None as the member.
+        """
+        self.__childrenMap = {"":{}}
+        for member in self.__listOfMembers:
+            splitName = member.getName().split("/", 1)
+            if (not len(splitName) == 2):
+                # The root directory of the report.
+                continue
+            relativePath = splitName[1]
+            (head, tail) = os.path.split(relativePath)
+            if (not self.__childrenMap.has_key(head)):
+                self.__childrenMap[head] = {}
+            if ((not self.__childrenMap[head].has_key(tail)) or
+                (self.__childrenMap[head].get(tail) == None)):
+                self.__childrenMap[head][tail] = member
+            if (member.isDir()):
+                if (not self.__childrenMap.has_key(relativePath)):
+                    self.__childrenMap[relativePath] = {}
+            # Add the parent directories that are not members.
+            while (len(head) > 0):
+                (parentHead, parentTail) = os.path.split(head)
+                if (not self.__childrenMap.has_key(parentHead)):
+                    self.__childrenMap[parentHead] = {}
+                if (self.__childrenMap[parentHead].has_key(parentTail)):
+                    break
+                self.__childrenMap[parentHead][parentTail] = None
+                head = parentHead
+
+    def isDir(self, pathToDirInExtractor):
+        """
+        Returns True if the path is a directory in the archive. The path
+        is relative to the root directory of the report.
+
+        @return: Returns True if the path is a directory in the archive.
+        @rtype: Boolean
+
+        @param pathToDirInExtractor: The path to the directory, which is
+        relative to the root directory of the report.
+        @type pathToDirInExtractor: String
+        """
+        if (self.__childrenMap == None):
+            self.__createChildrenMap()
+        return self.__childrenMap.has_key(pathToDirInExtractor.strip("/"))
+
+    def getChildren(self, pathToDirInExtractor):
+        """
+        Returns a map of the names in the directory to the member for
+        that name. The member is None for a directory that is not a
+        member in the archive. An empty map is returned if the path is
+        not a directory.
+
+        @return: Returns a map of the names in the directory to the
+        member for that name.
+        @rtype: Dictionary
+
+        @param pathToDirInExtractor: The path to the directory, which is
+        relative to the root directory of the report.
+        @type pathToDirInExtractor: String
+        """
+        if (self.__childrenMap == None):
+            self.__createChildrenMap()
+        return self.__childrenMap.get(pathToDirInExtractor.strip("/"), {})
+
+    def findMembers(self, listOfPaths):
+        """
+        Returns the members whose path matches one of the paths or is in
+        one of the directories in the list. The paths are relative to the
+        root directory of the report. The members are in the order they
+        are in the archive.
+
+        @return: Returns the members whose path matches one of the paths
+        or is in one of the directories in the list.
+        @rtype: Array
+
+        @param listOfPaths: A list of paths which are relative to the
+        root directory of the report.
+        @type listOfPaths: Array
+        """
+        listOfStrippedPaths = []
+        for path in listOfPaths:
+            listOfStrippedPaths.append(path.strip("/"))
+        listOfMembers = []
+        for member in self.__listOfMembers:
+            relativePath = member.getName().split("/", 1)[-1]
+            for path in listOfStrippedPaths:
+                if ((relativePath == path) or (relativePath.startswith("%s/" %(path)))):
+                    listOfMembers.append(member)
+                    break
+        return listOfMembers
+
+    def toList(self):
+        """
+        Returns a list of lists that can be written with json.
+
+        @return: Returns a list of lists that can be written with json.
+        @rtype: Array
+        """
+        listOfItems = []
+        for member in self.__listOfMembers:
+            listOfItems.append([member.getName(), member.getType(), member.getSize(),
+                                member.getOffset(), member.getOffsetData(), member.getLinkname()])
+        return listOfItems
+
+    def fromList(listOfItems):
+        """
+        Returns a MemberIndex that is created from a list of lists that
+        was created with toList().
+
+        @return: Returns a MemberIndex that is created from a list of
+        lists.
+        @rtype: MemberIndex
+
+        @param listOfItems: The list of lists that was created with
+        toList().
+        @type listOfItems: Array
+        """
+        memberIndex = MemberIndex()
+        for item in listOfItems:
+            # The paths are written as latin-1 so that the orginal bytes of
+            # the path are restored.
+            memberIndex.add(ArchiveMember(item[0].encode("latin-1"), str(item[1]), item[2],
+                                          item[3], item[4], item[5].encode("latin-1")))
+        return memberIndex
+    fromList = staticmethod(fromList)
+
+class MemberIndexCache:
+    """
+    This class is a cache of MemberIndex objects for archive files that
+    lives for the whole run. The key for an archive is its path, size
+    and modification time so that a modified archive is indexed again.
+
+    If the disk cache is enabled then the indexes are also written to
+    the cache directory so that they can be used on later runs.
+
+    @cvar PATH_TO_CACHE_DIR: The path to the directory where the
+    indexes are written when the disk cache is enabled.
+    @type PATH_TO_CACHE_DIR: String
+    """
+    PATH_TO_CACHE_DIR = os.path.join(sx.SXConfigurationFiles.CONFIGURATION_DIR, "cache/index")
+    __memberIndexMap = {}
+    __isDiskCacheEnabled = False
+
+    def setDiskCacheEnabled(isDiskCacheEnabled):
+        """
+        Enables or disables writing and reading the indexes to the cache
+        directory.
+
+        @param isDiskCacheEnabled: If True then the disk cache is enabled.
+        @type isDiskCacheEnabled: Boolean
+        """
+        MemberIndexCache.__isDiskCacheEnabled = isDiskCacheEnabled
+    setDiskCacheEnabled = staticmethod(setDiskCacheEnabled)
+
+    def __getKey(pathToFile):
+        """
+        Returns the key for the archive file. None is returned if the
+        file cannot be stat'd.
+
+        @return: Returns a tuple of the path, size, and modification
+        time of the archive file.
+        @rtype: Tuple
+        """
+        try:
+            stat = os.stat(pathToFile)
+        except OSError:
+            return None
+        return (os.path.abspath(pathToFile), stat.st_size, int(stat.st_mtime))
+    __getKey = staticmethod(__getKey)
+
+    def __getPathToCacheFile(key):
+        keyHash = hashlib.sha1("%s:%d:%d" %(key[0], key[1], key[2])).hexdigest()
+        return os.path.join(MemberIndexCache.PATH_TO_CACHE_DIR, "%s.json" %(keyHash))
+    __getPathToCacheFile = staticmethod(__getPathToCacheFile)
+
+    def get(pathToFile):
+        """
+        Returns the MemberIndex for the archive file. None is returned if
+        the archive has not been indexed.
+
+        @return: Returns the MemberIndex for the archive file.
+        @rtype: MemberIndex
+
+        @param pathToFile: The path to the archive file.
+        @type pathToFile: String
+        """
+        key = MemberIndexCache.__getKey(pathToFile)
+        if (key == None):
+            return None
+        elif (MemberIndexCache.__memberIndexMap.has_key(key)):
+            return MemberIndexCache.__memberIndexMap.get(key)
+        elif (MemberIndexCache.__isDiskCacheEnabled):
+            pathToCacheFile = MemberIndexCache.__getPathToCacheFile(key)
+            if (os.path.isfile(pathToCacheFile)):
+                try:
+                    fin = open(pathToCacheFile, "r")
+                    try:
+                        cacheMap = json.load(fin)
+                    finally:
+                        fin.close()
+                    memberIndex = MemberIndex.fromList(cacheMap.get("members"))
+                    if (cacheMap.has_key("restartPoints")):
+                        memberIndex.setSeekIndex(SeekIndex.fromList(cacheMap.get("compressionType"),
+                                                                    cacheMap.get("restartPoints")))
+                    MemberIndexCache.__memberIndexMap[key] = memberIndex
+                    return memberIndex
+                except (IOError, os.error, ValueError, TypeError, IndexError, UnicodeError):
+                    message = "There was an error reading the index cache file: %s." %(pathToCacheFile)
+                    logging.getLogger(sx.MAIN_LOGGER_NAME).debug(message)
+        return None
+    get = staticmethod(get)
+
+    def rename(pathToFile, pathToNewFile):
+        """
+        Moves the MemberIndex for the archive file in the memory cache to
+        the new path of the archive file after it has been moved.
+
+        @param pathToFile: The old path to the archive file.
+        @type pathToFile: String
+        @param pathToNewFile: The new path to the archive file.
+        @type pathToNewFile: String
+        """
+        key = MemberIndexCache.__getKey(pathToNewFile)
+        if (key == None):
+            return
+        oldKey = (os.path.abspath(pathToFile), key[1], key[2])
+        if (MemberIndexCache.__memberIndexMap.has_key(oldKey)):
+            MemberIndexCache.__memberIndexMap[key] = MemberIndexCache.__memberIndexMap.pop(oldKey)
+    rename = staticmethod(rename)
+
+    def add(pathToFile, memberIndex):
+        """
+        Adds the MemberIndex for the archive file to the cache.
+
+        @param pathToFile: The path to the archive file.
+        @type pathToFile: String
+        @param memberIndex: The index of the members in the archive file.
+        @type memberIndex: MemberIndex
+        """
+        key = MemberIndexCache.__getKey(pathToFile)
+        if (key == None):
+            return
+        MemberIndexCache.__memberIndexMap[key] = memberIndex
+        if (MemberIndexCache.__isDiskCacheEnabled):
+            pathToCacheFile = MemberIndexCache.__getPathToCacheFile(key)
+            try:
+                if (not os.access(MemberIndexCache.PATH_TO_CACHE_DIR, os.F_OK)):
+                    os.makedirs(MemberIndexCache.PATH_TO_CACHE_DIR)
+                # Write to a temporary file first so a partial index is
+                # never read.
+                pathToTmpFile = "%s.%d" %(pathToCacheFile, os.getpid())
+                cacheMap = {"path":key[0], "size":key[1], "mtime":key[2],
+                            "members":memberIndex.toList()}
+                seekIndex = memberIndex.getSeekIndex()
+                if (not seekIndex == None):
+                    cacheMap["compressionType"] = seekIndex.getCompressionType()
+                    cacheMap["restartPoints"] = seekIndex.toList()
+                fout = open(pathToTmpFile, "w")
+                try:
+                    json.dump(cacheMap, fout, encoding="latin-1")
+                finally:
+                    fout.close()
+                os.rename(pathToTmpFile, pathToCacheFile)
+            except (IOError, os.error, UnicodeError):
+                message = "There was an error writing the index cache file: %s." %(pathToCacheFile)
+                logging.getLogger(sx.MAIN_LOGGER_NAME).debug(message)
+    add = staticmethod(add)
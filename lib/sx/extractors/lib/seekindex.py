@@ -0,0 +1,715 @@
+#!/usr/bin/env python
+"""
+This is a collection of classes for reading a compressed file as if it
+was not compressed and seeking to any offset in the uncompressed data
+without decompressing everything before that offset.
+
+The offsets where decompression can be restarted are kept in a
+SeekIndex:
+ - gzip: the start of every gzip member and a copy of the decompressor
+   state every SPAN bytes(the copies are only kept in memory).
+ - bzip2: the start of every bzip2 stream(pbzip2 writes a stream for
+   every block).
+ - xz: the start of every xz block which is read from the index at the
+   end of each xz stream, so the file does not have to be read first.
+ - zstd: the start of every zstd frame(only when the zstandard module
+   is installed).
+
+@author    :  Shane Bradley
+@contact   :  sbradley@redhat.com
+@version   :  2.17
+@copyright :  GPLv2
+"""
+import os
+import os.path
+import logging
+import subprocess
+import threading
+import struct
+import bisect
+import zlib
+import bz2
+
+import sx
+from sx.logwriter import LogWriter
+from sx.extractors.lib.decompressor import DecompressorsHelper
+
+# Native xz support requires the lzma module which is only included with
+# python 3.3+ or the backports.lzma module. If neither is installed then
+# the xz command is used.
+try:
+    import lzma
+except ImportError:
+    try:
+        from backports import lzma
+    except ImportError:
+        lzma = None
+
+# Native zstd support requires the zstandard module. If it is not installed
+# then the zstd command is used.
+try:
+    import zstandard
+    ZSTD_ERRORS = (zstandard.ZstdError,)
+except ImportError:
+    zstandard = None
+    ZSTD_ERRORS = ()
+
+class RestartPoint:
+    """
+    This class is a container for an offset in a compressed file where
+    decompression can be restarted.
+    """
+    def __init__(self, compressedOffset, uncompressedOffset, compressedSize=-1,
+                 uncompressedSize=-1, streamFlags="", decompressor=None):
+        """
+        @param compressedOffset: The offset in the compressed file.
+        @type compressedOffset: Int
+        @param uncompressedOffset: The offset in the uncompressed data.
+        @type uncompressedOffset: Int
+        @param compressedSize: The unpadded size of the xz block. -1 if
+        it is not an xz block.
+        @type compressedSize: Int
+        @param uncompressedSize: The uncompressed size of the xz block.
+        -1 if it is not an xz block.
+        @type uncompressedSize: Int
+        @param streamFlags: The stream flags of the xz stream that
+        contains the block.
+        @type streamFlags: String
+        @param decompressor: A copy of the decompressor at this offset
+        if decompression is not restarted at the start of a stream.
+        @type decompressor: Decompress
+        """
+        self.__compressedOffset = compressedOffset
+        self.__uncompressedOffset = uncompressedOffset
+        self.__compressedSize = compressedSize
+        self.__uncompressedSize = uncompressedSize
+        self.__streamFlags = streamFlags
+        self.__decompressor = decompressor
+
+    def getCompressedOffset(self):
+        return self.__compressedOffset
+
+    def getUncompressedOffset(self):
+        return self.__uncompressedOffset
+
+    def getCompressedSize(self):
+        return self.__compressedSize
+
+    def getUncompressedSize(self):
+        return self.__uncompressedSize
+
+    def getStreamFlags(self):
+        return self.__streamFlags
+
+    def getDecompressor(self):
+        return self.__decompressor
+
+class SeekIndex:
+    """
+    This class is an index of the restart points in a compressed file
+    sorted by the uncompressed offset.
+    """
+    def __init__(self, compressionType):
+        """
+        @param compressionType: The compression type of the file: gzip,
+        bzip2, xz, or None.
+        @type compressionType: String
+        """
+        self.__compressionType = compressionType
+        self.__restartPoints = []
+        self.__uncompressedOffsets = []
+
+    def __len__(self):
+        return len(self.__restartPoints)
+
+    def getCompressionType(self):
+        return self.__compressionType
+
+    def getRestartPoints(self):
+        return self.__restartPoints
+
+    def add(self, restartPoint):
+        index = bisect.bisect_right(self.__uncompressedOffsets, restartPoint.getUncompressedOffset())
+        self.__uncompressedOffsets.insert(index, restartPoint.getUncompressedOffset())
+        self.__restartPoints.insert(index, restartPoint)
+
+    def getRestartPoint(self, uncompressedOffset):
+        """
+        Returns the restart point closest to the uncompressed offset that
+        is not after the offset. None is returned if there is no restart
+        point before the offset.
+
+        @return: Returns the restart point closest to the uncompressed
+        offset that is not after the offset.
+        @rtype: RestartPoint
+
+        @param uncompressedOffset: The offset in the uncompressed data.
+        @type uncompressedOffset: Int
+        """
+        index = bisect.bisect_right(self.__uncompressedOffsets, uncompressedOffset)
+        if (index > 0):
+            return self.__restartPoints[index - 1]
+        return None
+
+    def toList(self):
+        """
+        Returns a list of lists that can be written with json. The
+        copies of the decompressor cannot be written so those restart
+        points are skipped.
+
+        @return: Returns a list of lists that can be written with json.
+        @rtype: Array
+        """
+        listOfItems = []
+        for restartPoint in self.__restartPoints:
+            if (restartPoint.getDecompressor() == None):
+                listOfItems.append([restartPoint.getCompressedOffset(), restartPoint.getUncompressedOffset(),
+                                    restartPoint.getCompressedSize(), restartPoint.getUncompressedSize(),
+                                    restartPoint.getStreamFlags().encode("hex")])
+        return listOfItems
+
+    def fromList(compressionType, listOfItems):
+        """
+        Returns a SeekIndex that is created from a list of lists that
+        was created with toList().
+
+        @return: Returns a SeekIndex that is created from a list of lists.
+        @rtype: SeekIndex
+
+        @param compressionType: The compression type of the file.
+        @type compressionType: String
+        @param listOfItems: The list of lists that was created with toList().
+        @type listOfItems: Array
+        """
+        if (not compressionType == None):
+            compressionType = str(compressionType)
+        seekIndex = SeekIndex(compressionType)
+        for item in listOfItems:
+            seekIndex.add(RestartPoint(item[0], item[1], item[2], item[3], str(item[4]).decode("hex")))
+        return seekIndex
+    fromList = staticmethod(fromList)
+
+# ###############################################################################
+# Functions for reading the index of an xz file.
+# ###############################################################################
+XZ_HEADER_MAGIC = "\xfd7zXZ\x00"
+XZ_FOOTER_MAGIC = "YZ"
+
+def readVLI(data, offset):
+    """
+    Returns a tuple of the variable length integer at the offset and
+    the offset after the integer.
+    """
+    value = 0
+    for i in range(0, 9):
+        byte = ord(data[offset + i])
+        value |= (byte & 0x7f) << (i * 7)
+        if (not (byte & 0x80)):
+            return (value, offset + i + 1)
+    raise ValueError("The variable length integer is not valid.")
+
+def writeVLI(value):
+    data = ""
+    while (value >= 0x80):
+        data += chr((value & 0x7f) | 0x80)
+        value >>= 7
+    return data + chr(value)
+
+def roundUp4(value):
+    return (value + 3) & ~3
+
+def readXZSeekIndex(pathToFile):
+    """
+    Returns a SeekIndex with a restart point for every block in the xz
+    file. The blocks are read from the index at the end of each stream
+    so none of the blocks are decompressed. None is returned if the file
+    is not a valid xz file.
+
+    @return: Returns a SeekIndex with a restart point for every block in
+    the xz file.
+    @rtype: SeekIndex
+
+    @param pathToFile: The path to the xz file.
+    @type pathToFile: String
+    """
+    listOfStreams = []
+    try:
+        fin = open(pathToFile, "rb")
+        try:
+            fin.seek(0, 2)
+            streamEnd = fin.tell()
+            # The streams are read from the end of the file to the start.
+            while (streamEnd > 0):
+                fin.seek(streamEnd - 4)
+                if (fin.read(4) == "\x00\x00\x00\x00"):
+                    # Skip the stream padding between streams.
+                    streamEnd -= 4
+                    continue
+                fin.seek(streamEnd - 12)
+                footer = fin.read(12)
+                if (not footer[10:12] == XZ_FOOTER_MAGIC):
+                    return None
+                backwardSize = (struct.unpack("<I", footer[4:8])[0] + 1) * 4
+                streamFlags = footer[8:10]
+                indexOffset = streamEnd - 12 - backwardSize
+                fin.seek(indexOffset)
+                index = fin.read(backwardSize)
+                (recordCount, offset) = readVLI(index, 1)
+                listOfBlocks = []
+                blocksSize = 0
+                for i in range(0, recordCount):
+                    (unpaddedSize, offset) = readVLI(index, offset)
+                    (uncompressedSize, offset) = readVLI(index, offset)
+                    listOfBlocks.append((unpaddedSize, uncompressedSize))
+                    blocksSize += roundUp4(unpaddedSize)
+                streamStart = indexOffset - blocksSize - 12
+                fin.seek(streamStart)
+                if (not fin.read(6) == XZ_HEADER_MAGIC):
+                    return None
+                listOfStreams.insert(0, (streamStart, streamFlags, listOfBlocks))
+                streamEnd = streamStart
+        finally:
+            fin.close()
+    except (IOError, os.error, ValueError, IndexError, struct.error):
+        message = "There was an error reading the index of the xz file: %s." %(pathToFile)
+        logging.getLogger(sx.MAIN_LOGGER_NAME).debug(message)
+        return None
+    seekIndex = SeekIndex("xz")
+    uncompressedOffset = 0
+    for (streamStart, streamFlags, listOfBlocks) in listOfStreams:
+        compressedOffset = streamStart + 12
+        for (unpaddedSize, uncompressedSize) in listOfBlocks:
+            seekIndex.add(RestartPoint(compressedOffset, uncompressedOffset, unpaddedSize,
+                                       uncompressedSize, streamFlags))
+            compressedOffset += roundUp4(unpaddedSize)
+            uncompressedOffset += uncompressedSize
+    return seekIndex
+
+def generateXZStreams(fin, listOfRestartPoints):
+    """
+    Generator that yields valid xz streams that only contain the blocks
+    for the restart points. The blocks are copied from the orginal file
+    and a new stream header, index, and footer are written around each
+    run of blocks that are next to each other in the same stream, so
+    that any xz decoder can decompress the blocks.
+
+    @param fin: The open xz file.
+    @type fin: File
+    @param listOfRestartPoints: A list of restart points for xz blocks
+    sorted by offset.
+    @type listOfRestartPoints: Array
+    """
+    listOfStreams = []
+    for restartPoint in listOfRestartPoints:
+        if ((len(listOfStreams) > 0) and
+            (restartPoint.getStreamFlags() == listOfStreams[-1][-1].getStreamFlags()) and
+            (restartPoint.getCompressedOffset() == listOfStreams[-1][-1].getCompressedOffset() +
+             roundUp4(listOfStreams[-1][-1].getCompressedSize()))):
+            listOfStreams[-1].append(restartPoint)
+        else:
+            listOfStreams.append([restartPoint])
+    for listOfBlocks in listOfStreams:
+        streamFlags = listOfBlocks[0].getStreamFlags()
+        yield XZ_HEADER_MAGIC + streamFlags + struct.pack("<I", zlib.crc32(streamFlags) & 0xffffffff)
+        index = "\x00" + writeVLI(len(listOfBlocks))
+        for restartPoint in listOfBlocks:
+            fin.seek(restartPoint.getCompressedOffset())
+            remaining = roundUp4(restartPoint.getCompressedSize())
+            while (remaining > 0):
+                data = fin.read(min(remaining, 1048576))
+                if (not len(data) > 0):
+                    return
+                remaining -= len(data)
+                yield data
+            index += writeVLI(restartPoint.getCompressedSize()) + writeVLI(restartPoint.getUncompressedSize())
+        index += "\x00" * (roundUp4(len(index)) - len(index))
+        index += struct.pack("<I", zlib.crc32(index) & 0xffffffff)
+        yield index
+        footer = struct.pack("<I", (len(index) / 4) - 1) + streamFlags
+        yield struct.pack("<I", zlib.crc32(footer) & 0xffffffff) + footer + XZ_FOOTER_MAGIC
+
+def isCompressionSupported(compressionType):
+    """
+    Returns True if a CompressedFileReader can read files with the
+    compression type.
+
+    @return: Returns True if a CompressedFileReader can read files with
+    the compression type.
+    @rtype: Boolean
+
+    @param compressionType: The compression type of the file: gzip,
+    bzip2, xz, zstd, or None.
+    @type compressionType: String
+    """
+    if (compressionType in ["gzip", "bzip2", None]):
+        return True
+    elif (compressionType == "xz"):
+        return ((not lzma == None) or (not DecompressorsHelper.getDecompressor(compressionType) == None))
+    elif (compressionType == "zstd"):
+        return ((not zstandard == None) or (not DecompressorsHelper.getDecompressor(compressionType) == None))
+    return False
+
+def readCompressionType(pathToFile):
+    """
+    Returns the compression type of the file from the magic bytes at the
+    start of the file: gzip, bzip2, xz, zstd, or None if the file is not
+    compressed or cannot be read.
+
+    @return: Returns the compression type of the file.
+    @rtype: String
+
+    @param pathToFile: The path to the file.
+    @type pathToFile: String
+    """
+    try:
+        fin = open(pathToFile, "rb")
+        try:
+            magic = fin.read(6)
+        finally:
+            fin.close()
+    except (IOError, os.error):
+        return None
+    if (magic.startswith("\x1f\x8b")):
+        return "gzip"
+    elif (magic.startswith("BZh")):
+        return "bzip2"
+    elif (magic == XZ_HEADER_MAGIC):
+        return "xz"
+    elif (magic.startswith("\x28\xb5\x2f\xfd")):
+        return "zstd"
+    return None
+
+# ###############################################################################
+# Reader for compressed files
+# ###############################################################################
+class CompressedFileReader:
+    """
+    This class is a read only file object for the uncompressed data of a
+    compressed file. If no SeekIndex is given then the restart points
+    are added to a new SeekIndex while the file is read from the start,
+    so that seek() can restart decompression close to any offset later
+    on.
+
+    If useParallelDecompressor is True and a decompressor command that
+    uses more than 1 cpu is installed, then the file is read from the
+    start with that command. The gzip and bzip2 restart points cannot be
+    found when a command decompresses the file.
+
+    @cvar SPAN: The number of uncompressed bytes between the copies of
+    the gzip decompressor that are saved.
+    @type SPAN: Int
+    @cvar CHUNK_SIZE: The number of compressed bytes that are read at a
+    time.
+    @type CHUNK_SIZE: Int
+    """
+    SPAN = 16 * 1048576
+    CHUNK_SIZE = 65536
+
+    def __init__(self, pathToFile, compressionType, seekIndex=None, useParallelDecompressor=False):
+        """
+        @param pathToFile: The path to the compressed file.
+        @type pathToFile: String
+        @param compressionType: The compression type of the file: gzip,
+        bzip2, xz, zstd, or None.
+        @type compressionType: String
+        @param seekIndex: The index of restart points. If None then a new
+        index is created.
+        @type seekIndex: SeekIndex
+        @param useParallelDecompressor: If True then a decompressor
+        command that uses more than 1 cpu is used to read the file from
+        the start if one is installed.
+        @type useParallelDecompressor: Boolean
+        """
+        self.__pathToFile = pathToFile
+        self.__compressionType = compressionType
+        self.__seekIndex = seekIndex
+        # Only add restart points to an index that this reader created.
+        self.__isIndexing = (seekIndex == None)
+        if ((self.__seekIndex == None) and (compressionType == "xz")):
+            self.__seekIndex = readXZSeekIndex(pathToFile)
+        if (self.__seekIndex == None):
+            self.__seekIndex = SeekIndex(compressionType)
+        # The decompressor command that is used to read the file from the
+        # start.
+        self.__decompressorCommand = None
+        if ((useParallelDecompressor) and (not compressionType == None)):
+            self.__decompressorCommand = DecompressorsHelper.getDecompressor(compressionType, True)
+        if ((self.__decompressorCommand == None) and
+            (((compressionType == "xz") and (lzma == None)) or ((compressionType == "zstd") and (zstandard == None)))):
+            self.__decompressorCommand = DecompressorsHelper.getDecompressor(compressionType)
+        self.__fin = open(pathToFile, "rb")
+        # The offset of the next byte that read() will return.
+        self.__position = 0
+        # The offset of the next byte that the decompressor will return.
+        self.__uncompressedOffset = 0
+        # The uncompressed offset of the last restart point that was added.
+        self.__lastRestartOffset = 0
+        self.__buffer = ""
+        self.__bufferOffset = 0
+        self.__isEOF = False
+        self.__decompressor = None
+        # The process that runs the decompressor command.
+        self.__task = None
+        # The generator that yields the xz data when lzma is used.
+        self.__xzGenerator = None
+        self.__restart(None)
+
+    def getSeekIndex(self):
+        return self.__seekIndex
+
+    def isIndexing(self):
+        """
+        Returns True if the restart points are added to the SeekIndex
+        while the file is read. False is returned if a SeekIndex was
+        given or the file is read with a decompressor command, since then
+        the SeekIndex does not have all the restart points in the file.
+
+        @return: Returns True if the restart points are added to the
+        SeekIndex while the file is read.
+        @rtype: Boolean
+        """
+        return self.__isIndexing
+
+    def tell(self):
+        return self.__position
+
+    def close(self):
+        self.__closeTask()
+        self.__fin.close()
+
+    def __closeTask(self):
+        if (not self.__task == None):
+            try:
+                self.__task.stdout.close()
+                if (self.__task.poll() == None):
+                    self.__task.kill()
+                self.__task.wait()
+            except (IOError, OSError):
+                pass
+            self.__task = None
+        self.__xzGenerator = None
+
+    def __newDecompressor(self):
+        if (self.__compressionType == "gzip"):
+            return zlib.decompressobj(16 + zlib.MAX_WBITS)
+        elif (self.__compressionType == "bzip2"):
+            return bz2.BZ2Decompressor()
+        elif ((self.__compressionType == "xz") and (not lzma == None)):
+            return lzma.LZMADecompressor()
+        elif ((self.__compressionType == "zstd") and (not zstandard == None)):
+            return zstandard.ZstdDecompressor().decompressobj()
+        return None
+
+    def __restart(self, restartPoint):
+        """
+        Restarts the decompression at the restart point. If the restart
+        point is None then decompression is restarted at the start of the
+        file.
+
+        @param restartPoint: The restart point to restart decompression
+        at.
+        @type restartPoint: RestartPoint
+        """
+        self.__closeTask()
+        self.__buffer = ""
+        self.__bufferOffset = 0
+        self.__isEOF = False
+        self.__position = 0
+        self.__decompressor = self.__newDecompressor()
+        if (not restartPoint == None):
+            self.__position = restartPoint.getUncompressedOffset()
+        self.__uncompressedOffset = self.__position
+        if ((restartPoint == None) and (not self.__decompressorCommand == None)):
+            # The command reads the file so no restart points can be found.
+            self.__fin.seek(0)
+            self.__isIndexing = False
+            self.__startTask(self.__decompressorCommand, None)
+        elif (self.__compressionType == "xz"):
+            if (restartPoint == None):
+                self.__fin.seek(0)
+                self.__xzGenerator = iter(lambda: self.__fin.read(CompressedFileReader.CHUNK_SIZE), "")
+            else:
+                # Decompress the blocks from this block to the end of the file.
+                listOfRestartPoints = []
+                for currentRestartPoint in self.__seekIndex.getRestartPoints():
+                    if (currentRestartPoint.getUncompressedOffset() >= restartPoint.getUncompressedOffset()):
+                        listOfRestartPoints.append(currentRestartPoint)
+                generator = generateXZStreams(self.__fin, listOfRestartPoints)
+                if (lzma == None):
+                    self.__startTask(DecompressorsHelper.getDecompressor(self.__compressionType), generator)
+                else:
+                    self.__xzGenerator = generator
+        elif (restartPoint == None):
+            self.__fin.seek(0)
+        else:
+            self.__fin.seek(restartPoint.getCompressedOffset())
+            if (not restartPoint.getDecompressor() == None):
+                self.__decompressor = restartPoint.getDecompressor().copy()
+
+    def __startTask(self, decompressor, generator):
+        """
+        Starts decompressing the data with the decompressor command. If
+        the generator is None then the command reads the file.
+
+        @param decompressor: The decompressor command.
+        @type decompressor: Decompressor
+        @param generator: A generator that yields the compressed data
+        that is written to the command.
+        @type generator: Generator
+        """
+        message = "Decompressing the file with the command \"%s\": %s" %(" ".join(decompressor.getCommand()), self.__pathToFile)
+        logging.getLogger(sx.MAIN_LOGGER_NAME).debug(message)
+        if (generator == None):
+            self.__task = subprocess.Popen(decompressor.getCommand(), stdin=self.__fin,
+                                           stdout=subprocess.PIPE, stderr=open(os.devnull, "w"))
+            return
+        # A thread writes the data to the command so that reading does not
+        # block.
+        self.__task = subprocess.Popen(decompressor.getCommand(), stdin=subprocess.PIPE,
+                                       stdout=subprocess.PIPE, stderr=open(os.devnull, "w"))
+        def writeData(stdin, generator):
+            try:
+                for data in generator:
+                    stdin.write(data)
+            except (IOError, OSError, ValueError):
+                pass
+            try:
+                stdin.close()
+            except (IOError, OSError):
+                pass
+        writer = threading.Thread(target=writeData, args=(self.__task.stdin, generator))
+        writer.setDaemon(True)
+        writer.start()
+
+    def __readTaskChunk(self):
+        data = self.__task.stdout.read(CompressedFileReader.CHUNK_SIZE)
+        if ((not len(data) > 0) and (not self.__task.wait() == 0)):
+            raise IOError("There was an error decompressing the file: %s." %(self.__pathToFile))
+        return data
+
+    def __decompressXZChunk(self):
+        for data in self.__xzGenerator:
+            uncompressedData = self.__decompressor.decompress(data)
+            # Start a new decompressor for each stream in the file.
+            while ((self.__decompressor.eof) and (len(self.__decompressor.unused_data.lstrip("\x00")) > 0)):
+                data = self.__decompressor.unused_data.lstrip("\x00")
+                self.__decompressor = lzma.LZMADecompressor()
+                uncompressedData += self.__decompressor.decompress(data)
+            if (len(uncompressedData) > 0):
+                return uncompressedData
+        return ""
+
+    def __addRestartPoint(self, compressedOffset, decompressor=None):
+        if (self.__isIndexing):
+            self.__seekIndex.add(RestartPoint(compressedOffset, self.__uncompressedOffset, decompressor=decompressor))
+            self.__lastRestartOffset = self.__uncompressedOffset
+
+    def __decompressChunk(self):
+        """
+        Returns the next chunk of uncompressed data. An empty string is
+        returned at the end of the file.
+
+        @return: Returns the next chunk of uncompressed data.
+        @rtype: String
+        """
+        if (self.__compressionType == None):
+            return self.__fin.read(CompressedFileReader.CHUNK_SIZE)
+        elif (not self.__task == None):
+            return self.__readTaskChunk()
+        elif (self.__compressionType == "xz"):
+            return self.__decompressXZChunk()
+        while (True):
+            data = self.__fin.read(CompressedFileReader.CHUNK_SIZE)
+            if (not len(data) > 0):
+                return ""
+            try:
+                uncompressedData = self.__decompressor.decompress(data)
+            except ZSTD_ERRORS, e:
+                raise IOError("There was an error decompressing the file: %s: %s" %(self.__pathToFile, str(e)))
+            except EOFError:
+                # The bzip2 stream ended at the end of the last chunk.
+                self.__fin.seek(self.__fin.tell() - len(data))
+                self.__decompressor = self.__newDecompressor()
+                self.__addRestartPoint(self.__fin.tell())
+                continue
+            self.__uncompressedOffset += len(uncompressedData)
+            # Older versions of the zstandard module do not have unused_data.
+            unusedData = getattr(self.__decompressor, "unused_data", "")
+            if (len(unusedData) > 0):
+                # The stream ended and another stream starts after it.
+                compressedOffset = self.__fin.tell() - len(unusedData)
+                if ((self.__compressionType == "gzip") and (len(unusedData.lstrip("\x00")) == 0)):
+                    # gzip files can have trailing zeros.
+                    self.__fin.seek(0, 2)
+                else:
+                    self.__fin.seek(compressedOffset)
+                    self.__decompressor = self.__newDecompressor()
+                    self.__addRestartPoint(compressedOffset)
+            elif ((self.__compressionType == "gzip") and
+                  (self.__uncompressedOffset - self.__lastRestartOffset >= CompressedFileReader.SPAN)):
+                # Save a copy of the decompressor so that decompression can be
+                # restarted here.
+                self.__addRestartPoint(self.__fin.tell(), self.__decompressor.copy())
+            if (len(uncompressedData) > 0):
+                return uncompressedData
+
+    def read(self, size=-1):
+        """
+        Returns up to size bytes of uncompressed data. If size is
+        negative then all the remaining data is returned.
+
+        @return: Returns up to size bytes of uncompressed data.
+        @rtype: String
+
+        @param size: The number of bytes to read.
+        @type size: Int
+        """
+        listOfChunks = []
+        available = len(self.__buffer) - self.__bufferOffset
+        if (available > 0):
+            listOfChunks.append(self.__buffer[self.__bufferOffset:])
+        while (((size < 0) or (available < size)) and (not self.__isEOF)):
+            data = self.__decompressChunk()
+            if (not len(data) > 0):
+                self.__isEOF = True
+                break
+            listOfChunks.append(data)
+            available += len(data)
+        data = "".join(listOfChunks)
+        if ((size >= 0) and (len(data) > size)):
+            self.__buffer = data
+            self.__bufferOffset = size
+            data = data[:size]
+        else:
+            self.__buffer = ""
+            self.__bufferOffset = 0
+        self.__position += len(data)
+        return data
+
+    def seek(self, offset, whence=0):
+        """
+        Sets the offset in the uncompressed data. Only absolute offsets
+        are supported(whence of 0).
+
+        @param offset: The offset in the uncompressed data.
+        @type offset: Int
+        @param whence: Only 0 is supported.
+        @type whence: Int
+        """
+        if (not whence == 0):
+            raise IOError("Only absolute offsets are supported.")
+        if (self.__compressionType == None):
+            self.__fin.seek(offset)
+            self.__buffer = ""
+            self.__bufferOffset = 0
+            self.__isEOF = False
+            self.__position = offset
+            return
+        restartPoint = self.__seekIndex.getRestartPoint(offset)
+        if ((offset < self.__position) or
+            ((not restartPoint == None) and (restartPoint.getUncompressedOffset() > self.__position))):
+            self.__restart(restartPoint)
+        # Skip the data between the current offset and the offset.
+        while (self.__position < offset):
+            if (not len(self.read(min(offset - self.__position, 1048576))) > 0):
+                break
@@ -1,5 +1,18 @@
 #!/usr/bin/env python
 """
+Performs operations on a tarball that is archived with tar and
+compressed with bzip2, gunzip, xz, or zstd.
+
+The tarball is read with the python tarfile module in a single
+streaming pass. The GNU tar command is only used when the tarball
+cannot be read natively, which is an xz or zstd tarball when neither
+the python module nor the decompressor command is installed. It is
+also used when a member is a type that tarfile cannot create such as a
+device file or fifo.
+
+While the tarball is read the offsets where decompression can be
+restarted are saved with the index of the members, so that a single
+member can be read later without decompressing the whole tarball.
 
 @author    :  Shane Bradley
 @contact   :  sbradley@redhat.com
@@ -11,51 +24,103 @@ import logging
 import mimetypes
 import subprocess
 import shutil
+import tarfile
+import zlib
+import copy
 
 import sx
 from sx.logwriter import LogWriter
 from sx.extractors import Extractor
+from sx.extractors.lib.memberindex import ArchiveMember
+from sx.extractors.lib.memberindex import MemberIndex
+from sx.extractors.lib.memberindex import MemberIndexCache
+from sx.extractors.lib.seekindex import CompressedFileReader
+from sx.extractors.lib.seekindex import isCompressionSupported
+from sx.extractors.lib.decompressor import DecompressorsHelper
+from sx.extractors.lib.exclusionpolicy import ExclusionPolicy
+from sx.extractors.lib.blockcache import BlockCache
 
 class Tarextractor(Extractor) :
+    # Map of the path to the tar command to whether it is installed so that
+    # the command is only checked once.
+    __commandInstalledMap = {}
+
     def __init__(self, pathToFile):
         Extractor.__init__(self, "TARextractor", pathToFile, "/bin/tar")
+        # The cache of decompressed blocks that is used when a report is
+        # read from the tarball without extracting it.
+        self.__blockCache = None
 
     def isCommandInstalled(self) :
+        if (Tarextractor.__commandInstalledMap.has_key(self.getPathToCommand())):
+            return Tarextractor.__commandInstalledMap.get(self.getPathToCommand())
         command = [self.getPathToCommand(), "--version"]
+        isInstalled = False
         try :
             tarTask = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
             (stdout, stderr) = tarTask.communicate()
             if ((stdout.find("GNU") >= 0) or (tarTask.returncode  == 0)):
-                return True
-            else:
-                return False
+                isInstalled = True
         except OSError:
             message = "There was an error checking if the binary tar is installed."
             logging.getLogger(sx.MAIN_LOGGER_NAME).error(message)
-            return False
+        Tarextractor.__commandInstalledMap[self.getPathToCommand()] = isInstalled
+        return isInstalled
+
+    def __guessType(self):
+        # Other extractors can call mimetypes.init() which removes the
+        # encodings that are added.
+        mimetypes.encodings_map[".xz"] = "xz"
+        mimetypes.encodings_map[".zst"] = "zstd"
+        return mimetypes.guess_type(self.getPathToFile())
+
+    def getCompressionType(self):
+        """
+        Returns the compression type of the tarball: gzip, bzip2, xz,
+        zstd, or None if the tarball is not compressed.
+
+        @return: Returns the compression type of the tarball.
+        @rtype: String
+        """
+        return self.__guessType()[1]
 
     def isValidMimeType(self):
         mimetypes.init()
-        mimetypes.encodings_map[".xz"] = "xz"
 
         # Returns a tuple of [type, encoding]: (index 0 = type), (index 1 = encoding)
-        mimeType = mimetypes.guess_type(self.getPathToFile())
+        mimeType = self.__guessType()
         if ((mimeType[0] == "application/x-tar") and ((mimeType[1] == "gzip") or (mimeType[1] == "bzip2"))):
             # For now will assume that it is a tar.gz or tar.bz2 file. Will not use "tarfile" checker.
             return True
         elif ((mimeType[0] == "application/x-tar") and (mimeType[1] == "xz")):
             # For now will assume that it is a tar.xz file
             return True
+        elif ((mimeType[0] == "application/x-tar") and (mimeType[1] == "zstd")):
+            # For now will assume that it is a tar.zst file
+            return True
         elif ((mimeType[0] == "application/x-tar") and (mimeType[1] == None)):
             # For now will assume that it is a tar file with no compression
             return True
         return False
 
+    def isNativeSupported(self):
+        """
+        Returns True if the tarball can be read with the tarfile module
+        instead of GNU tar.
+
+        @return: Returns True if the tarball can be read with the
+        tarfile module.
+        @rtype: Boolean
+        """
+        if (not self.isValidMimeType()):
+            return False
+        return isCompressionSupported(self.getCompressionType())
+
     def getListArgs(self) :
         if (not self.isValidMimeType()):
             return None;
-        compressionType = mimetypes.guess_type(self.getPathToFile())[1]
-        if (compressionType in ["gzip", "bzip2", "xz"]):
+        compressionType = self.getCompressionType()
+        if (compressionType in ["gzip", "bzip2", "xz", "zstd"]):
             return "atf"
         elif (compressionType == None):
             return "tf"
@@ -64,73 +129,358 @@ class Tarextractor(Extractor) :
     def getExtractArgs(self) :
         if (not self.isValidMimeType()):
             return None;
-        compressionType = mimetypes.guess_type(self.getPathToFile())[1]
-        if (compressionType in ["gzip", "bzip2", "xz"]):
+        compressionType = self.getCompressionType()
+        if (compressionType in ["gzip", "bzip2", "xz", "zstd"]):
             return "axpf"
         elif (compressionType == None):
             return "xpf"
         return None
 
+    def __getCommandArgs(self, commandOptions):
+        """
+        Returns a list of the options that are passed to GNU tar. If a
+        decompressor that uses more than 1 cpu is installed then GNU tar
+        will use it instead of detecting the compression type.
+
+        @return: Returns a list of the options that are passed to GNU
+        tar.
+        @rtype: Array
+
+        @param commandOptions: The options returned by getListArgs() or
+        getExtractArgs().
+        @type commandOptions: String
+        """
+        compressionType = self.getCompressionType()
+        if ((not compressionType == None) and (commandOptions.startswith("a"))):
+            decompressor = DecompressorsHelper.getDecompressor(compressionType, True)
+            if (not decompressor == None):
+                # The option has to be before the bundled options since the
+                # last bundled option takes the path to the tarball.
+                return ["--use-compress-program=%s" %(decompressor.getCompressProgram()), "-%s" %(commandOptions[1:])]
+        return [commandOptions]
+
+    # ###########################################################################
+    # Helper functions for reading the tarball with tarfile module
+    # ###########################################################################
+    def __openTarfile(self, useParallelDecompressor=False):
+        """
+        Returns a tuple of the TarFile opened in stream mode and the
+        CompressedFileReader that the TarFile reads from. The
+        SeekIndex of the reader will have all the restart points once
+        the whole tarball has been read.
+
+        @return: Returns a tuple of the TarFile opened in stream mode
+        and the CompressedFileReader that the TarFile reads from.
+        @rtype: Tuple
+
+        @param useParallelDecompressor: If True then a decompressor that
+        uses more than 1 cpu is used if one is installed.
+        @type useParallelDecompressor: Boolean
+        """
+        fileobj = CompressedFileReader(self.getPathToFile(), self.getCompressionType(),
+                                       useParallelDecompressor=useParallelDecompressor)
+        try:
+            return (tarfile.open(fileobj=fileobj, mode="r|"), fileobj)
+        except (tarfile.TarError, IOError, os.error, EOFError, zlib.error):
+            fileobj.close()
+            raise
+
+    def __closeTarfile(self, tarFile, fileobj):
+        try:
+            tarFile.close()
+            fileobj.close()
+        except (IOError, os.error):
+            pass
+
+    def __isExcluded(self, relativePath, isDir=False, size=0, relativeLinkname=""):
+        """
+        Returns True if the member will not be extracted because of the
+        exclusion policy. The files that are skipped are recorded in the
+        policy. Directories are not recorded since the files in them are
+        checked as well.
+
+        @return: Returns True if the member will not be extracted.
+        @rtype: Boolean
+
+        @param relativePath: The path of the member with the leading
+        directories removed.
+        @type relativePath: String
+        @param isDir: True if the member is a directory.
+        @type isDir: Boolean
+        @param size: The size of the member's data in bytes.
+        @type size: Int
+        @param relativeLinkname: If the member is a hard link then this
+        is the path of the member it links to with the leading
+        directories removed.
+        @type relativeLinkname: String
+        """
+        exclusionPolicy = self.getExclusionPolicy()
+        if (exclusionPolicy == None):
+            return False
+        elif (isDir):
+            return exclusionPolicy.isExcludedPath(relativePath)
+        elif (exclusionPolicy.isSkipped(relativePath)):
+            return True
+        reason = exclusionPolicy.getExcludeReason(relativePath, size)
+        if ((not len(reason) > 0) and (len(relativeLinkname) > 0)):
+            # A hard link to a file that was skipped is skipped as well.
+            reason = exclusionPolicy.getSkippedReason(relativeLinkname)
+        if (len(reason) > 0):
+            exclusionPolicy.skip(relativePath, size, reason)
+            return True
+        return False
+
+    def __reserve(self, relativePath, size):
+        """
+        Returns True if the file fits in the size budget of the exclusion
+        policy. If the file does not fit then it is recorded as skipped.
+
+        @return: Returns True if the file fits in the size budget.
+        @rtype: Boolean
+
+        @param relativePath: The path of the member with the leading
+        directories removed.
+        @type relativePath: String
+        @param size: The size of the member's data in bytes.
+        @type size: Int
+        """
+        exclusionPolicy = self.getExclusionPolicy()
+        if (exclusionPolicy == None):
+            return True
+        elif (not exclusionPolicy.reserve(size)):
+            exclusionPolicy.skip(relativePath, size, ExclusionPolicy.REASON_MAX_TOTAL_SIZE)
+            return False
+        return True
+
+    def __getArchiveMember(self, tarinfo):
+        """
+        Returns an ArchiveMember for the TarInfo object.
+
+        @return: Returns an ArchiveMember for the TarInfo object.
+        @rtype: ArchiveMember
+
+        @param tarinfo: The TarInfo object for a member of the tarball.
+        @type tarinfo: TarInfo
+        """
+        memberType = ArchiveMember.TYPE_OTHER
+        if (tarinfo.isreg()):
+            memberType = ArchiveMember.TYPE_FILE
+        elif (tarinfo.isdir()):
+            memberType = ArchiveMember.TYPE_DIR
+        elif (tarinfo.issym()):
+            memberType = ArchiveMember.TYPE_SYMLINK
+        elif (tarinfo.islnk()):
+            memberType = ArchiveMember.TYPE_HARDLINK
+        return ArchiveMember(tarinfo.name.rstrip("/"), memberType, tarinfo.size,
+                             tarinfo.offset, tarinfo.offset_data, tarinfo.linkname)
+
+    def __buildMemberIndexWithCommand(self):
+        commandOptions = self.getListArgs()
+        if ((commandOptions == None) or (not self.isCommandInstalled())):
+            return None
+        # Use the verbose listing to get the type and size of each member.
+        command = [self.getPathToCommand()] + self.__getCommandArgs(commandOptions.replace("t", "tv")) + [self.getPathToFile()]
+        task = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        (stdout, stderr) = task.communicate()
+        if (not task.returncode  == 0):
+            message = "There was an error listing the file contents: %s." % (self.getPathToFile())
+            logging.getLogger(sx.MAIN_LOGGER_NAME).debug(message)
+            return None
+        # Example: -rw-r--r-- root/root       200 2014-01-01 10:00 sosreport/etc/hosts
+        memberTypesMap = {"-":ArchiveMember.TYPE_FILE, "d":ArchiveMember.TYPE_DIR,
+                          "l":ArchiveMember.TYPE_SYMLINK, "h":ArchiveMember.TYPE_HARDLINK}
+        memberIndex = MemberIndex()
+        for line in stdout.splitlines():
+            lineSplit = line.split(None, 5)
+            if (not len(lineSplit) == 6):
+                continue
+            memberType = memberTypesMap.get(lineSplit[0][0], ArchiveMember.TYPE_OTHER)
+            name = lineSplit[5]
+            linkname = ""
+            if (memberType == ArchiveMember.TYPE_SYMLINK):
+                (name, linkname) = name.split(" -> ", 1)
+            elif (memberType == ArchiveMember.TYPE_HARDLINK):
+                (name, linkname) = name.split(" link to ", 1)
+            size = -1
+            if (lineSplit[2].isdigit()):
+                size = int(lineSplit[2])
+            memberIndex.add(ArchiveMember(name.rstrip("/"), memberType, size, linkname=linkname))
+        return memberIndex
+
+    def buildMemberIndex(self):
+        if (not self.isNativeSupported()):
+            return self.__buildMemberIndexWithCommand()
+        memberIndex = MemberIndex()
+        try:
+            (tarFile, fileobj) = self.__openTarfile()
+            try:
+                for tarinfo in tarFile:
+                    memberIndex.add(self.__getArchiveMember(tarinfo))
+                    tarFile.members = []
+                memberIndex.setSeekIndex(fileobj.getSeekIndex())
+            finally:
+                self.__closeTarfile(tarFile, fileobj)
+        except (tarfile.TarError, IOError, os.error, EOFError, zlib.error):
+            message = "There was an error listing the file contents: %s." % (self.getPathToFile())
+            logging.getLogger(sx.MAIN_LOGGER_NAME).debug(message)
+            return None
+        return memberIndex
+
+    def __findMemberNameWithCommand(self, matchFunction):
+        commandOptions = self.getListArgs()
+        if ((commandOptions == None) or (not self.isCommandInstalled())):
+            return None
+        command = [self.getPathToCommand()] + self.__getCommandArgs(commandOptions) + [self.getPathToFile()]
+        try:
+            task = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        except OSError:
+            message = "There was an error listing the file contents: %s." % (self.getPathToFile())
+            logging.getLogger(sx.MAIN_LOGGER_NAME).debug(message)
+            return None
+        try:
+            # Stop listing the tarball once the member is found.
+            for line in iter(task.stdout.readline, ""):
+                name = line.rstrip("\n")
+                if ((len(name) > 0) and (matchFunction(name))):
+                    return name
+        finally:
+            if (task.poll() == None):
+                task.kill()
+            task.stdout.close()
+            task.stderr.close()
+            task.wait()
+        return None
+
+    def findMemberName(self, matchFunction):
+        if ((not MemberIndexCache.get(self.getPathToFile()) == None) or (not self.isValidMimeType())):
+            return Extractor.findMemberName(self, matchFunction)
+        elif (not self.isNativeSupported()):
+            return self.__findMemberNameWithCommand(matchFunction)
+        # Only the headers are needed, so the tarball is read until the
+        # member is found instead of indexing the whole tarball.
+        try:
+            (tarFile, fileobj) = self.__openTarfile()
+            try:
+                for tarinfo in tarFile:
+                    if (matchFunction(tarinfo.name)):
+                        return tarinfo.name
+                    tarFile.members = []
+            finally:
+                self.__closeTarfile(tarFile, fileobj)
+        except (tarfile.TarError, IOError, os.error, EOFError, zlib.error):
+            message = "There was an error listing the file contents: %s." % (self.getPathToFile())
+            logging.getLogger(sx.MAIN_LOGGER_NAME).debug(message)
+        return None
+
     # ###########################################################################
-    # Extract, list, getDataFromFile functions
+    # Extract, list, readMember functions
     # ###########################################################################
-    def getDataFromFile(self, pathToFileInExtractor) :
-        # Get the path that is contained in the tarball, since path
-        # that is passed to function is relative path.
-        fileList =  self.list()
-        fullPathToFile = ""
-        for item in fileList:
-            splitItem = item.split("/", 1)
-            # Strip any leading slashes because the result will not
-            # contain one.
-            if (len(splitItem) == 1):
-                if (splitItem[0] == pathToFileInExtractor.strip("/")):
-                    fullPathToFile = item
-                    break;
-            elif (len(splitItem) >= 2):
-                if (splitItem[1] == pathToFileInExtractor.strip("/")):
-                    fullPathToFile = item
-                    break;
-        # Get the options to extract
+    def __readMemberWithCommand(self, member, maxSize=0):
         commandOptions = self.getExtractArgs()
         if (commandOptions == None) :
             message =  "This file is unknown type and will not be extracted: %s." %(self.getPathToFile())
             logging.getLogger(sx.MAIN_LOGGER_NAME).debug(message)
-        elif (not len(fullPathToFile) > 0):
+            return None
+        size = member.getSize()
+        if ((maxSize > 0) and (size > maxSize)):
+            size = maxSize
+        # The data of the file is written to stdout and read into memory
+        # instead of being extracted to a temporary directory.
+        command = [self.getPathToCommand()] + self.__getCommandArgs(commandOptions)
+        command += [self.getPathToFile(), "--to-stdout", member.getName()]
+        try:
+            fnull = open(os.devnull, "w")
+            try:
+                task = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=fnull)
+            finally:
+                fnull.close()
+        except (IOError, os.error):
+            message = "There was an error extracting a file from the file: %s." % (self.getPathToFile())
+            logging.getLogger(sx.MAIN_LOGGER_NAME).debug(message)
+            return None
+        try:
+            data = task.stdout.read(size)
+        finally:
+            # GNU tar keeps reading the tarball after the file is written
+            # so it is stopped once the data has been read.
+            if (task.poll() == None):
+                task.kill()
+            task.stdout.close()
+            task.wait()
+        if (not len(data) == size):
+            message = "There was an error extracting a file from the file: %s." % (self.getPathToFile())
+            logging.getLogger(sx.MAIN_LOGGER_NAME).debug(message)
+            return None
+        return data
+
+    def __readMemberWithTarfile(self, matchFunction, maxSize=0):
+        # Read the tarball until the member is found and stop reading
+        # the tarball once the member's data has been read.
+        try:
+            (tarFile, fileobj) = self.__openTarfile()
+            try:
+                for tarinfo in tarFile:
+                    if ((tarinfo.isreg()) and (matchFunction(tarinfo.name))):
+                        fin = tarFile.extractfile(tarinfo)
+                        if (maxSize > 0):
+                            return fin.read(maxSize)
+                        return fin.read()
+                    tarFile.members = []
+            finally:
+                self.__closeTarfile(tarFile, fileobj)
+        except (tarfile.TarError, IOError, os.error, EOFError, zlib.error):
+            message = "There was an error extracting a file from the file: %s." % (self.getPathToFile())
+            logging.getLogger(sx.MAIN_LOGGER_NAME).debug(message)
+        return None
+
+    def readMember(self, pathToFileInExtractor, maxSize=0):
+        if ((not self.isNativeSupported()) or (not MemberIndexCache.get(self.getPathToFile()) == None)):
+            return Extractor.readMember(self, pathToFileInExtractor, maxSize)
+        # The tarball is not indexed just to read one file.
+        relativePath = pathToFileInExtractor.strip("/")
+        data = self.__readMemberWithTarfile(lambda name: self.getRelativePath(name, 1) == relativePath, maxSize)
+        if (data == None):
             message = "The path to the file does not exist: %s" %(pathToFileInExtractor)
             logging.getLogger(sx.MAIN_LOGGER_NAME).debug(message)
-        else:
-            # ###################################################################
-            # Create a tmp directory to extract the file
-            # ###################################################################
-            if (not os.access(Extractor.PATH_TO_TEMP_DIR, os.F_OK)):
-                try:
-                    os.makedirs(Extractor.PATH_TO_TEMP_DIR)
-                except (IOError, os.error):
-                    message = "Could not create the directory to extract file to: %s" % (Extractor.PATH_TO_TEMP_DIR)
-                    logging.getLogger(sx.MAIN_LOGGER_NAME).debug(message)
-            command = [self.getPathToCommand(), commandOptions, self.getPathToFile(), "-C", Extractor.PATH_TO_TEMP_DIR, "--strip-components", "0", fullPathToFile]
-            task = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-            (stdout, stderr) = task.communicate()
-            if (not task.returncode  == 0):
-                message = "There was an error extracting a file from the file: %s." % (self.getPathToFile())
-                logging.getLogger(sx.MAIN_LOGGER_NAME).debug(message)
-            else:
-                fileExtractedContents = []
-                pathToExtractedFile = os.path.join(Extractor.PATH_TO_TEMP_DIR, fullPathToFile)
-                # Extract the contents of the file to an array
-                if (os.path.isfile(pathToExtractedFile)):
-                    try:
-                        fout = open(pathToExtractedFile, "r")
-                        fileExtractedContents = fout.readlines()
-                        fout.close
-                    except (IOError, os.error, KeyError):
-                        message = "There was a problem reading a file that was extracted from a tarfile: %s" %(pathToExtractedFile)
-                        logging.getLogger(sx.MAIN_LOGGER_NAME).debug(message)
-                return fileExtractedContents
-        return []
+        return data
 
-    def extract(self, extractDir, stripDirectoriesDepth=1) :
+    def getDataFromMember(self, member, maxSize=0):
+        if (not member.isFile()):
+            return None
+        elif (not self.isNativeSupported()):
+            return self.__readMemberWithCommand(member, maxSize)
+        memberIndex = self.getMemberIndex()
+        if ((memberIndex == None) or (member.getOffsetData() < 0)):
+            memberName = self.getRelativePath(member.getName(), 0)
+            return self.__readMemberWithTarfile(lambda name: self.getRelativePath(name, 0) == memberName, maxSize)
+        size = member.getSize()
+        if ((maxSize > 0) and (size > maxSize)):
+            size = maxSize
+        try:
+            if (self.__blockCache == None):
+                self.__blockCache = BlockCache(self.getPathToFile(), self.getCompressionType(),
+                                               memberIndex.getSeekIndex())
+            data = self.__blockCache.read(member.getOffsetData(), size)
+        except (IOError, os.error, EOFError, zlib.error):
+            message = "There was an error reading a file from the file: %s." % (self.getPathToFile())
+            logging.getLogger(sx.MAIN_LOGGER_NAME).debug(message)
+            return None
+        if (not len(data) == size):
+            message = "The tarball ended before all the data was read for the file: %s." % (member.getName())
+            logging.getLogger(sx.MAIN_LOGGER_NAME).debug(message)
+            return None
+        return data
+
+    def close(self):
+        if (not self.__blockCache == None):
+            message = "The cache of decompressed blocks had %d hits and %d misses for the file: %s." %(self.__blockCache.getHits(),
+                                                                                                       self.__blockCache.getMisses(),
+                                                                                                       self.getPathToFile())
+            logging.getLogger(sx.MAIN_LOGGER_NAME).debug(message)
+            self.__blockCache.close()
+            self.__blockCache = None
+
+    def __extractWithCommand(self, extractDir, stripDirectoriesDepth=1, listOfMembers=[]) :
         commandOptions = self.getExtractArgs()
         if (commandOptions == None) :
             message =  "This file is unknown type and will not be extracted: %s." %(self.getPathToFile())
@@ -139,16 +489,24 @@ class Tarextractor(Extractor) :
             message = "The %s command does not appear to be installed or incorrect version." %(self.getPathToCommand())
             logging.getLogger(sx.MAIN_LOGGER_NAME).debug(message)
         else:
-            # Add in all files that should be excluded. Add exclude string so
-            # that certain large files are skipped like /var/account. An option
-            # will need to be added to sx, report classes, and extractors. Will
-            # need to build up the string if multiples. Need to test cause it
-            # did not work before but appears to be good idea.
-            excludedFiles = ""
-            #excludedFiles = " --exclude=\"var/account/p*\""
-            message = "%s %s %s -C %s --strip-components %s %s" %(self.getPathToCommand(), commandOptions, self.getPathToFile(), extractDir, str(stripDirectoriesDepth), excludedFiles)
-            logging.getLogger(sx.MAIN_LOGGER_NAME).debug(message)
-            command = [self.getPathToCommand(), commandOptions, self.getPathToFile(), "-C", extractDir, "--strip-components", str(stripDirectoriesDepth), excludedFiles]
+            # Add in all files that should be excluded. The patterns are not
+            # anchored so they match the paths before the leading
+            # directories are stripped. The size limits of the exclusion
+            # policy are not supported by GNU tar.
+            excludedFiles = []
+            exclusionPolicy = self.getExclusionPolicy()
+            if (not exclusionPolicy == None):
+                for pathGlob in exclusionPolicy.getExcludePathGlobs():
+                    excludedFiles.append("--exclude=%s" %(pathGlob))
+                if ((exclusionPolicy.getMaxFileSize() > 0) or (exclusionPolicy.getMaxTotalSize() > 0)):
+                    message = "The size limits for the files extracted are ignored since the file cannot be read natively: %s." % (self.getPathToFile())
+                    logging.getLogger(sx.MAIN_LOGGER_NAME).debug(message)
+            commandArgs = self.__getCommandArgs(commandOptions)
+            message = "%s %s %s -C %s --strip-components %s %s" %(self.getPathToCommand(), " ".join(commandArgs), self.getPathToFile(), extractDir, str(stripDirectoriesDepth), " ".join(excludedFiles))
+            logging.getLogger(sx.MAIN_LOGGER_NAME).debug(message)
+            command = [self.getPathToCommand()] + commandArgs + [self.getPathToFile(), "-C", extractDir, "--strip-components", str(stripDirectoriesDepth)] + excludedFiles
+            # Only extract the members that were given if any were given.
+            command += listOfMembers
             task = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
             (stdout, stderr) = task.communicate()
             if (not task.returncode  == 0):
@@ -158,3 +516,312 @@ class Tarextractor(Extractor) :
                 return os.path.isdir(extractDir)
         return False
 
+    def __extractWithTarfile(self, extractDir, stripDirectoriesDepth=1, useParallelDecompressor=False) :
+        message = "Extracting the file with the tarfile module: %s" %(self.getPathToFile())
+        logging.getLogger(sx.MAIN_LOGGER_NAME).debug(message)
+        memberIndex = MemberIndex()
+        # Members that tarfile cannot create will be extracted with GNU tar.
+        listOfUnsupportedMembers = []
+        # The attributes on directories are set after all the files are
+        # written in case the directory is not writable.
+        directories = []
+        # Hard links to files that were not extracted are extracted after
+        # the index of the tarball is created.
+        listOfHardlinks = []
+        # Symbolic links that lead outside of the extraction directory are
+        # created after all the other members are written, so that no
+        # member is written through them.
+        listOfSymlinks = []
+        unsafeCount = 0
+        skippedCount = 0
+        excludedCount = 0
+        errorCount = 0
+        try:
+            (tarFile, fileobj) = self.__openTarfile(useParallelDecompressor)
+            try:
+                for tarinfo in tarFile:
+                    # Do not keep all the members in memory.
+                    tarFile.members = []
+                    memberIndex.add(self.__getArchiveMember(tarinfo))
+                    relativePath = self.getRelativePath(tarinfo.name, stripDirectoriesDepth)
+                    relativeLinkname = ""
+                    if (tarinfo.islnk()):
+                        relativeLinkname = self.getRelativePath(tarinfo.linkname, stripDirectoriesDepth)
+                    if (not len(relativePath) > 0):
+                        continue
+                    elif (self.__isExcluded(relativePath, tarinfo.isdir(), tarinfo.size, relativeLinkname)):
+                        excludedCount += 1
+                        continue
+                    elif (not self.isIncluded(relativePath)):
+                        skippedCount += 1
+                        continue
+                    elif ((tarinfo.isreg()) and (not self.__reserve(relativePath, tarinfo.size))):
+                        excludedCount += 1
+                        continue
+                    elif (not (tarinfo.isreg() or tarinfo.isdir() or tarinfo.issym() or tarinfo.islnk())):
+                        listOfUnsupportedMembers.append(tarinfo.name)
+                        continue
+                    elif (tarinfo.islnk()):
+                        # Hard links point at another member so that path
+                        # has to be stripped as well.
+                        tarinfo.linkname = relativeLinkname
+                        if (not len(tarinfo.linkname) > 0):
+                            continue
+                        elif (not self.isIncluded(tarinfo.linkname)):
+                            listOfHardlinks.append(relativePath)
+                            continue
+                    if (not self.isPathSafe(extractDir, relativePath)):
+                        unsafeCount += 1
+                        message = "The file will not be extracted since it would be written outside of the extraction directory: %s." %(tarinfo.name)
+                        logging.getLogger(sx.MAIN_LOGGER_NAME).debug(message)
+                        continue
+                    elif ((tarinfo.issym()) and (self.isLinknameEscaping(relativePath, tarinfo.linkname))):
+                        listOfSymlinks.append((relativePath, tarinfo.linkname))
+                        continue
+                    tarinfo.name = relativePath
+                    if (tarinfo.isdir()):
+                        directories.append(copy.copy(tarinfo))
+                        tarinfo.mode = 0700
+                    try:
+                        if ((tarinfo.isreg()) and (tarinfo.size > 0) and (not self.getContentStore() == None)):
+                            self.__addToContentStore(tarFile.extractfile(tarinfo), tarinfo.size,
+                                                     os.path.join(extractDir, tarinfo.name))
+                        else:
+                            tarFile.extract(tarinfo, extractDir)
+                    except (tarfile.ExtractError, EnvironmentError, KeyError):
+                        errorCount += 1
+                        message = "There was an error extracting the file: %s." %(tarinfo.name)
+                        logging.getLogger(sx.MAIN_LOGGER_NAME).debug(message)
+                seekIndex = fileobj.getSeekIndex()
+                if (not fileobj.isIndexing()):
+                    # The restart points are not found when the tarball is
+                    # decompressed with a command, so the restart points of
+                    # the index that was created before are kept.
+                    cachedMemberIndex = MemberIndexCache.get(self.getPathToFile())
+                    if ((not cachedMemberIndex == None) and (not cachedMemberIndex.getSeekIndex() == None) and
+                        (len(cachedMemberIndex.getSeekIndex()) > len(seekIndex))):
+                        seekIndex = cachedMemberIndex.getSeekIndex()
+                memberIndex.setSeekIndex(seekIndex)
+                # Set the attributes on the directories starting with the
+                # deepest directory.
+                directories.sort(key=lambda tarinfo: tarinfo.name)
+                directories.reverse()
+                for tarinfo in directories:
+                    pathToDir = os.path.join(extractDir, tarinfo.name)
+                    try:
+                        tarFile.chown(tarinfo, pathToDir)
+                        tarFile.utime(tarinfo, pathToDir)
+                        tarFile.chmod(tarinfo, pathToDir)
+                    except (tarfile.ExtractError, EnvironmentError):
+                        message = "There was an error setting the attributes on the directory: %s." %(pathToDir)
+                        logging.getLogger(sx.MAIN_LOGGER_NAME).debug(message)
+            finally:
+                self.__closeTarfile(tarFile, fileobj)
+        except (tarfile.TarError, IOError, os.error, EOFError, zlib.error):
+            message = "There was an error extracting the file: %s." % (self.getPathToFile())
+            logging.getLogger(sx.MAIN_LOGGER_NAME).debug(message)
+            return False
+        # Save the index so the tarball does not need to be read again.
+        MemberIndexCache.add(self.getPathToFile(), memberIndex)
+        if (skippedCount > 0):
+            message = "There was %d files that were not extracted because they did not match the include path globs from the file: %s." %(skippedCount, self.getPathToFile())
+            logging.getLogger(sx.MAIN_LOGGER_NAME).debug(message)
+        if (excludedCount > 0):
+            message = "There was %d files that were skipped because of the exclusion policy from the file: %s." %(excludedCount, self.getPathToFile())
+            logging.getLogger(sx.MAIN_LOGGER_NAME).debug(message)
+        if (len(listOfHardlinks) > 0):
+            self.extractMembers(extractDir, listOfHardlinks, stripDirectoriesDepth)
+        if (errorCount > 0):
+            message = "There was %d files that could not be extracted from the file: %s." %(errorCount, self.getPathToFile())
+            logging.getLogger(sx.MAIN_LOGGER_NAME).debug(message)
+        if (len(listOfUnsupportedMembers) > 0):
+            message = "There was %d files that will be extracted with %s from the file: %s." %(len(listOfUnsupportedMembers),
+                                                                                              self.getPathToCommand(),
+                                                                                              self.getPathToFile())
+            logging.getLogger(sx.MAIN_LOGGER_NAME).debug(message)
+            self.__extractWithCommand(extractDir, stripDirectoriesDepth, listOfUnsupportedMembers)
+        for (relativePath, linkname) in listOfSymlinks:
+            pathToFile = os.path.join(extractDir, relativePath)
+            try:
+                if ((self.isPathSafe(extractDir, os.path.dirname(relativePath))) and (not os.path.lexists(pathToFile))):
+                    if (not os.path.isdir(os.path.dirname(pathToFile))):
+                        os.makedirs(os.path.dirname(pathToFile))
+                    os.symlink(linkname, pathToFile)
+            except (IOError, os.error):
+                message = "There was an error extracting the file: %s." %(relativePath)
+                logging.getLogger(sx.MAIN_LOGGER_NAME).debug(message)
+        if (unsafeCount > 0):
+            message = "There was %d files that were not extracted because they would be written outside of the extraction directory from the file: %s." %(unsafeCount, self.getPathToFile())
+            logging.getLogger(sx.MAIN_LOGGER_NAME).warning(message)
+        return os.path.isdir(extractDir)
+
+    def extract(self, extractDir, stripDirectoriesDepth=1) :
+        if (not self.isNativeSupported()):
+            if (not self.getIncludePathGlobs() == None):
+                message = "All the files will be extracted since the file cannot be read natively: %s." % (self.getPathToFile())
+                logging.getLogger(sx.MAIN_LOGGER_NAME).debug(message)
+            return self.__extractWithCommand(extractDir, stripDirectoriesDepth)
+        compressionType = self.getCompressionType()
+        # The files that are not extracted are read from the tarball later
+        # on, which needs the restart points that are only found when the
+        # tarball is not decompressed with a command.
+        if ((not compressionType == None) and (self.getIncludePathGlobs() == None) and
+            (not DecompressorsHelper.getDecompressor(compressionType, True) == None)):
+            if (self.__extractWithTarfile(extractDir, stripDirectoriesDepth, True)):
+                return True
+            message = "The file will be extracted again without the parallel decompressor: %s." % (self.getPathToFile())
+            logging.getLogger(sx.MAIN_LOGGER_NAME).debug(message)
+        return self.__extractWithTarfile(extractDir, stripDirectoriesDepth)
+
+    def __addToContentStore(self, fin, size, pathToFile):
+        """
+        Adds the data of the member to the content store and links it to
+        the file.
+
+        @param fin: The file object that the data of the member is read
+        from.
+        @type fin: File
+        @param size: The size of the member's data in bytes.
+        @type size: Int
+        @param pathToFile: The path to the file that will be linked.
+        @type pathToFile: String
+        """
+        if (not os.path.isdir(os.path.dirname(pathToFile))):
+            os.makedirs(os.path.dirname(pathToFile))
+        self.getContentStore().add(fin, size, pathToFile)
+
+    def __writeMemberData(self, fin, member, pathToFile):
+        """
+        Writes the data of the member to the file.
+
+        @param fin: The reader for the uncompressed tarball.
+        @type fin: CompressedFileReader
+        @param member: The member whose data will be written.
+        @type member: ArchiveMember
+        @param pathToFile: The path to the file that will be written.
+        @type pathToFile: String
+        """
+        fin.seek(member.getOffsetData())
+        if ((member.getSize() > 0) and (not self.getContentStore() == None)):
+            self.__addToContentStore(fin, member.getSize(), pathToFile)
+            return
+        self.__copyMemberData(fin, member, pathToFile)
+
+    def __copyMemberData(self, fin, member, pathToFile):
+        """
+        Copies the data of the member to the file. The reader has to be
+        at the offset of the member's data.
+
+        @param fin: The reader for the uncompressed tarball.
+        @type fin: CompressedFileReader
+        @param member: The member whose data will be written.
+        @type member: ArchiveMember
+        @param pathToFile: The path to the file that will be written.
+        @type pathToFile: String
+        """
+        fout = open(pathToFile, "wb")
+        try:
+            remaining = member.getSize()
+            while (remaining > 0):
+                data = fin.read(min(remaining, 1048576))
+                if (not len(data) > 0):
+                    raise IOError("The tarball ended before all the data was read: %s." %(self.getPathToFile()))
+                fout.write(data)
+                remaining -= len(data)
+        finally:
+            fout.close()
+
+    def extractMemberToFile(self, member, pathToFile):
+        memberIndex = self.getMemberIndex()
+        if ((not self.isNativeSupported()) or (memberIndex == None) or
+            (not member.isFile()) or (member.getOffsetData() < 0)):
+            return False
+        try:
+            fin = CompressedFileReader(self.getPathToFile(), self.getCompressionType(), memberIndex.getSeekIndex())
+            try:
+                fin.seek(member.getOffsetData())
+                self.__copyMemberData(fin, member, pathToFile)
+            finally:
+                fin.close()
+        except (IOError, os.error, EOFError, zlib.error):
+            message = "There was an error writing the file %s from the file: %s." %(member.getName(), self.getPathToFile())
+            logging.getLogger(sx.MAIN_LOGGER_NAME).debug(message)
+            return False
+        return True
+
+    def extractMembers(self, extractDir, listOfPaths, stripDirectoriesDepth=1) :
+        memberIndex = self.getMemberIndex()
+        if (memberIndex == None):
+            return False
+        listOfMembers = memberIndex.findMembers(listOfPaths)
+        if (not len(listOfMembers) > 0):
+            return False
+        elif (not self.isNativeSupported()):
+            listOfNames = []
+            for member in listOfMembers:
+                listOfNames.append(member.getName())
+            return self.__extractWithCommand(extractDir, stripDirectoriesDepth, listOfNames)
+        message = "Extracting %d files from the file: %s" %(len(listOfMembers), self.getPathToFile())
+        logging.getLogger(sx.MAIN_LOGGER_NAME).debug(message)
+        # Read the members in the order they are in the tarball so that
+        # decompression does not have to be restarted for each member.
+        listOfMembers.sort(key=lambda member: member.getOffsetData())
+        extractedCount = 0
+        try:
+            fin = CompressedFileReader(self.getPathToFile(), self.getCompressionType(), memberIndex.getSeekIndex())
+            try:
+                for member in listOfMembers:
+                    relativePath = self.getRelativePath(member.getName(), stripDirectoriesDepth)
+                    if (not len(relativePath) > 0):
+                        continue
+                    pathToFile = os.path.join(extractDir, relativePath)
+                    if (not self.isPathSafe(extractDir, relativePath)):
+                        message = "The file will not be extracted since it would be written outside of the extraction directory: %s." %(relativePath)
+                        logging.getLogger(sx.MAIN_LOGGER_NAME).warning(message)
+                        continue
+                    try:
+                        if (member.isDir()):
+                            if (self.__isExcluded(relativePath, True)):
+                                continue
+                        elif (os.path.lexists(pathToFile)):
+                            # The file was extracted with the report.
+                            extractedCount += 1
+                            continue
+                        elif ((member.isFile()) or (member.isHardlink())):
+                            dataMember = member
+                            if (member.isHardlink()):
+                                dataMember = memberIndex.getMember(member.getLinkname())
+                            if ((dataMember == None) or (dataMember.getOffsetData() < 0)):
+                                continue
+                            relativeLinkname = ""
+                            if (member.isHardlink()):
+                                relativeLinkname = self.getRelativePath(member.getLinkname(), stripDirectoriesDepth)
+                            if ((self.__isExcluded(relativePath, False, dataMember.getSize(), relativeLinkname)) or
+                                (not self.__reserve(relativePath, dataMember.getSize()))):
+                                continue
+                        elif (self.__isExcluded(relativePath)):
+                            continue
+                        if (not os.path.isdir(os.path.dirname(pathToFile))):
+                            os.makedirs(os.path.dirname(pathToFile))
+                        if (member.isDir()):
+                            if (not os.path.isdir(pathToFile)):
+                                os.mkdir(pathToFile)
+                        elif (member.isSymlink()):
+                            if (not os.path.lexists(pathToFile)):
+                                os.symlink(member.getLinkname(), pathToFile)
+                        elif ((member.isFile()) or (member.isHardlink())):
+                            # A hard link is written as a copy of the file it
+                            # links to since that file might not be extracted.
+                            self.__writeMemberData(fin, dataMember, pathToFile)
+                        else:
+                            continue
+                        extractedCount += 1
+                    except (IOError, os.error):
+                        message = "There was an error extracting the file: %s." %(relativePath)
+                        logging.getLogger(sx.MAIN_LOGGER_NAME).debug(message)
+            finally:
+                fin.close()
+        except (IOError, os.error, EOFError, zlib.error):
+            message = "There was an error extracting the files from the file: %s." % (self.getPathToFile())
+            logging.getLogger(sx.MAIN_LOGGER_NAME).debug(message)
+        return (extractedCount > 0)
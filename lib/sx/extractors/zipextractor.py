@@ -1,23 +1,46 @@
 #!/usr/bin/env python
 """
+Performs operations on a zip file. The zip file is read with the python
+zipfile module. The central directory of the zip file has every member
+so a member can be read without reading the rest of the zip file. When
+the whole zip file is extracted the members are decompressed by more
+than 1 thread since each member is compressed on its own.
 
 @author    :  Shane Bradley
 @contact   :  sbradley@redhat.com
 @version   :  2.17
 @copyright :  GPLv2
 """
+import os
 import os.path
 import logging
 import mimetypes
 import subprocess
 import shutil
+import zipfile
+import stat
+import time
+import errno
+import threading
+import Queue
+import multiprocessing
 
 import sx
 from sx.logwriter import LogWriter
 from sx.extractors import Extractor
+from sx.extractors.lib.memberindex import ArchiveMember
+from sx.extractors.lib.memberindex import MemberIndex
+from sx.extractors.lib.exclusionpolicy import ExclusionPolicy
 
 
 class Zipextractor(Extractor) :
+    """
+    @cvar MAX_JOBS: The largest number of threads that decompress the
+    members of the zip file at the same time.
+    @type MAX_JOBS: Int
+    """
+    MAX_JOBS = 8
+
     def __init__(self, pathToFile):
         Extractor.__init__(self, "ZIPextractor", pathToFile, "/usr/bin/unzip")
 
@@ -60,74 +83,358 @@ class Zipextractor(Extractor) :
             return None;
         return "-qo"
 
+    def buildMemberIndex(self):
+        if (not self.isValidMimeType()):
+            return None
+        # The central directory of the zip file contains all the members
+        # so the members do not have to be decompressed to index them.
+        memberIndex = MemberIndex()
+        try:
+            zipFile = zipfile.ZipFile(self.getPathToFile(), "r")
+            try:
+                for zipinfo in zipFile.infolist():
+                    memberType = ArchiveMember.TYPE_FILE
+                    if (zipinfo.filename.endswith("/")):
+                        memberType = ArchiveMember.TYPE_DIR
+                    memberIndex.add(ArchiveMember(zipinfo.filename.rstrip("/"), memberType,
+                                                  zipinfo.file_size, zipinfo.header_offset))
+            finally:
+                zipFile.close()
+        except (zipfile.BadZipfile, IOError, os.error):
+            message = "There was an error listing the file contents: %s." % (self.getPathToFile())
+            logging.getLogger(sx.MAIN_LOGGER_NAME).debug(message)
+            return None
+        return memberIndex
+
     # ###########################################################################
-    # Extract, getDataFromFile functions
+    # Extract, getDataFromMember functions
     # ###########################################################################
-    def getDataFromFile(self, pathToFileInExtractor) :
-        # unzip RHEV-log.zip RhevManager.exe.config -d test/
-        fullPathToFile = pathToFileInExtractor
-        fileList =  self.list()
-        fullPathToFile = ""
-        for item in fileList:
-            # No stripping required on zip files.
-            if (item == pathToFileInExtractor):
-                fullPathToFile = item
-                break;
-        # Get the options to extract
-        commandOptions = self.getExtactArgs()
-        if (commandOptions == None) :
+    def getMember(self, pathToFileInExtractor):
+        if (not self.isValidMimeType()):
             message =  "This file is unknown type and will not be extracted: %s." %(self.getPathToFile())
             logging.getLogger(sx.MAIN_LOGGER_NAME).debug(message)
-        elif (not len(fullPathToFile) > 0):
-            message = "The path to the file does not exist: %s" %(pathToFileInExtractor)
+            return None
+        memberIndex = self.getMemberIndex()
+        if (memberIndex == None):
+            return None
+        # No stripping required on zip files.
+        return memberIndex.getMember(pathToFileInExtractor.strip("/"))
+
+    def getDataFromMember(self, member, maxSize=0):
+        if ((not self.isValidMimeType()) or (not member.isFile())):
+            return None
+        try:
+            zipFile = zipfile.ZipFile(self.getPathToFile(), "r")
+            try:
+                if (not maxSize > 0):
+                    return zipFile.read(member.getName())
+                # Only the start of the member is decompressed.
+                fin = zipFile.open(member.getName())
+                try:
+                    return fin.read(maxSize)
+                finally:
+                    fin.close()
+            finally:
+                zipFile.close()
+        except (zipfile.BadZipfile, KeyError, IOError, os.error, RuntimeError):
+            message = "There was an error reading a file from the file: %s." % (self.getPathToFile())
             logging.getLogger(sx.MAIN_LOGGER_NAME).debug(message)
-        else:
-            # ###################################################################
-            # Create a tmp directory to extract the file
-            # ###################################################################
-            if (not os.access(Extractor.PATH_TO_TEMP_DIR, os.F_OK)):
+        return None
+
+    def extractMemberToFile(self, member, pathToFile):
+        if ((not self.isValidMimeType()) or (not member.isFile())):
+            return False
+        try:
+            zipFile = zipfile.ZipFile(self.getPathToFile(), "r")
+            try:
+                fin = zipFile.open(member.getName())
                 try:
-                    os.makedirs(Extractor.PATH_TO_TEMP_DIR)
-                except (IOError, os.error):
-                    message = "Could not create the directory to extract file to: %s" % (Extractor.PATH_TO_TEMP_DIR)
-                    logging.getLogger(sx.MAIN_LOGGER_NAME).debug(message)
-
-            command = [self.getPathToCommand(), commandOptions, self.getPathToFile(), fullPathToFile, "-d", Extractor.PATH_TO_TEMP_DIR]
-            task = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-            (stdout, stderr) = task.communicate()
-            if (not task.returncode  == 0):
-                message = "There was an error extracting a file from the file: %s." % (self.getPathToFile())
-                logging.getLogger(sx.MAIN_LOGGER_NAME).debug(message)
-            else:
-                fileExtractedContents = []
-                pathToExtractedFile = os.path.join(Extractor.PATH_TO_TEMP_DIR, fullPathToFile)
-                # Extract the contents of the file to an array
-                if (os.path.isfile(pathToExtractedFile)):
+                    fout = open(pathToFile, "wb")
                     try:
-                        fout = open(pathToExtractedFile, "r")
-                        fileExtractedContents = fout.readlines()
-                        fout.close
-                    except (IOError, os.error, KeyError):
-                        message = "There was a problem reading a file that was extracted from a tarfile: %s" %(pathToExtractedFile)
+                        shutil.copyfileobj(fin, fout, 1048576)
+                    finally:
+                        fout.close()
+                finally:
+                    fin.close()
+            finally:
+                zipFile.close()
+        except (zipfile.BadZipfile, KeyError, IOError, os.error, RuntimeError):
+            message = "There was an error writing the file %s from the file: %s." %(member.getName(), self.getPathToFile())
+            logging.getLogger(sx.MAIN_LOGGER_NAME).debug(message)
+            return False
+        return True
+
+    def getRelativePath(self, pathInExtractor, stripDirectoriesDepth=1):
+        # No stripping required on zip files.
+        return Extractor.getRelativePath(self, pathInExtractor, 0)
+
+    def __getExcludedFiles(self):
+        """
+        Returns the list of the files in the zip file that will not be
+        extracted because of the exclusion policy. The files are
+        recorded as skipped in the policy.
+
+        @return: Returns the list of the files in the zip file that will
+        not be extracted.
+        @rtype: Array
+        """
+        listOfExcludedFiles = []
+        exclusionPolicy = self.getExclusionPolicy()
+        memberIndex = self.getMemberIndex()
+        if ((exclusionPolicy == None) or (memberIndex == None)):
+            return listOfExcludedFiles
+        for member in memberIndex.getMembers():
+            if (member.isDir()):
+                continue
+            # No stripping required on zip files.
+            if (exclusionPolicy.isSkipped(member.getName())):
+                listOfExcludedFiles.append(member.getName())
+                continue
+            reason = exclusionPolicy.getExcludeReason(member.getName(), member.getSize())
+            if ((not len(reason) > 0) and (not exclusionPolicy.reserve(member.getSize()))):
+                reason = ExclusionPolicy.REASON_MAX_TOTAL_SIZE
+            if (len(reason) > 0):
+                exclusionPolicy.skip(member.getName(), member.getSize(), reason)
+                listOfExcludedFiles.append(member.getName())
+        return listOfExcludedFiles
+
+    def __makeDirs(self, pathToDir):
+        """
+        Creates the directory and its parent directories if they do not
+        exist. Another thread can create the same directory at the same
+        time.
+
+        @param pathToDir: The path to the directory.
+        @type pathToDir: String
+        """
+        if (not os.path.isdir(pathToDir)):
+            try:
+                os.makedirs(pathToDir)
+            except OSError, e:
+                if ((not e.errno == errno.EEXIST) or (not os.path.isdir(pathToDir))):
+                    raise
+
+    def __writeMember(self, zipFile, member, pathToFile, listOfSymlinks=None):
+        """
+        Writes the member to the file. The permissions and modification
+        time that are stored in the zip file are set on the file, and
+        symbolic links are created as symbolic links. If there is a list
+        of symbolic links then symbolic links are added to the list
+        instead so that they are created after all the other members are
+        written, since a file could be written through a symbolic link
+        that another thread just created.
+
+        @param zipFile: The opened zip file.
+        @type zipFile: ZipFile
+        @param member: The member that will be written.
+        @type member: ArchiveMember
+        @param pathToFile: The path to the file that will be written.
+        @type pathToFile: String
+        @param listOfSymlinks: The list of tuples of the path to the file
+        and the target of the symbolic links that are created later.
+        @type listOfSymlinks: Array
+        """
+        zipinfo = zipFile.getinfo(member.getName())
+        # The unix mode is stored in the high bytes of the attributes.
+        mode = (zipinfo.external_attr >> 16) & 0xFFFF
+        self.__makeDirs(os.path.dirname(pathToFile))
+        if (stat.S_ISLNK(mode)):
+            linkname = zipFile.read(member.getName())
+            if (not listOfSymlinks == None):
+                listOfSymlinks.append((pathToFile, linkname))
+                return
+            os.symlink(linkname, pathToFile)
+            return
+        elif ((zipinfo.file_size > 0) and (not self.getContentStore() == None)):
+            # The file in the store is shared so its attributes are not
+            # changed.
+            fin = zipFile.open(member.getName())
+            try:
+                self.getContentStore().add(fin, zipinfo.file_size, pathToFile)
+            finally:
+                fin.close()
+            return
+        fin = zipFile.open(member.getName())
+        try:
+            fout = open(pathToFile, "wb")
+            try:
+                shutil.copyfileobj(fin, fout, 1048576)
+            finally:
+                fout.close()
+        finally:
+            fin.close()
+        if ((mode & 0777) > 0):
+            os.chmod(pathToFile, mode & 0777)
+        modificationTime = time.mktime(zipinfo.date_time + (0, 0, -1))
+        os.utime(pathToFile, (modificationTime, modificationTime))
+
+    def __extractMembers(self, extractDir, listOfMembers):
+        """
+        Writes the members to the extract directory. The members are
+        decompressed by more than 1 thread and each thread opens the zip
+        file since a ZipFile cannot be shared by threads. Returns the
+        number of members that could not be written.
+
+        @return: Returns the number of members that could not be
+        written.
+        @rtype: Int
+
+        @param extractDir: The path to the directory for extraction.
+        @type extractDir: String
+        @param listOfMembers: The list of members that will be written.
+        @type listOfMembers: Array
+        """
+        membersQueue = Queue.Queue()
+        for member in listOfMembers:
+            membersQueue.put(member)
+        # The list is used as a counter that every thread can change.
+        errors = []
+        # The symbolic links are created after all the threads have written
+        # the members so that no thread writes through a symbolic link.
+        listOfSymlinks = []
+        def extractMembersFromQueue():
+            try:
+                zipFile = zipfile.ZipFile(self.getPathToFile(), "r")
+            except (zipfile.BadZipfile, IOError, os.error):
+                errors.append(self.getPathToFile())
+                return
+            try:
+                while (True):
+                    try:
+                        member = membersQueue.get_nowait()
+                    except Queue.Empty:
+                        break
+                    relativePath = self.getRelativePath(member.getName())
+                    pathToFile = os.path.join(extractDir, relativePath)
+                    if (not self.isPathSafe(extractDir, relativePath)):
+                        errors.append(member.getName())
+                        message = "The file will not be extracted since it would be written outside of the extraction directory: %s." %(member.getName())
+                        logging.getLogger(sx.MAIN_LOGGER_NAME).warning(message)
+                        continue
+                    try:
+                        self.__writeMember(zipFile, member, pathToFile, listOfSymlinks)
+                    except (zipfile.BadZipfile, zipfile.LargeZipFile, KeyError, IOError, os.error, RuntimeError):
+                        errors.append(member.getName())
+                        message = "There was an error extracting the file: %s." %(member.getName())
                         logging.getLogger(sx.MAIN_LOGGER_NAME).debug(message)
-                return fileExtractedContents
-        return []
+            finally:
+                zipFile.close()
+        jobs = 1
+        try:
+            jobs = min(Zipextractor.MAX_JOBS, multiprocessing.cpu_count(), len(listOfMembers))
+        except NotImplementedError:
+            pass
+        if (not jobs > 1):
+            extractMembersFromQueue()
+        else:
+            listOfThreads = []
+            for i in range(0, jobs):
+                thread = threading.Thread(target=extractMembersFromQueue)
+                thread.setDaemon(True)
+                thread.start()
+                listOfThreads.append(thread)
+            for thread in listOfThreads:
+                thread.join()
+        for (pathToFile, linkname) in listOfSymlinks:
+            try:
+                if ((self.isPathSafe(extractDir, os.path.dirname(os.path.relpath(pathToFile, extractDir)))) and
+                    (not os.path.lexists(pathToFile))):
+                    os.symlink(linkname, pathToFile)
+            except (IOError, os.error):
+                errors.append(pathToFile)
+                message = "There was an error extracting the file: %s." %(pathToFile)
+                logging.getLogger(sx.MAIN_LOGGER_NAME).debug(message)
+        return len(errors)
 
     def extract(self, extractDir, stripDirectoriesDepth=1) :
-        commandOptions = self.getExtactArgs()
-        if (commandOptions == None) :
+        if (not self.isValidMimeType()):
             message =  "This file is unknown type and will not be extracted: %s." %(self.getPathToFile())
             logging.getLogger(sx.MAIN_LOGGER_NAME).debug(message)
-        elif (not self.isCommandInstalled()):
-            message = "The %s command does not appear to be installed or incorrect version." %(self.getPathToCommand())
+            return False
+        memberIndex = self.getMemberIndex()
+        if (memberIndex == None):
+            message = "There was an error extracting the file: %s." % (self.getPathToFile())
             logging.getLogger(sx.MAIN_LOGGER_NAME).debug(message)
-        else:
-            command = [self.getPathToCommand(), commandOptions, self.getPathToFile(), "-d", extractDir]
-            task = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-            (stdout, stderr) = task.communicate()
-            if (not task.returncode  == 0):
-                message = "There was an error extracting the file: %s." % (self.getPathToFile())
-                logging.getLogger(sx.MAIN_LOGGER_NAME).debug(message)
+            return False
+        message = "Extracting the file with the zipfile module: %s" %(self.getPathToFile())
+        logging.getLogger(sx.MAIN_LOGGER_NAME).debug(message)
+        listOfExcludedFiles = self.__getExcludedFiles()
+        if (len(listOfExcludedFiles) > 0):
+            message = "There was %d files that will be skipped because of the exclusion policy from the file: %s." %(len(listOfExcludedFiles), self.getPathToFile())
+            logging.getLogger(sx.MAIN_LOGGER_NAME).debug(message)
+        listOfExcludedFiles = set(listOfExcludedFiles)
+        listOfMembers = []
+        skippedCount = 0
+        try:
+            self.__makeDirs(extractDir)
+            for member in memberIndex.getMembers():
+                relativePath = self.getRelativePath(member.getName())
+                if ((not len(relativePath) > 0) or (member.getName() in listOfExcludedFiles)):
+                    continue
+                elif (member.isDir()):
+                    self.__makeDirs(os.path.join(extractDir, relativePath))
+                elif (not self.isIncluded(relativePath)):
+                    skippedCount += 1
+                else:
+                    listOfMembers.append(member)
+        except OSError:
+            message = "There was an error creating the directories for the file: %s." % (self.getPathToFile())
+            logging.getLogger(sx.MAIN_LOGGER_NAME).debug(message)
+            return False
+        if (skippedCount > 0):
+            message = "There was %d files that were not extracted because they did not match the include path globs from the file: %s." %(skippedCount, self.getPathToFile())
+            logging.getLogger(sx.MAIN_LOGGER_NAME).debug(message)
+        errorCount = self.__extractMembers(extractDir, listOfMembers)
+        if (errorCount > 0):
+            message = "There was %d files that could not be extracted from the file: %s." %(errorCount, self.getPathToFile())
+            logging.getLogger(sx.MAIN_LOGGER_NAME).debug(message)
+        return os.path.isdir(extractDir)
+
+    def extractMembers(self, extractDir, listOfPaths, stripDirectoriesDepth=1) :
+        memberIndex = self.getMemberIndex()
+        if ((not self.isValidMimeType()) or (memberIndex == None)):
+            return False
+        listOfStrippedPaths = []
+        for path in listOfPaths:
+            listOfStrippedPaths.append(path.strip("/"))
+        exclusionPolicy = self.getExclusionPolicy()
+        listOfMembers = []
+        extractedCount = 0
+        for member in memberIndex.getMembers():
+            # No stripping required on zip files.
+            relativePath = self.getRelativePath(member.getName())
+            if (not len(relativePath) > 0):
+                continue
+            for path in listOfStrippedPaths:
+                if ((relativePath == path) or (relativePath.startswith("%s/" %(path)))):
+                    break
             else:
-                return os.path.isdir(extractDir)
-        return False
+                continue
+            pathToFile = os.path.join(extractDir, relativePath)
+            if (member.isDir()):
+                if (not os.path.isdir(pathToFile)):
+                    try:
+                        self.__makeDirs(pathToFile)
+                    except OSError:
+                        continue
+                extractedCount += 1
+                continue
+            elif (os.path.lexists(pathToFile)):
+                # The file was extracted with the report.
+                extractedCount += 1
+                continue
+            elif (not exclusionPolicy == None):
+                if (exclusionPolicy.isSkipped(relativePath)):
+                    continue
+                reason = exclusionPolicy.getExcludeReason(relativePath, member.getSize())
+                if ((not len(reason) > 0) and (not exclusionPolicy.reserve(member.getSize()))):
+                    reason = ExclusionPolicy.REASON_MAX_TOTAL_SIZE
+                if (len(reason) > 0):
+                    exclusionPolicy.skip(relativePath, member.getSize(), reason)
+                    continue
+            listOfMembers.append(member)
+        if (len(listOfMembers) > 0):
+            message = "Extracting %d files from the file: %s" %(len(listOfMembers), self.getPathToFile())
+            logging.getLogger(sx.MAIN_LOGGER_NAME).debug(message)
+            extractedCount += len(listOfMembers) - self.__extractMembers(extractDir, listOfMembers)
+        return (extractedCount > 0)
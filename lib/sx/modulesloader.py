@@ -16,6 +16,7 @@ import os.path
 import logging
 import sys
 import re
+import fnmatch
 
 import sx
 from sx.logwriter import LogWriter
@@ -162,37 +163,99 @@ class ReportsLoader(ModulesLoader) :
         self.__coreClasses = self.getClasses(self.__pathToBaseDir, sx.REPORT_CORE_IMPORT)
         self.__userClasses = self.getClasses(sx.SXConfigurationFiles.CONFIGURATION_DIR,
                                              sx.SXConfigurationFiles.REPORT_USER_IMPORT)
-        # Build the regex for searching.
-        self.__findRegexCore =self. __buildFindReportRegex(self.__coreClasses)
-        self.__findRegexUser =self. __buildFindReportRegex(self.__userClasses)
+        # The index of the type detection files of the report classes so
+        # that a path is matched by looking up each of its suffixes.
+        self.__signatureIndexCore = self.__buildSignatureIndex(self.__coreClasses)
+        self.__signatureIndexUser = self.__buildSignatureIndex(self.__userClasses)
 
         # Load up extractors
         self.__extractorsLoader = ExtractorsLoader()
 
-    def __buildFindReportRegex(self, reportClasses) :
+    def __splitPath(self, pathToFile):
         """
-        Returns a regex string based on type detection file
-        in report classes.
+        Returns the list of the components of the normalized path. Empty
+        components and "." are removed.
 
-        Do note that certain characters are not allowed in filename
-        because of re rules. All whitespaces will be turned to
-        underscores.
+        @return: Returns the list of the components of the normalized
+        path.
+        @rtype: Array
 
-        @return: Returns a regex string based on type detection file
-        in report classes.
-        @rtype: Class
+        @param pathToFile: The path to a file.
+        @type pathToFile: String
+        """
+        splitPath = []
+        for item in pathToFile.split("/"):
+            if ((len(item) > 0) and (not item == ".")):
+                splitPath.append(item)
+        return splitPath
 
+    def __buildSignatureIndex(self, reportClasses):
         """
-        # Build the expression for all the different signature
-        # files inside that report file.
-        regex = ""
+        Returns a tuple of a map of the type detection file of each
+        report class to the report class and a list of tuples of a
+        compiled pattern and the report class. A type detection file
+        that contains the glob characters "*?[" is added as a pattern,
+        which is only used by user defined report types. If more than one
+        class has the same type detection file then the first class is
+        used.
+
+        @return: Returns a tuple of a map of the type detection file of
+        each report class to the report class and a list of tuples of a
+        compiled pattern and the report class.
+        @rtype: Tuple
+
+        @param reportClasses: The list of report classes.
+        @type reportClasses: Array
+        """
+        detectionFilesMap = {}
+        listOfPatterns = []
         for reportClass in reportClasses:
-            # Escape out . with \.
-            if (len(regex) > 0) :
-                regex += "|"
-            if (not reportClass == None) :
-                regex += "(?P<%s>.*%s.*)" %(reportClass.REPORT_NAME.replace(" ", "_"), reportClass.TYPE_DETECTION_FILE.replace(".", "\."))
-        return regex
+            if (reportClass == None):
+                continue
+            detectionFile = "/".join(self.__splitPath(reportClass.TYPE_DETECTION_FILE))
+            if (not len(detectionFile) > 0):
+                continue
+            elif ((detectionFile.find("*") >= 0) or (detectionFile.find("?") >= 0) or (detectionFile.find("[") >= 0)):
+                # The pattern is only matched against a path suffix with the
+                # same number of components so the cost is bounded.
+                listOfPatterns.append((len(detectionFile.split("/")), re.compile(fnmatch.translate(detectionFile)), reportClass))
+            elif (not detectionFilesMap.has_key(detectionFile)):
+                detectionFilesMap[detectionFile] = reportClass
+        return (detectionFilesMap, listOfPatterns)
+
+    def __matchDetectionFile(self, pathToFile, includeUserReports=True):
+        """
+        Returns the report class whose type detection file is the end of
+        the path. The type detection file has to match whole path
+        components, so "sos_logs/sos.log" matches
+        "sosreport-host/sos_logs/sos.log". None is returned if the path
+        is not a type detection file.
+
+        @return: Returns the report class whose type detection file is
+        the end of the path.
+        @rtype: Class
+
+        @param pathToFile: The path to a file.
+        @type pathToFile: String
+        @param includeUserReports: If enable the user modules(reports) will
+        be searched. Default is True
+        @type includeUserReports: Boolean
+        """
+        listOfSignatureIndexes = [self.__signatureIndexCore]
+        if (includeUserReports):
+            listOfSignatureIndexes.append(self.__signatureIndexUser)
+        splitPath = self.__splitPath(pathToFile)
+        for i in range(0, len(splitPath)):
+            pathSuffix = "/".join(splitPath[i:])
+            for (detectionFilesMap, listOfPatterns) in listOfSignatureIndexes:
+                if (detectionFilesMap.has_key(pathSuffix)):
+                    return detectionFilesMap.get(pathSuffix)
+        for (detectionFilesMap, listOfPatterns) in listOfSignatureIndexes:
+            for (componentsCount, rePattern, reportClass) in listOfPatterns:
+                if ((len(splitPath) >= componentsCount) and
+                    (not rePattern.match("/".join(splitPath[len(splitPath) - componentsCount:])) == None)):
+                    return reportClass
+        return None
 
     def __findReport(self, listOfFilenames, includeUserReports=True) :
         """
@@ -211,32 +274,44 @@ class ReportsLoader(ModulesLoader) :
         be searched. Default is True
         @type includeUserReports: Boolean
         """
+        for filename in listOfFilenames:
+            reportClass = self.__matchDetectionFile(filename, includeUserReports)
+            if (not reportClass == None):
+                return reportClass()
+        return None
+
+    def __findReportInDir(self, pathToDir, includeUserReports=True):
+        """
+        Returns the report for the extracted report in the directory.
+        The directory is walked until a type detection file is found.
+        None is returned if no report type is found.
 
-        if (len(listOfFilenames) > 0) :
-            regex = self.__findRegexCore
-            reportClasses = self.__coreClasses
-            if (includeUserReports):
-                regex = "%s|%s" %(self.__findRegexCore, self.__findRegexUser)
-                reportClasses += self.__userClasses
-            detectionFileMap = {}
-            for reportClass in reportClasses:
-                detectionFileMap[reportClass.REPORT_NAME.replace(" ", "_")] = reportClass
-            #message = "The regular expression used for searching for report types:\n\t  %s." %(regex)
-            #logging.getLogger(sx.MAIN_LOGGER_NAME).debug(message)
-            rem = re.compile(regex)
-            for line in listOfFilenames:
-                mo = rem.match(line)
-                if mo:
-                    if (detectionFileMap.has_key(mo.lastgroup)):
-                        reportClass = detectionFileMap.get(mo.lastgroup)
-                        report = reportClass()
-                        return report
+        @return: Returns the report for the extracted report in the
+        directory.
+        @rtype: Report
+
+        @param pathToDir: The path to the directory.
+        @type pathToDir: String
+        @param includeUserReports: If enable the user modules(reports) will
+        be searched. Default is True
+        @type includeUserReports: Boolean
+        """
+        for root, dirs, files in os.walk(pathToDir):
+            # The paths are matched relative to the directory so that the
+            # directories above it are never matched.
+            pathToRoot = os.path.relpath(root, pathToDir)
+            for currentFilename in files:
+                reportClass = self.__matchDetectionFile(os.path.join(pathToRoot, currentFilename), includeUserReports)
+                if (not reportClass == None):
+                    return reportClass()
         return None
 
     def getReportByName(self, reportName, includeUserReports=True):
         reportClasses = self.__coreClasses
         if (includeUserReports):
-            reportClasses += self.__userClasses
+            # A new list is created so the list of core classes is not
+            # changed.
+            reportClasses = self.__coreClasses + self.__userClasses
         for reportClass in reportClasses:
             if (reportClass.REPORT_NAME == reportName):
                 report = reportClass()
@@ -249,23 +324,20 @@ class ReportsLoader(ModulesLoader) :
         signature of an extracted report. If file then it will see if
         extracted file contains a known report type.
         """
-        # List of files that will be searched to see if they contain
-        # report signatures.
         message = "Searching for a known report type from the path: %s." %(pathToFilename)
         logging.getLogger(sx.MAIN_LOGGER_NAME).debug(message)
-        listOfFilenames = []
+        report = None
         if (os.path.isfile(pathToFilename)):
-            # If file then i need to extract with extractor to get list of files.
+            # If file then the members of the file are read until a type
+            # detection file is found.
             extractor = self.__extractorsLoader.getExtractor(pathToFilename, includeUserReports)
             if (not extractor == None):
-                listOfFilenames = extractor.list()
+                detectionFile = extractor.findMemberName(lambda name: (not self.__matchDetectionFile(name, includeUserReports) == None))
+                if (not detectionFile == None):
+                    report = self.__matchDetectionFile(detectionFile, includeUserReports)()
         elif (os.path.isdir(pathToFilename)):
             # If dir i dont need to extract anything just search the dir
-            listOfFilenames = []
-            for root, dirs, files in os.walk(pathToFilename):
-                for currentFilename in files:
-                    listOfFilenames.append(os.path.join(root, currentFilename))
-        report = self.__findReport(listOfFilenames, includeUserReports)
+            report = self.__findReportInDir(pathToFilename, includeUserReports)
         if (report == None) :
             message = "The report type could not be determined for the filepath: %s." %(pathToFilename)
             logging.getLogger(sx.MAIN_LOGGER_NAME).debug(message)
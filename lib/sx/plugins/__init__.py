@@ -8,10 +8,13 @@ inherited by all the plugins.
 @version   :  2.17
 @copyright :  GPLv2
 """
+import sys
 import time
 import os
 import os.path
 import logging
+import threading
+import Queue
 
 import sx
 from sx.logwriter import LogWriter
@@ -113,10 +116,43 @@ class PluginsHelper:
         # Return the list of enabled plugins.
         return enabledPlugins
 
-    def generatePluginReports(self, listOfReports, listOfEnabledPlugins):
-        # Setup: gather files needed from each report
+    def getPathGlobs(self, listOfEnabledPlugins):
+        """
+        Returns a list of the path globs for all the files that the
+        enabled plugins read. None is returned if there are no enabled
+        plugins or any enabled plugin needs all the files in a report.
+
+        @return: Returns a list of the path globs for all the files that
+        the enabled plugins read.
+        @rtype: Array
+
+        @param listOfEnabledPlugins: The list of enabled plugins.
+        @type listOfEnabledPlugins: Array
+        """
+        if (not len(listOfEnabledPlugins) > 0):
+            return None
+        listOfPathGlobs = []
         for plugin in listOfEnabledPlugins:
-            if ((plugin.isReportsRequired()) and (len(listOfReports) > 0)):
+            listOfPluginPathGlobs = plugin.getPathGlobs()
+            if (listOfPluginPathGlobs == None):
+                message = "The plugin %s requires all the files in the reports to be extracted." %(plugin.getName())
+                logging.getLogger(sx.MAIN_LOGGER_NAME).debug(message)
+                return None
+            for pathGlob in listOfPluginPathGlobs:
+                if (not pathGlob in listOfPathGlobs):
+                    listOfPathGlobs.append(pathGlob)
+        return listOfPathGlobs
+
+    def generatePluginReports(self, listOfReports, listOfEnabledPlugins, pluginsPipeline=None):
+        # Setup: gather files needed from each report. The plugins in the
+        # pipeline were given each report as soon as it was extracted, so
+        # the pipeline is closed and only the other plugins are setup.
+        listOfPipelinedPlugins = []
+        if (not pluginsPipeline == None):
+            listOfPipelinedPlugins = pluginsPipeline.close()
+        for plugin in listOfEnabledPlugins:
+            if ((plugin.isReportsRequired()) and (len(listOfReports) > 0) and
+                (not plugin in listOfPipelinedPlugins)):
                 plugin.setup(listOfReports)
 
         # Execute: run some intense operation that could be used in report/action
@@ -135,6 +171,168 @@ class PluginsHelper:
             if ((plugin.isReportsRequired()) and (len(listOfReports) > 0)):
                 plugin.action()
 
+class PluginsPipeline:
+    """
+    This class runs the setup of the plugins on each report as soon as
+    the report is extracted instead of after all the reports are
+    extracted. The reports are given to a thread through a bounded queue
+    so that the files of a report are read while the next reports are
+    extracted. If the queue is full then the extraction waits on the
+    setup.
+
+    Only the plugins that support setup of one report at a time are in
+    the pipeline. The other plugins are setup with the list of all the
+    reports after the pipeline is closed.
+
+    @cvar QUEUE_SIZE: The number of extracted reports that can be waiting
+    on the setup.
+    @type QUEUE_SIZE: Int
+    """
+    QUEUE_SIZE = 2
+
+    def __init__(self, listOfEnabledPlugins):
+        """
+        @param listOfEnabledPlugins: The list of enabled plugins.
+        @type listOfEnabledPlugins: Array
+        """
+        self.__listOfPlugins = filter(lambda plugin: ((plugin.isReportsRequired()) and
+                                                      (plugin.isReportSetupSupported())), listOfEnabledPlugins)
+        self.__queue = Queue.Queue(PluginsPipeline.QUEUE_SIZE)
+        self.__thread = None
+        # The exception info of the first error in the setup which is
+        # raised when the pipeline is closed.
+        self.__excInfo = None
+        self.__reportCount = 0
+        # The number of reports that were added that the setup is not done
+        # on.
+        self.__pendingCount = 0
+        self.__condition = threading.Condition()
+
+    def getPlugins(self):
+        """
+        Returns the list of plugins that are in the pipeline.
+
+        @return: Returns the list of plugins that are in the pipeline.
+        @rtype: Array
+        """
+        return self.__listOfPlugins
+
+    def start(self):
+        """
+        Starts the thread that runs the setup of the plugins on each
+        report that is added.
+        """
+        if ((not self.__thread == None) or (not len(self.__listOfPlugins) > 0)):
+            return
+        for plugin in self.__listOfPlugins:
+            message = "Running setup for plugin as the reports are extracted: %s" %(plugin.getName())
+            logging.getLogger(sx.MAIN_LOGGER_NAME).status(message)
+        self.__thread = threading.Thread(target=self.__run)
+        self.__thread.setDaemon(True)
+        self.__thread.start()
+
+    def add(self, report):
+        """
+        Adds a report that was extracted to the queue for the setup of
+        the plugins. Waits if the queue is full.
+
+        @param report: The report that was extracted.
+        @type report: Report
+        """
+        if (self.__thread == None):
+            return
+        self.__condition.acquire()
+        try:
+            self.__pendingCount += 1
+        finally:
+            self.__condition.release()
+        self.__put(report)
+
+    def __put(self, report):
+        """
+        Puts the report on the queue. Waits if the queue is full.
+
+        @param report: The report that was extracted or None if the
+        pipeline is closed.
+        @type report: Report
+        """
+        # A timeout is required so that control-c is not ignored while
+        # waiting on the queue.
+        while (True):
+            try:
+                self.__queue.put(report, True, 1)
+                break
+            except Queue.Full:
+                continue
+
+    def wait(self):
+        """
+        Waits until the setup of the plugins is done on all the reports
+        that were added.
+        """
+        self.__condition.acquire()
+        try:
+            # A timeout is required so that control-c is not ignored while
+            # waiting on the setup.
+            while (self.__pendingCount > 0):
+                self.__condition.wait(1)
+        finally:
+            self.__condition.release()
+
+    def __run(self):
+        """
+        Runs the setup of the plugins on each report in the queue until
+        the pipeline is closed. This function is ran by the thread of the
+        pipeline.
+        """
+        while (True):
+            report = self.__queue.get()
+            if (report == None):
+                break
+            # After an error the reports are taken off the queue so that
+            # the extraction does not wait on the queue.
+            if (self.__excInfo == None):
+                try:
+                    for plugin in self.__listOfPlugins:
+                        if (plugin.isValidReportType(report)):
+                            plugin.setupReport(report)
+                    self.__reportCount += 1
+                except:
+                    self.__excInfo = sys.exc_info()
+            self.__condition.acquire()
+            try:
+                self.__pendingCount -= 1
+                self.__condition.notifyAll()
+            finally:
+                self.__condition.release()
+
+    def close(self):
+        """
+        Waits on the setup of the plugins on all the reports that were
+        added and returns the list of plugins that are in the pipeline.
+        This is the barrier that execute(), report() and action() of the
+        plugins wait on. An error in the setup of a plugin is raised.
+
+        @return: Returns the list of plugins that are in the pipeline.
+        @rtype: Array
+        """
+        if (self.__thread == None):
+            return self.__listOfPlugins
+        self.__put(None)
+        # A timeout is required so that control-c is not ignored while
+        # waiting on the thread.
+        while (self.__thread.isAlive()):
+            self.__thread.join(1)
+        self.__thread = None
+        message = "The setup of %d plugins was ran on %d reports as they were extracted." %(len(self.__listOfPlugins),
+                                                                                            self.__reportCount)
+        logging.getLogger(sx.MAIN_LOGGER_NAME).debug(message)
+        if (not self.__excInfo == None):
+            (excType, excValue, excTraceback) = self.__excInfo
+            self.__excInfo = None
+            raise excType, excValue, excTraceback
+        return self.__listOfPlugins
+
 class PluginBase:
     """
     This is the base class for all plugins.
@@ -369,6 +567,24 @@ class PluginBase:
         """
         self.__enabled = enabled
 
+    def getPathGlobs(self):
+        """
+        Returns a list of path globs for the files that the plugin reads
+        from the reports. The paths are relative to the root directory
+        of the report. When every enabled plugin returns a list then
+        only those files will be extracted from the reports. Any other
+        file is extracted when it is read.
+
+        By default None is returned which means that the plugin needs all
+        the files in the reports. Plugins should override this function
+        if they only read some of the files.
+
+        @return: Returns a list of path globs for the files that the
+        plugin reads from the reports.
+        @rtype: Array
+        """
+        return None
+
     def isValidReportType(self, report) :
         """
         Returns True if the plugin supports the type of report.
@@ -598,6 +814,32 @@ class PluginBase:
         """
         pass
 
+    def isReportSetupSupported(self):
+        """
+        Returns True if the child overrides setupReport() so that the
+        setup can be ran on each report as soon as it is extracted. By
+        default False is returned and setup() is called with the list of
+        all the reports.
+
+        @return: Returns True if the setup can be ran on one report at a
+        time.
+        @rtype: Boolean
+        """
+        return False
+
+    def setupReport(self, report):
+        """
+        This function should be overridden by the child if
+        isReportSetupSupported() returns True. It does the same thing as
+        setup() for one report and is only called with reports that are
+        a valid report type for the plugin. It can be called while other
+        reports are still being extracted.
+
+        @param report: The Report Object.
+        @type report: Report
+        """
+        pass
+
     def execute(self) :
         """
         This function should be overriden by the child if any
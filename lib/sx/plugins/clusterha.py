@@ -66,6 +66,15 @@ class Clusterha(sx.plugins.PluginBase):
     # #######################################################################
     # Functions that should be overwritten in the plugin
     # #######################################################################
+    def getPathGlobs(self):
+        return ["etc/cluster/*", "etc/hosts", "etc/modprobe.conf", "etc/sysconfig/network-scripts/*",
+                "etc/sysconfig/cluster", "etc/fstab", "etc/exports", "etc/samba/smb.conf",
+                "etc/lvm/lvm.conf", "etc/multipath.conf", "proc/net/*", "proc/filesystems",
+                "proc/devices", "proc/partitions", "proc/scsi/scsi", "sos_commands/cluster/*",
+                "sos_commands/networking/*", "sos_commands/startup/*", "sos_commands/filesys/*",
+                "sos_commands/devicemapper/*", "sos_commands/kernel/*", "chkconfig", "mount",
+                "uname", "dmidecode"]
+
     def setup(self, reports) :
         """
         This function will setup data structure to hold any data/path
@@ -53,8 +53,28 @@ class Gluster(sx.plugins.PluginBase):
         message = "Running setup for plugin: %s" %(self.getName())
         logging.getLogger(sx.MAIN_LOGGER_NAME).log(LogWriter.STATUS_LEVEL, message)
         for report in reports:
-            if (self.isValidReportType(report)) :
-                self.__glusterPeerNodes.add(report)
+            if (self.isValidReportType(report)):
+                self.setupReport(report)
+
+    def isReportSetupSupported(self):
+        """
+        Returns True since the setup is ran on one report at a time.
+
+        @return: Returns True since the setup is ran on one report at a
+        time.
+        @rtype: Boolean
+        """
+        return True
+
+    def setupReport(self, report):
+        """
+        This function will gather the data/path to files that are
+        needed to use in this plugin from the report.
+
+        @param report: The Report Object.
+        @type report: Report
+        """
+        self.__glusterPeerNodes.add(report)
 
     def report(self) :
         """
@@ -20,6 +20,7 @@ import sx
 from sx.tools import FileUtil
 from sx.tools import StringUtil
 from sx.plugins.lib.storage.filesysparser import FilesysMount
+from sx.extractors.lib.contentstore import ContentStore
 
 # Elemtree throws different exception in python 2.6(pyexpat.error)
 # versus what is thrown in python2.7(ParseError).
@@ -751,6 +752,10 @@ class ClusterHAConfAnalyzer :
     def isClusterConfFilesIdentical(self, listOfFiles) :
         if (not len(listOfFiles) > 1):
             return False
+        elif (ContentStore.isSameContent(listOfFiles)):
+            # The files were added to the content store during extraction
+            # and have the same digest so they do not need to be read.
+            return True
         return  FileUtil.isFilesIdentical(listOfFiles)
 
     def isQDiskEnabledWithHeurtistics(self):
@@ -21,15 +21,12 @@ from sx.plugins.lib.clusterha.clusternode import ClusterNodeNetworkMap
 from sx.plugins.lib.clusterha.clusternode import ClusterStorageFilesystem
 from sx.plugins.lib.clusterha.clustercommandsparser import ClusterCommandsParser
 
-from sx.plugins.lib.networking.networkdeviceparser import NetworkDeviceParser
 from sx.plugins.lib.networking.networkdeviceparser import NetworkMap
 from sx.plugins.lib.networking.networkdeviceparser import NetworkMaps
-from sx.plugins.lib.general.distroreleaseparser import DistroReleaseParser
 from sx.plugins.lib.general.distroreleaseparser import DistroRelease
 from sx.plugins.lib.general.runlevelserviceparser import RunLevelParser
 from sx.plugins.lib.general.runlevelserviceparser import ChkConfigServiceStatus
 from sx.plugins.lib.general.dmidecodeparser import DmiDecodeParser
-from sx.plugins.lib.kernel.modulesparser import ModulesParser
 from sx.plugins.lib.kernel import KernelParser
 
 from sx.plugins.lib.storage.filesysparser import FilesysParser
@@ -38,7 +35,6 @@ from sx.plugins.lib.storage.procparser import ProcParser
 from sx.plugins.lib.storage.procparser import ProcFilesystems
 
 from sx.plugins.lib.storage import StorageData
-from sx.plugins.lib.storage import StorageDataGenerator
 
 class ClusterNodes:
     def __init__(self) :
@@ -378,7 +374,7 @@ class ClusterNodes:
             return False
         # cca will verify that cluster.conf is valid xml
         cca = ClusterHAConfAnalyzer(pathToClusterConfFile)
-        distroRelease = DistroReleaseParser.parseEtcRedHatReleaseRedhatReleaseData(report.getDataFromFile("etc/redhat-release"))
+        distroRelease = report.getArtifact("distro_release")
         # ###############################################################
         # If distro release is not supported or cluster.conf
         # does not validate to be true then the node will not
@@ -404,43 +400,8 @@ class ClusterNodes:
         # name can be found then add the node to the list of cluster nodes.
         # ###############################################################
         clusterCommandsMap = report.getDataFromDir("sos_commands/cluster")
-        # Create the network maps
-        ifconfigData = report.getDataFromFile("sos_commands/networking/ifconfig_-a")
-        if (ifconfigData == None):
-            ifconfigData = report.getDataFromFile("ifconfig")
-        networkInterfaces = NetworkDeviceParser.parseIfconfigData(ifconfigData)
-
-        # ###############################################################
-        # Get more network interfaces might need to add this at some point for
-        # cases where ifconfig fails. Not sure how to combine the data yet
-        # ###############################################################
-        if (not len(networkInterfaces) > 0):
-            ip_addressData = report.getDataFromFile("sos_commands/networking/ip_address")
-            networkInterfaces = NetworkDeviceParser.parseIPAddressData(ip_addressData)
-        # ###############################################################
-
-        etcHostsMap = NetworkDeviceParser.parseEtcHostsData(report.getDataFromFile("etc/hosts"))
-        modprobeConfCommands = ModulesParser.parseEtcModprobeConf(report.getDataFromFile("etc/modprobe.conf"))
-        # Appears this is not collect on rhel6, so collecting all the
-        # files will not work. Need to ask sosreport why that is?
-        # modprobeConfdList = report.getDataFromDir("etc/modprobe.conf.d")
-
-        # Read in all the /etc/sysconfig/network-scripts/ifcfg* files
-        # that have known interface.
-        networkScriptsDataMap = {}
-        for networkInterface in networkInterfaces:
-            networkScriptData = report.getDataFromFile("etc/sysconfig/network-scripts/ifcfg-%s" %(networkInterface.getInterface()))
-            if (networkScriptData == None):
-                networkScriptData = None
-            networkScriptsDataMap[networkInterface.getInterface()] = networkScriptData
-        # Get all the data from proc/net including the bonding data.
-        procNetMap = report.getDataFromDir("proc/net")
-        bondingMap = report.getDataFromDir("proc/net/bonding")
-        procNetMap = dict(procNetMap.items() + bondingMap.items())
-        # Get all the data in the sos_commands/networking directory.
-        networkingCommandsMap = report.getDataFromDir("sos_commands/networking")
         # Build networkmaps from all the network related information.
-        networkMaps = NetworkMaps(networkInterfaces, etcHostsMap, networkScriptsDataMap, modprobeConfCommands, procNetMap, networkingCommandsMap)
+        networkMaps = report.getArtifact("network_maps")
         # ###############################################################
         #clusternodeName = ""
         #etcSysConfigCluster = report.getDataFromFile("etc/sysconfig/cluster")
@@ -525,7 +486,7 @@ class ClusterNodes:
         # ###############################################################
         self.__clusterNodes.append(clusterNode)
         self.__clusterNodes.sort(key=lambda c: int(c.getClusterNodeProperties().getNodeID()))
-        storageData = StorageDataGenerator().generate(report)
+        storageData = report.getArtifact("storage_data")
         if (not storageData == None):
             self.__clusternodesStorageDataMap[clusterNode.getClusterNodeName()] = storageData
 
@@ -11,6 +11,8 @@ etc/redhat-release
 """
 import re
 
+from sx.reports import Report
+
 class DistroReleaseParser:
     def parseEtcRedHatReleaseRedhatReleaseData(etcRedHatReleaseData) :
         """
@@ -59,6 +61,22 @@ class DistroReleaseParser:
             return None
     parseEtcRedHatReleaseRedhatReleaseData = staticmethod(parseEtcRedHatReleaseRedhatReleaseData)
 
+    def generate(report):
+        """
+        Returns the release version from the release file of the
+        report. This function creates the "distro_release" artifact of
+        a report.
+
+        @return: Returns a DistroRelease object that contains information
+        about the Distrobution Release.
+        @rtype: DistroRelease
+
+        @param report: The report.
+        @type report: Report
+        """
+        return DistroReleaseParser.parseEtcRedHatReleaseRedhatReleaseData(report.getDataFromFile("etc/redhat-release"))
+    generate = staticmethod(generate)
+
     def findReleaseFromRPM(installedRPMSData):
         """
         This function will get the release information based on the
@@ -142,3 +160,5 @@ class DistroRelease:
         @rtype: String
         """
         return self.__distroMinorVersion
+
+Report.registerArtifact("distro_release", DistroReleaseParser.generate)
@@ -12,14 +12,10 @@ import sx
 from sx.logwriter import LogWriter
 from sx.tools import ConfigurationFileParser
 from sx.plugins.lib.gluster.glusterpeernode import GlusterPeerNode
-from sx.plugins.lib.networking.networkdeviceparser import NetworkDeviceParser
 from sx.plugins.lib.networking.networkdeviceparser import NetworkMap
-from sx.plugins.lib.networking.networkdeviceparser import NetworkMaps
-from sx.plugins.lib.general.distroreleaseparser import DistroReleaseParser
 from sx.plugins.lib.general.distroreleaseparser import DistroRelease
 from sx.plugins.lib.general.runlevelserviceparser import RunLevelParser
 from sx.plugins.lib.general.runlevelserviceparser import ChkConfigServiceStatus
-from sx.plugins.lib.kernel.modulesparser import ModulesParser
 
 from sx.plugins.lib.storage.filesysparser import FilesysParser
 from sx.plugins.lib.storage.filesysparser import FilesysMount
@@ -36,7 +32,7 @@ class GlusterPeerNodes:
         return self.__glusterPeerNodes
 
     def add(self, report) :
-        distroRelease = DistroReleaseParser.parseEtcRedHatReleaseRedhatReleaseData(report.getDataFromFile("etc/redhat-release"))
+        distroRelease = report.getArtifact("distro_release")
         # ###############################################################
         # If distro release is not supported or cluster.conf
         # does not validate to be true then the node will not
@@ -51,34 +47,8 @@ class GlusterPeerNodes:
             message = "This distribution release is not supported: %s." %(distroRelease)
             logging.getLogger(sx.MAIN_LOGGER_NAME).error(message)
             return False
-        # Create the network maps
-        ifconfigData = report.getDataFromFile("sos_commands/networking/ifconfig_-a")
-        if (ifconfigData == None):
-            ifconfigData = report.getDataFromFile("ifconfig")
-        networkInterfaces = NetworkDeviceParser.parseIfconfigData(ifconfigData)
-
-        etcHostsMap = NetworkDeviceParser.parseEtcHostsData(report.getDataFromFile("etc/hosts"))
-        modprobeConfCommands = ModulesParser.parseEtcModprobeConf(report.getDataFromFile("etc/modprobe.conf"))
-        # Appears this is not collect on rhel6, so collecting all the
-        # files will not work. Need to ask sosreport why that is?
-        # modprobeConfdList = report.getDataFromDir("etc/modprobe.conf.d")
-
-        # Read in all the /etc/sysconfig/network-scripts/ifcfg* files
-        # that have known interface.
-        networkScriptsDataMap = {}
-        for networkInterface in networkInterfaces:
-            networkScriptData = report.getDataFromFile("etc/sysconfig/network-scripts/ifcfg-%s" %(networkInterface.getInterface()))
-            if (networkScriptData == None):
-                networkScriptData = None
-            networkScriptsDataMap[networkInterface.getInterface()] = networkScriptData
-        # Get all the data from proc/net including the bonding data.
-        procNetMap = report.getDataFromDir("proc/net")
-        bondingMap = report.getDataFromDir("proc/net/bonding")
-        procNetMap = dict(procNetMap.items() + bondingMap.items())
-        # Get all the data in the sos_commands/networking directory.
-        networkingCommandsMap = report.getDataFromDir("sos_commands/networking")
         # Build networkmaps from all the network related information.
-        networkMaps = NetworkMaps(networkInterfaces, etcHostsMap, networkScriptsDataMap, modprobeConfCommands, procNetMap, networkingCommandsMap)
+        networkMaps = report.getArtifact("network_maps")
 
         # ###############################################################
         # Check the services
@@ -5,4 +5,60 @@
 @version   :  2.17
 @copyright :  GPLv2
 """
+import sx
+from sx.reports import Report
+from sx.plugins.lib.networking.networkdeviceparser import NetworkDeviceParser
+from sx.plugins.lib.networking.networkdeviceparser import NetworkMaps
+from sx.plugins.lib.kernel.modulesparser import ModulesParser
 
+class NetworkMapsGenerator:
+    """
+    This class creates the NetworkMaps of a report which is the
+    "network_maps" artifact of a report.
+
+    @cvar VERSION: The version of the generator which is changed when
+    the NetworkMaps that are created change.
+    @type VERSION: Int
+    """
+    VERSION = 1
+
+    def generate(self, report):
+        """
+        Returns the NetworkMaps that are built from all the network
+        related files in the report.
+
+        @return: Returns the NetworkMaps for the report.
+        @rtype: NetworkMaps
+
+        @param report: The report.
+        @type report: Report
+        """
+        ifconfigData = report.getDataFromFile("sos_commands/networking/ifconfig_-a")
+        if (ifconfigData == None):
+            ifconfigData = report.getDataFromFile("ifconfig")
+        networkInterfaces = NetworkDeviceParser.parseIfconfigData(ifconfigData)
+        # The interfaces are read from the "ip address" data if ifconfig
+        # was not collected or failed.
+        if (not len(networkInterfaces) > 0):
+            networkInterfaces = NetworkDeviceParser.parseIPAddressData(report.getDataFromFile("sos_commands/networking/ip_address"))
+        etcHostsMap = NetworkDeviceParser.parseEtcHostsData(report.getDataFromFile("etc/hosts"))
+        # Appears this is not collect on rhel6, so collecting all the
+        # files will not work.
+        # modprobeConfdList = report.getDataFromDir("etc/modprobe.conf.d")
+        modprobeConfCommands = ModulesParser.parseEtcModprobeConf(report.getDataFromFile("etc/modprobe.conf"))
+
+        # Read in all the /etc/sysconfig/network-scripts/ifcfg* files
+        # that have known interface.
+        networkScriptsDataMap = {}
+        for networkInterface in networkInterfaces:
+            networkScriptsDataMap[networkInterface.getInterface()] = report.getDataFromFile("etc/sysconfig/network-scripts/ifcfg-%s" %(networkInterface.getInterface()))
+        # Get all the data from proc/net including the bonding data.
+        procNetMap = report.getDataFromDir("proc/net")
+        bondingMap = report.getDataFromDir("proc/net/bonding")
+        procNetMap = dict(procNetMap.items() + bondingMap.items())
+        # Get all the data in the sos_commands/networking directory.
+        networkingCommandsMap = report.getDataFromDir("sos_commands/networking")
+        # Build networkmaps from all the network related information.
+        return NetworkMaps(networkInterfaces, etcHostsMap, networkScriptsDataMap, modprobeConfCommands, procNetMap, networkingCommandsMap)
+
+Report.registerArtifact("network_maps", NetworkMapsGenerator().generate, NetworkMapsGenerator.VERSION)
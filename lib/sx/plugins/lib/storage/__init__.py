@@ -8,7 +8,7 @@
 import logging
 
 import sx
-from sx.plugins.lib.general.distroreleaseparser import DistroReleaseParser
+from sx.reports import Report
 from sx.plugins.lib.general.distroreleaseparser import DistroRelease
 from sx.plugins.lib.storage.blockdevicetree import BlockDeviceTree
 from sx.plugins.lib.storage.procparser import ProcParser
@@ -183,6 +183,16 @@ class StorageData:
         return summary
 
 class StorageDataGenerator:
+    """
+    This class creates the StorageData of a report which is the
+    "storage_data" artifact of a report.
+
+    @cvar VERSION: The version of the generator which is changed when
+    the StorageData that is created changes.
+    @type VERSION: Int
+    """
+    VERSION = 1
+
     def __init__(self):
         # The max size of the /var/log/messages file that can be
         # parsed in megabytes. If the file is to large then it will
@@ -199,7 +209,7 @@ class StorageDataGenerator:
         @type reports: Array
         """
         storageData = None
-        distroRelease = DistroReleaseParser.parseEtcRedHatReleaseRedhatReleaseData(report.getDataFromFile("etc/redhat-release"))
+        distroRelease = report.getArtifact("distro_release")
         procFilesystemsList = ProcParser.parseProcFilesystemsData(report.getDataFromFile("proc/filesystems"))
         fsTypes = []
         for procFilesystem in procFilesystemsList:
@@ -232,3 +242,5 @@ class StorageDataGenerator:
                                   blockDeviceTree)
 
         return storageData
+
+Report.registerArtifact("storage_data", StorageDataGenerator().generate, StorageDataGenerator.VERSION)
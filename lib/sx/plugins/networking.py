@@ -19,12 +19,8 @@ from sx.reports.sosreport import Sosreport
 from sx.reports.sysreport import Sysreport
 from sx.tools import StringUtil
 
-from sx.plugins.lib.general.distroreleaseparser import DistroReleaseParser
 from sx.plugins.lib.general.distroreleaseparser import DistroRelease
-from sx.plugins.lib.networking.networkdeviceparser import NetworkDeviceParser
 from sx.plugins.lib.networking.networkdeviceparser import NetworkMap
-from sx.plugins.lib.networking.networkdeviceparser import NetworkMaps
-from sx.plugins.lib.kernel.modulesparser import ModulesParser
 
 from sx.analysisreport import AnalysisReport
 from sx.analysisreport import ARSection
@@ -134,6 +130,10 @@ class Networking(sx.plugins.PluginBase):
     # ###########################################################################
     # Overwriting function of parent
     # ###########################################################################
+    def getPathGlobs(self):
+        return ["etc/redhat-release", "etc/hosts", "etc/modprobe.conf", "etc/sysconfig/network-scripts/*",
+                "proc/net/*", "sos_commands/networking/*", "ifconfig"]
+
     def setup(self, reports) :
         """
         This function will setup data structure to hold any data/path
@@ -145,45 +145,40 @@ class Networking(sx.plugins.PluginBase):
         message = "Running setup for plugin: %s" %(self.getName())
         logging.getLogger(sx.MAIN_LOGGER_NAME).status(message)
         for report in reports:
-            message = "Getting the files for the report for report with  hostname of: %s." %(report.getHostname())
-            logging.getLogger(sx.MAIN_LOGGER_NAME).debug(message)
+            if (self.isValidReportType(report)):
+                self.setupReport(report)
 
-            if (self.isValidReportType(report)) :
-                distroRelease = DistroReleaseParser.parseEtcRedHatReleaseRedhatReleaseData(report.getDataFromFile("etc/redhat-release"))
-                # Create the network maps
-
-                ifconfigData = report.getDataFromFile("sos_commands/networking/ifconfig_-a")
-                if (ifconfigData == None):
-                    ifconfigData = report.getDataFromFile("ifconfig")
-                networkInterfaces = NetworkDeviceParser.parseIfconfigData(ifconfigData)
-                etcHostsMap = NetworkDeviceParser.parseEtcHostsData(report.getDataFromFile("etc/hosts"))
-                # Appears this is not collect on rhel6
-                # modprobeConfdList = report.getDataFromDir("etc/modprobe.conf.d")
-                modprobeConfCommands = ModulesParser.parseEtcModprobeConf(report.getDataFromFile("etc/modprobe.conf"))
-
-                # Build networkmaps from all the network related information.
-                networkScriptsDataMap = {}
-                for networkInterface in networkInterfaces:
-                    networkScriptData = report.getDataFromFile("etc/sysconfig/network-scripts/ifcfg-%s" %(networkInterface.getInterface()))
-                    if (networkScriptData == None):
-                        networkScriptData = None
-                    networkScriptsDataMap[networkInterface.getInterface()] = networkScriptData
-
-                # Get all the data from proc/net including the bonding data.
-                procNetMap = report.getDataFromDir("proc/net")
-                bondingMap = report.getDataFromDir("proc/net/bonding")
-                procNetMap = dict(procNetMap.items() + bondingMap.items())
-
-                # Get all the data in the sos_commands/networking directory.
-                networkingCommandsMap = report.getDataFromDir("sos_commands/networking")
-                networkMaps = NetworkMaps(networkInterfaces, etcHostsMap, networkScriptsDataMap, modprobeConfCommands, procNetMap, networkingCommandsMap)
-                networkingData = NetworkingData(report.getHostname(),
-                                                report.getUptime(),
-                                                distroRelease,
-                                                report.getUname(),
-                                                networkMaps)
-                # Add network data for this report to the list
-                self.__listOfNetworkingData.append(networkingData)
+    def isReportSetupSupported(self):
+        """
+        Returns True since the setup is ran on one report at a time.
+
+        @return: Returns True since the setup is ran on one report at a
+        time.
+        @rtype: Boolean
+        """
+        return True
+
+    def setupReport(self, report):
+        """
+        This function will gather the data/path to files that are
+        needed to use in this plugin from the report.
+
+        @param report: The Report Object.
+        @type report: Report
+        """
+        message = "Getting the files for the report for report with  hostname of: %s." %(report.getHostname())
+        logging.getLogger(sx.MAIN_LOGGER_NAME).debug(message)
+        # The network maps are shared with the other plugins that use
+        # them.
+        distroRelease = report.getArtifact("distro_release")
+        networkMaps = report.getArtifact("network_maps")
+        networkingData = NetworkingData(report.getHostname(),
+                                        report.getUptime(),
+                                        distroRelease,
+                                        report.getUname(),
+                                        networkMaps)
+        # Add network data for this report to the list
+        self.__listOfNetworkingData.append(networkingData)
 
     def report(self) :
         """
@@ -59,11 +59,31 @@ class Opensosreport(sx.plugins.PluginBase):
         message = "Running setup for plugin: %s" %(self.getName())
         logging.getLogger(sx.MAIN_LOGGER_NAME).status(message)
         for report in reports:
-            if (self.isValidReportType(report)) :
-                pathToHTMLReportFile = os.path.join(report.getPathToExtractedReport(), "sos_reports/sosreport.html")
-                if (os.path.exists(pathToHTMLReportFile)) :
-                    (head, tail) = os.path.split(report.getPathToExtractedReport())
-                    self.__pathToHTMLReportMap[tail] = pathToHTMLReportFile
+            if (self.isValidReportType(report)):
+                self.setupReport(report)
+
+    def isReportSetupSupported(self):
+        """
+        Returns True since the setup is ran on one report at a time.
+
+        @return: Returns True since the setup is ran on one report at a
+        time.
+        @rtype: Boolean
+        """
+        return True
+
+    def setupReport(self, report):
+        """
+        This function will gather the data/path to files that are
+        needed to use in this plugin from the report.
+
+        @param report: The Report Object.
+        @type report: Report
+        """
+        pathToHTMLReportFile = os.path.join(report.getPathToExtractedReport(), "sos_reports/sosreport.html")
+        if (os.path.exists(pathToHTMLReportFile)) :
+            (head, tail) = os.path.split(report.getPathToExtractedReport())
+            self.__pathToHTMLReportMap[tail] = pathToHTMLReportFile
 
     def action(self) :
         """
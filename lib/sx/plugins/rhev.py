@@ -48,13 +48,33 @@ class Rhev(sx.plugins.PluginBase):
         message = "Running setup for plugin: %s" %(self.getName())
         logging.getLogger(sx.MAIN_LOGGER_NAME).status(message)
         for report in reports:
-            if ((self.isValidReportType(report))  and
-                ((report.getName().lower() == "sosreport") or (report.getName().lower() == "sysreport"))):
-                psData = report.getDataFromFile("ps")
-                if (psData == None):
-                    psData = report.getDataFromFile("sos_commands/process/ps_alxwww")
-                if (not psData == None):
-                    self.__psDataMap[report.getHostname()] = psData
+            if (self.isValidReportType(report)):
+                self.setupReport(report)
+
+    def isReportSetupSupported(self):
+        """
+        Returns True since the setup is ran on one report at a time.
+
+        @return: Returns True since the setup is ran on one report at a
+        time.
+        @rtype: Boolean
+        """
+        return True
+
+    def setupReport(self, report):
+        """
+        This function will gather the data/path to files that are
+        needed to use in this plugin from the report.
+
+        @param report: The Report Object.
+        @type report: Report
+        """
+        if ((report.getName().lower() == "sosreport") or (report.getName().lower() == "sysreport")):
+            psData = report.getDataFromFile("ps")
+            if (psData == None):
+                psData = report.getDataFromFile("sos_commands/process/ps_alxwww")
+            if (not psData == None):
+                self.__psDataMap[report.getHostname()] = psData
 
     def action(self) :
         """
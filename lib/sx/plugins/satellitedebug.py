@@ -52,13 +52,33 @@ class Satellitedebug(sx.plugins.PluginBase):
         message = "Running setup for plugin: %s" %(self.getName())
         logging.getLogger(sx.MAIN_LOGGER_NAME).status(message)
         for report in reports:
-            if (self.isValidReportType(report)) :
-                timestamp = report.getDataFromFile("timestamp")
-                if (timestamp == None) :
-                    timestamp = [""]
-                rsdr = RHNSatelliteDebugReport(timestamp[0].rstrip())
-                self.__rhnSatDebugReports.append(rsdr)
-                rsdr.setInstalledSatellitePackages(report.getPathForFile("rpm-manifest"))
+            if (self.isValidReportType(report)):
+                self.setupReport(report)
+
+    def isReportSetupSupported(self):
+        """
+        Returns True since the setup is ran on one report at a time.
+
+        @return: Returns True since the setup is ran on one report at a
+        time.
+        @rtype: Boolean
+        """
+        return True
+
+    def setupReport(self, report):
+        """
+        This function will gather the data/path to files that are
+        needed to use in this plugin from the report.
+
+        @param report: The Report Object.
+        @type report: Report
+        """
+        timestamp = report.getDataFromFile("timestamp")
+        if (timestamp == None) :
+            timestamp = [""]
+        rsdr = RHNSatelliteDebugReport(timestamp[0].rstrip())
+        self.__rhnSatDebugReports.append(rsdr)
+        rsdr.setInstalledSatellitePackages(report.getPathForFile("rpm-manifest"))
 
     def report(self) :
         """
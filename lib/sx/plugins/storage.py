@@ -19,7 +19,6 @@ from sx.reports.sosreport import Sosreport
 from sx.reports.sysreport import Sysreport
 from sx.tools import StringUtil
 from sx.plugins.lib.storage import StorageData
-from sx.plugins.lib.storage import StorageDataGenerator
 from sx.plugins.lib.storage.storageevaluator import StorageEvaluator
 
 from sx.analysisreport import AnalysisReport
@@ -64,12 +63,32 @@ class Storage(sx.plugins.PluginBase):
         message = "Running setup for plugin: %s" %(self.getName())
         logging.getLogger(sx.MAIN_LOGGER_NAME).status(message)
         for report in reports:
-            message = "Getting the files for the report for report with  hostname of: %s." %(report.getHostname())
-            logging.getLogger(sx.MAIN_LOGGER_NAME).debug(message)
-            if (self.isValidReportType(report)) :
-                storageData = StorageDataGenerator().generate(report)
-                if (not storageData == None):
-                    self.__listOfStorageData.append(storageData)
+            if (self.isValidReportType(report)):
+                self.setupReport(report)
+
+    def isReportSetupSupported(self):
+        """
+        Returns True since the setup is ran on one report at a time.
+
+        @return: Returns True since the setup is ran on one report at a
+        time.
+        @rtype: Boolean
+        """
+        return True
+
+    def setupReport(self, report):
+        """
+        This function will gather the data/path to files that are
+        needed to use in this plugin from the report.
+
+        @param report: The Report Object.
+        @type report: Report
+        """
+        message = "Getting the files for the report for report with  hostname of: %s." %(report.getHostname())
+        logging.getLogger(sx.MAIN_LOGGER_NAME).debug(message)
+        storageData = report.getArtifact("storage_data")
+        if (not storageData == None):
+            self.__listOfStorageData.append(storageData)
 
     def report(self) :
         """
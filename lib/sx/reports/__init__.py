@@ -12,12 +12,26 @@ import os
 import os.path
 import shutil
 import re
+import errno
+import tempfile
 import logging
+import json
+import zlib
+import fnmatch
+from multiprocessing.pool import ThreadPool
 
 import sx
 from sx.logwriter import LogWriter
 from sx.tools import ConsoleUtil
 from sx.modulesloader import ReportsLoader
+from sx.extractors import Extractor
+from sx.extractors.lib.exclusionpolicy import ExclusionPolicy
+from sx.extractors.lib.seekindex import CompressedFileReader
+from sx.extractors.lib.seekindex import isCompressionSupported
+from sx.extractors.lib.seekindex import readCompressionType
+from sx.reports.lib.contentcache import ContentCache
+from sx.reports.lib.filesearch import FileSearch
+from sx.reports.lib.pathindex import PathIndex
 
 class ReportsHelper:
     def printReportsList(self, includeUserReports=True):
@@ -48,7 +62,31 @@ class Report:
     """
     This class is a container for different kind of reports. This is
     the base class that all report types should inherit.
+
+    @cvar MANIFEST_FILENAME: The name of the manifest file that is
+    written to the root directory of the extracted report. It contains
+    the report type and a summary of the report so that the report can
+    be loaded again without searching the extracted report.
+    @type MANIFEST_FILENAME: String
+    @cvar MANIFEST_VERSION: The version of the format of the manifest
+    file.
+    @type MANIFEST_VERSION: Int
+    @cvar CHUNK_SIZE: The number of bytes that are read at a time when a
+    file is streamed. Files in an archive file that are larger are
+    streamed out of the archive file instead of read into memory.
+    @type CHUNK_SIZE: Int
+    @cvar SEARCH_THREADS: The maximum number of files that are searched
+    at the same time by search().
+    @type SEARCH_THREADS: Int
     """
+    MANIFEST_FILENAME = ".sx_report_manifest.json"
+    MANIFEST_VERSION = 1
+    CHUNK_SIZE = 1048576
+    SEARCH_THREADS = 4
+    # Map of the name of an artifact to a tuple of the function that
+    # creates the artifact from a report and the version of the function.
+    __artifactGeneratorsMap = {}
+
     def __init__(self, name, description, stripDirectoriesDepth=1) :
         """
         @param name: The name of the report.
@@ -67,6 +105,29 @@ class Report:
 
         self.__pathToExtractedReport = ""
         self.__pathToTmpExtractedReport = ""
+        # The extractor that extracted the report. It is used to extract
+        # files that were not extracted because of the include path globs.
+        self.__extractor = None
+        # Map of the paths that were extracted after the report was
+        # extracted to the result of the extraction.
+        self.__extractedPathsMap = {}
+        # Map of the files that were skipped during extraction to a tuple
+        # of the size of the file and the reason it was skipped. None
+        # means the manifest has not been read.
+        self.__skippedFilesMap = None
+        # If True then the files are read from the archive file with the
+        # extractor instead of from the extracted report.
+        self.__isArchiveBacked = False
+        # The report that this report was in and the reports that were in
+        # this report.
+        self.__parentReport = None
+        self.__listOfChildReports = []
+        # Map of a tuple of the name and version of an artifact to the
+        # artifact that was created from this report.
+        self.__artifactsMap = {}
+        # The index of the paths in the extracted report. It is created
+        # the first time a path is looked up.
+        self.__pathIndex = None
 
     def __str__(self) :
         """
@@ -122,9 +183,163 @@ class Report:
         @type pathToExtractedReport: String
         """
         self.__pathToExtractedReport = pathToExtractedReport
+        self.__pathIndex = None
         (head, tail) = os.path.split(self.__pathToExtractedReport)
         self.__pathToTmpExtractedReport = os.path.join(head, ".%s" %(tail))
 
+    def getStripDirectoriesDepth(self):
+        """
+        Returns the number of leading directories that are removed from
+        the path of each file when the report is extracted.
+
+        @return: Returns the number of leading directories that are
+        removed from the path of each file.
+        @rtype: Int
+        """
+        return self.__stripDirectoriesDepth
+
+    def getParentReport(self):
+        """
+        Returns the report that this report was in. None is returned if
+        the report was not in another report.
+
+        @return: Returns the report that this report was in.
+        @rtype: Report
+        """
+        return self.__parentReport
+
+    def setParentReport(self, parentReport):
+        """
+        Sets the report that this report was in and adds this report to
+        the child reports of that report.
+
+        @param parentReport: The report that this report was in.
+        @type parentReport: Report
+        """
+        self.__parentReport = parentReport
+        if ((not parentReport == None) and (not self in parentReport.getChildReports())):
+            parentReport.getChildReports().append(self)
+
+    def getChildReports(self):
+        """
+        Returns the list of reports that were in this report.
+
+        @return: Returns the list of reports that were in this report.
+        @rtype: Array
+        """
+        return self.__listOfChildReports
+
+    def getManifestAttributes(self):
+        """
+        Returns a map of the attributes of the report that are written
+        to the manifest of the report, such as the hostname. Reports
+        should override this function and setManifestAttributes() so
+        that the attributes are not read from the files in the report
+        when the report is loaded again.
+
+        @return: Returns a map of the attributes of the report that are
+        written to the manifest.
+        @rtype: Dictionary
+        """
+        return {}
+
+    def setManifestAttributes(self, attributesMap):
+        """
+        Sets the attributes of the report that were read from the
+        manifest of the report.
+
+        @param attributesMap: A map of the attributes of the report.
+        @type attributesMap: Dictionary
+        """
+        pass
+
+    def getExtractor(self):
+        """
+        Returns the extractor that extracted the report. None is
+        returned if the report was not extracted in this run.
+
+        @return: Returns the extractor that extracted the report.
+        @rtype: Extractor
+        """
+        return self.__extractor
+
+    def isArchiveBacked(self):
+        """
+        Returns True if the files in the report are read from the
+        archive file instead of from an extracted report.
+
+        @return: Returns True if the files in the report are read from
+        the archive file.
+        @rtype: Boolean
+        """
+        return self.__isArchiveBacked
+
+    def getPathGlobs(self):
+        """
+        Returns a list of path globs for the files that the report
+        reads. The paths are relative to the root directory of the
+        report. These files are always extracted when only some of the
+        files in the report are extracted.
+
+        By default None is returned which means that the whole report is
+        always extracted. Reports that want to support extracting only
+        some of the files should override this function.
+
+        @return: Returns a list of path globs for the files that the
+        report reads.
+        @rtype: Array
+        """
+        return None
+
+    def getExcludePathGlobs(self):
+        """
+        Returns a list of path globs for the files that are not
+        extracted from the report by default. The paths are relative to
+        the root directory of the report.
+
+        Reports should override this function if they contain files that
+        are large and not used such as core files.
+
+        @return: Returns a list of path globs for the files that are not
+        extracted from the report by default.
+        @rtype: Array
+        """
+        return []
+
+    def getSkippedFilesMap(self):
+        """
+        Returns a map of the path of each file that was not extracted
+        because of the exclusion policy to a tuple of the size of the
+        file and the reason it was skipped. The map is read from the
+        manifest in the extracted report if the report was not
+        extracted in this run.
+
+        @return: Returns a map of the path of each file that was not
+        extracted to a tuple of the size of the file and the reason it
+        was skipped.
+        @rtype: Dictionary
+        """
+        if (self.__skippedFilesMap == None):
+            self.__skippedFilesMap = ExclusionPolicy.readManifest(self.__pathToExtractedReport)
+        return self.__skippedFilesMap
+
+    def isFileSkipped(self, pathToFile):
+        """
+        Returns True if the file exists in the report but was not
+        extracted because of the exclusion policy. This is used to tell
+        the difference between a file that is missing and a file that
+        was skipped.
+
+        @return: Returns True if the file was not extracted because of
+        the exclusion policy.
+        @rtype: Boolean
+
+        @param pathToFile: The path to the file, which is relative to
+        the root report directory.
+        @type pathToFile: String
+        """
+        return self.getSkippedFilesMap().has_key(pathToFile.strip().strip("/"))
+
     def includesOtherReports(self):
         """
         By default it will return False. If the other report contains
@@ -141,21 +356,389 @@ class Report:
     # ##########################################################################
     # Helper action functions
     # ##########################################################################
-    def clean(self) :
+    def clean(self, trashCan=None) :
         """
         Remove the temporary location of files that were copied from
         extracted report.
+
+        @param trashCan: If not None then the temporary directories are
+        moved to the trash to be removed in the background.
+        @type trashCan: TrashCan
         """
-        if os.path.exists(self.__pathToTmpExtractedReport):
+        ContentCache.removeReport(self.__pathToExtractedReport)
+        self.__artifactsMap = {}
+        self.__pathIndex = None
+        if (self.__isArchiveBacked):
+            self.__extractor.close()
+            # The files that were written so that a path could be returned
+            # are removed.
+            if (not trashCan == None):
+                trashCan.add(self.__pathToExtractedReport)
+            elif (os.path.exists(self.__pathToExtractedReport)):
+                try:
+                    shutil.rmtree(self.__pathToExtractedReport)
+                except OSError:
+                    message = "There was an error removing the directory: %s" %(self.__pathToExtractedReport)
+                    logging.getLogger(sx.MAIN_LOGGER_NAME).error(message)
+        elif (True in self.__extractedPathsMap.values()):
+            # The files that were extracted after the report was extracted
+            # are added to the manifest.
+            self.writeManifest()
+        if ((not trashCan == None) and (os.path.exists(self.__pathToTmpExtractedReport))):
+            trashCan.add(self.__pathToTmpExtractedReport)
+        elif os.path.exists(self.__pathToTmpExtractedReport):
             try:
                 shutil.rmtree(self.__pathToTmpExtractedReport)
             except OSError:
                 message = "There was an error removing the directory: %s" %(self.__pathToTmpExtractedReport)
                 logging.getLogger(sx.MAIN_LOGGER_NAME).error(message)
 
+    def writeManifest(self):
+        """
+        Writes the manifest of the extracted report to the root directory
+        of the extracted report. The manifest contains the report type,
+        the attributes of the report, the number of files, the size of
+        the files and the paths of the files and directories that were
+        extracted. Returns True if the manifest was written.
+
+        @return: Returns True if the manifest was written.
+        @rtype: Boolean
+        """
+        if ((self.__isArchiveBacked) or (not os.path.isdir(self.__pathToExtractedReport))):
+            return False
+        listOfPaths = []
+        fileCount = 0
+        byteSize = 0
+        for root, dirs, files in os.walk(self.__pathToExtractedReport):
+            pathToRoot = os.path.relpath(root, self.__pathToExtractedReport)
+            if (pathToRoot == "."):
+                pathToRoot = ""
+            for dirname in dirs:
+                listOfPaths.append("%s/" %(os.path.join(pathToRoot, dirname)))
+            for filename in files:
+                if ((not len(pathToRoot) > 0) and (filename.startswith(".sx_"))):
+                    # The files written by sx are not part of the report.
+                    continue
+                pathToFile = os.path.join(pathToRoot, filename)
+                listOfPaths.append(pathToFile)
+                fileCount += 1
+                try:
+                    byteSize += os.lstat(os.path.join(root, filename)).st_size
+                except OSError:
+                    pass
+        listOfPaths.sort()
+        manifestMap = {"version":Report.MANIFEST_VERSION,
+                       "type":self.getType(),
+                       "name":self.getName(),
+                       "attributes":self.getManifestAttributes(),
+                       "fileCount":fileCount,
+                       "byteSize":byteSize,
+                       "paths":listOfPaths}
+        pathToManifest = os.path.join(self.__pathToExtractedReport, Report.MANIFEST_FILENAME)
+        try:
+            fout = open(pathToManifest, "w")
+            try:
+                json.dump(manifestMap, fout, encoding="latin-1")
+            finally:
+                fout.close()
+        except (IOError, os.error, UnicodeError, TypeError):
+            message = "There was an error writing the manifest of the report: %s." %(pathToManifest)
+            logging.getLogger(sx.MAIN_LOGGER_NAME).debug(message)
+            return False
+        return True
+
+    def readManifest(pathToExtractedReport):
+        """
+        Returns the map that was written to the manifest of the
+        extracted report. None is returned if there is no manifest or
+        the manifest cannot be read.
+
+        @return: Returns the map that was written to the manifest of the
+        extracted report.
+        @rtype: Dictionary
+
+        @param pathToExtractedReport: The path to the extracted report.
+        @type pathToExtractedReport: String
+        """
+        pathToManifest = os.path.join(pathToExtractedReport, Report.MANIFEST_FILENAME)
+        if (not os.path.isfile(pathToManifest)):
+            return None
+        try:
+            fin = open(pathToManifest, "r")
+            try:
+                manifestMap = json.load(fin, encoding="latin-1")
+            finally:
+                fin.close()
+        except (IOError, os.error, ValueError, UnicodeError):
+            message = "There was an error reading the manifest of the report: %s." %(pathToManifest)
+            logging.getLogger(sx.MAIN_LOGGER_NAME).debug(message)
+            return None
+        if ((not type(manifestMap) == dict) or (not manifestMap.get("version") == Report.MANIFEST_VERSION)):
+            return None
+        # The strings are written as latin-1 so they are converted back.
+        try:
+            for key in ["type", "name"]:
+                manifestMap[key] = manifestMap.get(key, u"").encode("latin-1")
+            attributesMap = {}
+            for (key, value) in manifestMap.get("attributes", {}).items():
+                if (type(value) == unicode):
+                    value = value.encode("latin-1")
+                attributesMap[key.encode("latin-1")] = value
+            manifestMap["attributes"] = attributesMap
+            manifestMap["paths"] = map(lambda path: path.encode("latin-1"), manifestMap.get("paths", []))
+        except (AttributeError, UnicodeError):
+            message = "There was an error reading the manifest of the report: %s." %(pathToManifest)
+            logging.getLogger(sx.MAIN_LOGGER_NAME).debug(message)
+            return None
+        return manifestMap
+    readManifest = staticmethod(readManifest)
+
     # ##########################################################################
     # Extract File/Data from extracted sreports functions
     # ##########################################################################
+    def __extractOnDemand(self, pathToFile):
+        """
+        If only some of the files in the report were extracted then this
+        function will extract the file or directory if it was not
+        extracted already.
+
+        @param pathToFile: The path to the file or directory, which is
+        relative to the root report directory.
+        @type pathToFile: String
+        """
+        if (self.__extractor == None):
+            return
+        pathToFile = pathToFile.strip()
+        if (pathToFile.endswith("/*")):
+            pathToFile = pathToFile[:-2]
+        pathToFile = pathToFile.strip("/")
+        if ((not len(pathToFile) > 0) or (self.__extractedPathsMap.has_key(pathToFile)) or
+            (self.__extractor.isIncluded(pathToFile)) or (self.isFileSkipped(pathToFile))):
+            return
+        message = "Extracting the path that was not extracted with the report: %s" %(pathToFile)
+        logging.getLogger(sx.MAIN_LOGGER_NAME).debug(message)
+        skippedCount = len(self.getSkippedFilesMap().keys())
+        self.__extractedPathsMap[pathToFile] = self.__extractor.extractMembers(self.__pathToExtractedReport, [pathToFile],
+                                                                               self.__stripDirectoriesDepth)
+        if (not self.__pathIndex == None):
+            self.__pathIndex.update(pathToFile)
+        exclusionPolicy = self.__extractor.getExclusionPolicy()
+        if ((not exclusionPolicy == None) and (not len(exclusionPolicy.getSkippedFilesMap().keys()) == skippedCount)):
+            exclusionPolicy.writeManifest(self.__pathToExtractedReport)
+
+    def __getPathIndex(self):
+        """
+        Returns the index of the paths in the extracted report. The index
+        is created if the report does not have one.
+
+        @return: Returns the index of the paths in the extracted report.
+        @rtype: PathIndex
+        """
+        if (self.__pathIndex == None):
+            self.__pathIndex = PathIndex(self.__pathToExtractedReport)
+        return self.__pathIndex
+
+    def __getArchiveMember(self, pathToFile):
+        """
+        Returns the member in the archive file for the path. Symbolic
+        links and hard links are followed. None is returned if the path
+        does not exist in the archive file or is a directory.
+
+        @return: Returns the member in the archive file for the path.
+        @rtype: ArchiveMember
+
+        @param pathToFile: The path to the file, which is relative to
+        the root report directory.
+        @type pathToFile: String
+        """
+        memberIndex = self.__extractor.getMemberIndex()
+        if (memberIndex == None):
+            return None
+        pathToFile = os.path.normpath(pathToFile.strip().strip("/"))
+        # Only follow a limited number of links in case there is a loop.
+        for i in range(0, 32):
+            member = memberIndex.findMember(pathToFile)
+            if (member == None):
+                return None
+            elif (member.isHardlink()):
+                return memberIndex.getMember(member.getLinkname())
+            elif (not member.isSymlink()):
+                return member
+            elif (member.getLinkname().startswith("/")):
+                # Absolute links point at files outside of the report.
+                return None
+            pathToFile = os.path.normpath(os.path.join(os.path.dirname(pathToFile), member.getLinkname()))
+            if (pathToFile.startswith("..")):
+                return None
+        return None
+
+    def __isArchiveDir(self, pathToDir):
+        """
+        Returns True if the path is a directory in the archive file.
+
+        @return: Returns True if the path is a directory in the archive
+        file.
+        @rtype: Boolean
+
+        @param pathToDir: The path to the directory, which is relative to
+        the root report directory.
+        @type pathToDir: String
+        """
+        memberIndex = self.__extractor.getMemberIndex()
+        if (memberIndex == None):
+            return False
+        return memberIndex.isDir(os.path.normpath(pathToDir.strip().strip("/")))
+
+    def __getArchiveDirListing(self, pathToDir):
+        """
+        Returns a sorted list of the names in the directory in the archive
+        file.
+
+        @return: Returns a sorted list of the names in the directory in
+        the archive file.
+        @rtype: Array
+
+        @param pathToDir: The path to the directory, which is relative to
+        the root report directory.
+        @type pathToDir: String
+        """
+        memberIndex = self.__extractor.getMemberIndex()
+        if (memberIndex == None):
+            return []
+        listOfNames = memberIndex.getChildren(os.path.normpath(pathToDir.strip().strip("/"))).keys()
+        listOfNames.sort()
+        return listOfNames
+
+    def __getArchiveDataFromFile(self, pathToFile):
+        """
+        Returns the data of the file in the archive file. None is
+        returned if the file does not exist or the data could not be
+        read.
+
+        @return: Returns the data of the file in the archive file.
+        @rtype: String
+
+        @param pathToFile: The path to the file, which is relative to
+        the root report directory.
+        @type pathToFile: String
+        """
+        member = self.__getArchiveMember(pathToFile)
+        if ((member == None) or (not member.isFile())):
+            return None
+        data = self.__extractor.getDataFromMember(member)
+        if (data == None):
+            message = "An error occured reading the file from the archive: %s." %(pathToFile)
+            logging.getLogger(sx.MAIN_LOGGER_NAME).error(message)
+        return data
+
+    def __getArchivePathForFile(self, pathToFile):
+        """
+        Writes the file or the files in the directory from the archive
+        file to the temporary directory for the report and returns the
+        path to it. Empty string is returned if the path does not exist
+        in the archive file.
+
+        @return: Returns the path to the file or directory that was
+        written from the archive file.
+        @rtype: String
+
+        @param pathToFile: The path to the file or directory, which is
+        relative to the root report directory.
+        @type pathToFile: String
+        """
+        pathToFile = os.path.normpath(pathToFile.strip().strip("/"))
+        dst = os.path.join(self.__pathToExtractedReport, pathToFile)
+        listOfPaths = [pathToFile]
+        if (self.__isArchiveDir(pathToFile)):
+            # The directory could have been created for another file so
+            # the files that were not written yet are written.
+            listOfPaths = []
+            for name in self.__getArchiveDirListing(pathToFile):
+                listOfPaths.append(os.path.join(pathToFile, name))
+        elif (os.path.exists(dst)):
+            return dst
+        elif (self.__getArchiveMember(pathToFile) == None):
+            return ""
+        try:
+            if (not os.path.isdir(os.path.dirname(dst))):
+                os.makedirs(os.path.dirname(dst))
+            if ((self.__isArchiveDir(pathToFile)) and (not os.path.isdir(dst))):
+                os.mkdir(dst)
+            for path in listOfPaths:
+                pathToDstFile = os.path.join(self.__pathToExtractedReport, path)
+                if (os.path.exists(pathToDstFile)):
+                    continue
+                elif (self.__isArchiveDir(path)):
+                    os.mkdir(pathToDstFile)
+                    continue
+                # Large files are streamed to the file so that they are not
+                # read into memory.
+                member = self.__getArchiveMember(path)
+                if ((not member == None) and (member.getSize() > Report.CHUNK_SIZE) and
+                    (self.__extractor.extractMemberToFile(member, pathToDstFile))):
+                    continue
+                data = self.__getArchiveDataFromFile(path)
+                if (not data == None):
+                    fout = open(pathToDstFile, "w")
+                    try:
+                        fout.write(data)
+                    finally:
+                        fout.close()
+        except (IOError, os.error):
+            message = "An error occured writing the file from the archive: %s." %(dst)
+            logging.getLogger(sx.MAIN_LOGGER_NAME).error(message)
+        if (os.path.exists(dst)):
+            return dst
+        return ""
+
+    def registerArtifact(name, generator, version=1):
+        """
+        Registers the function that creates the artifact from a report.
+        An artifact is a structure that is parsed from the files of a
+        report that more than one plugin uses. If the version of the
+        function changes then the artifact is created again.
+
+        @param name: The name of the artifact.
+        @type name: String
+        @param generator: The function that creates the artifact. The
+        report is the only argument.
+        @type generator: Function
+        @param version: The version of the function that creates the
+        artifact.
+        @type version: Int
+        """
+        Report.__artifactGeneratorsMap[name] = (generator, version)
+    registerArtifact = staticmethod(registerArtifact)
+
+    def getArtifact(self, name):
+        """
+        Returns the artifact that was created from this report. The
+        artifact is created the first time it is requested and the same
+        object is returned to all the plugins that request it, so the
+        artifact should not be changed.
+
+        None is returned if no function is registered for the artifact
+        or the function returned None.
+
+        @return: Returns the artifact that was created from this report.
+        @rtype: Object
+
+        @param name: The name of the artifact.
+        @type name: String
+        """
+        generatorTuple = Report.__artifactGeneratorsMap.get(name)
+        if (generatorTuple == None):
+            message = "There is no function registered that creates the artifact: %s." %(name)
+            logging.getLogger(sx.MAIN_LOGGER_NAME).error(message)
+            return None
+        (generator, version) = generatorTuple
+        key = (name, version)
+        if (not self.__artifactsMap.has_key(key)):
+            message = "Creating the artifact %s for the report: %s." %(name, self.getPathToExtractedReport())
+            logging.getLogger(sx.MAIN_LOGGER_NAME).debug(message)
+            self.__artifactsMap[key] = generator(self)
+        return self.__artifactsMap.get(key)
+
     def getFileListing(self, pathToDir):
         """
         Returns a list of file path for all the files in the directory. If no
@@ -164,8 +747,14 @@ class Report:
         """
         listOfFiles = []
         fullPathToDir = self.getPathForFile(pathToDir)
-        if ((os.path.isdir(fullPathToDir)) and (len(fullPathToDir) > 0)):
-            for filename in os.listdir(fullPathToDir):
+        if (not len(fullPathToDir) > 0):
+            return listOfFiles
+        elif (self.__isArchiveBacked):
+            if (os.path.isdir(fullPathToDir)):
+                for filename in os.listdir(fullPathToDir):
+                    listOfFiles.append(os.path.join(fullPathToDir, filename))
+        elif (self.__getPathIndex().isDir(pathToDir)):
+            for filename in self.__getPathIndex().listDir(pathToDir):
                 listOfFiles.append(os.path.join(fullPathToDir, filename))
         return listOfFiles
 
@@ -173,7 +762,8 @@ class Report:
         """
         This function will return the data in an array. Where each
         newline in file is a seperate item in the array. This should
-        really just be used on relatively small files.
+        really just be used on relatively small files. Large files should
+        be read with iterLines() or iterChunks().
 
         None is returned if no file is found.
 
@@ -185,20 +775,281 @@ class Report:
         the root report directory.
         @type pathToFile: String
         """
+        lines = self.getLinesFromFile(pathToFile)
+        if (lines == None):
+            return None
+        # A new list is returned so that the lines in the content cache
+        # are not changed by the caller.
+        return list(lines)
+
+    def getLinesFromFile(self, pathToFile):
+        """
+        Returns a tuple of the lines in the file. The lines are kept in
+        the content cache after the file is read the first time, so the
+        tuple is shared with the other callers that read the file.
+
+        None is returned if no file is found.
+
+        @return: Returns a tuple of Strings, where each newline in file
+        is an item in the tuple.
+        @rtype: Tuple
+
+        @param pathToFile: The path to the file, which is relative to
+        the root report directory.
+        @type pathToFile: String
+        """
+        if (self.__isArchiveBacked):
+            # The files in the archive file only change if the archive file
+            # is changed.
+            try:
+                mtime = os.stat(self.__extractor.getPathToFile()).st_mtime
+            except OSError:
+                mtime = -1
+            key = (self.__pathToExtractedReport, os.path.normpath(pathToFile.strip().strip("/")), mtime)
+            lines = ContentCache.get(key)
+            if (lines == None):
+                data = self.__getArchiveDataFromFile(pathToFile)
+                if (data == None):
+                    return None
+                lines = ContentCache.add(key, data.splitlines(True))
+            return lines
         pathToFile = self.getPathForFile(pathToFile)
         if (len(pathToFile) > 0) :
             try:
-                fin = open(pathToFile, "r")
-                data = fin.readlines()
-                fin.close()
-                return data
+                key = (self.__pathToExtractedReport, pathToFile, os.stat(pathToFile).st_mtime)
+                lines = ContentCache.get(key)
+                if (lines == None):
+                    fin = open(pathToFile, "r")
+                    try:
+                        lines = ContentCache.add(key, fin.readlines())
+                    finally:
+                        fin.close()
+                return lines
             except (IOError, os.error):
                 message = "An error occured reading the file: %s." %(pathToFile)
                 logging.getLogger(sx.MAIN_LOGGER_NAME).error(message)
-            else:
-                fin.close()
         return None
 
+    def openStream(self, pathToFile):
+        """
+        Returns a read only file object for the data in the file. The
+        data in files that are compressed with gzip, bzip2, xz or zstd,
+        such as rotated log files, is decompressed as it is read. The
+        caller has to close the file object.
+
+        None is returned if no file is found or the file cannot be read.
+
+        @return: Returns a read only file object for the data in the
+        file.
+        @rtype: File
+
+        @param pathToFile: The path to the file, which is relative to
+        the root report directory.
+        @type pathToFile: String
+        """
+        pathToFile = self.getPathForFile(pathToFile)
+        if ((not len(pathToFile) > 0) or (not os.path.isfile(pathToFile))):
+            return None
+        compressionType = readCompressionType(pathToFile)
+        if (not isCompressionSupported(compressionType)):
+            message = "The %s compressed file cannot be read since there is no decompressor installed: %s." %(compressionType, pathToFile)
+            logging.getLogger(sx.MAIN_LOGGER_NAME).error(message)
+            return None
+        try:
+            if (compressionType == None):
+                return open(pathToFile, "rb")
+            return CompressedFileReader(pathToFile, compressionType)
+        except (IOError, os.error):
+            message = "An error occured opening the file: %s." %(pathToFile)
+            logging.getLogger(sx.MAIN_LOGGER_NAME).error(message)
+        return None
+
+    def iterChunks(self, pathToFile, size=CHUNK_SIZE):
+        """
+        Returns a generator of the data in the file in chunks of up to
+        size bytes, so only one chunk of the file is in memory at a time.
+        Compressed files are decompressed as they are read. Nothing is
+        generated if no file is found.
+
+        @return: Returns a generator of the chunks of data in the file.
+        @rtype: Generator
+
+        @param pathToFile: The path to the file, which is relative to
+        the root report directory.
+        @type pathToFile: String
+        @param size: The number of bytes in each chunk.
+        @type size: Int
+        """
+        fin = self.openStream(pathToFile)
+        if (fin == None):
+            return
+        try:
+            while (True):
+                try:
+                    data = fin.read(size)
+                except (IOError, os.error, EOFError, zlib.error):
+                    message = "An error occured reading the file: %s." %(pathToFile)
+                    logging.getLogger(sx.MAIN_LOGGER_NAME).error(message)
+                    break
+                if (not len(data) > 0):
+                    break
+                yield data
+        finally:
+            fin.close()
+
+    def iterLines(self, pathToFile):
+        """
+        Returns a generator of the lines in the file, so that files that
+        are too large to be read into memory can be parsed one line at a
+        time. Compressed files are decompressed as they are read. The
+        lines end with a newline whether the file uses "\\n", "\\r\\n" or
+        "\\r" as the line separator. Nothing is generated if no file is
+        found.
+
+        @return: Returns a generator of the lines in the file.
+        @rtype: Generator
+
+        @param pathToFile: The path to the file, which is relative to
+        the root report directory.
+        @type pathToFile: String
+        """
+        def normalize(line):
+            if (line.endswith("\r\n")):
+                return "%s\n" %(line[:-2])
+            elif (line.endswith("\r")):
+                return "%s\n" %(line[:-1])
+            return line
+        # The last line of a chunk is kept until the next chunk is read
+        # since the rest of the line or the "\n" of a "\r\n" can be in
+        # the next chunk.
+        pendingLine = ""
+        for data in self.iterChunks(pathToFile):
+            listOfLines = (pendingLine + data).splitlines(True)
+            pendingLine = listOfLines.pop()
+            if (pendingLine.endswith("\n")):
+                listOfLines.append(pendingLine)
+                pendingLine = ""
+            for line in listOfLines:
+                yield normalize(line)
+        if (len(pendingLine) > 0):
+            yield normalize(pendingLine)
+
+    def __getPathsForGlob(self, pathGlob):
+        """
+        Returns a sorted list of the paths to the files in the report that
+        match the path glob. The files in the archive file that were not
+        extracted are included.
+
+        @return: Returns a sorted list of the paths to the files in the
+        report that match the path glob.
+        @rtype: Array
+
+        @param pathGlob: The path glob, which is relative to the root
+        report directory.
+        @type pathGlob: String
+        """
+        pathGlob = pathGlob.strip().strip("/")
+        setOfPaths = set()
+        # The members in the archive file are only needed when some of the
+        # files are not on disk, since the index of the members might have
+        # to be created by reading the archive file again.
+        if ((not self.__extractor == None) and
+            ((self.__isArchiveBacked) or (not self.__extractor.getIncludePathGlobs() == None))):
+            memberIndex = self.__extractor.getMemberIndex()
+            if (not memberIndex == None):
+                for member in memberIndex.getMembers():
+                    if (member.isDir()):
+                        continue
+                    relativePath = self.__extractor.getRelativePath(member.getName(), self.__stripDirectoriesDepth)
+                    if ((len(relativePath) > 0) and (fnmatch.fnmatch(relativePath, pathGlob))):
+                        setOfPaths.add(relativePath)
+        if (not self.__isArchiveBacked):
+            for relativePath in self.__getPathIndex().glob(pathGlob):
+                if (not relativePath == Report.MANIFEST_FILENAME):
+                    setOfPaths.add(relativePath)
+        listOfPaths = list(setOfPaths)
+        listOfPaths.sort()
+        return listOfPaths
+
+    def search(self, pathGlob, regex, maxHits=None):
+        """
+        Returns a generator of the matches of the regular expression in
+        the files in the report that match the path glob. The regular
+        expression is run over all the data in each file instead of each
+        line, so "^" and "$" match at the start and end of each line when
+        the regular expression is a string. The files that are not
+        compressed are mapped into memory with mmap and the files are
+        searched in a pool of threads. The matches are generated in the
+        order of the paths of the files and then the order in the file.
+        The lines are separated by "\\n" and a "\\r" at the end of a line
+        is not included in the line of a match.
+
+        Nothing is generated if no file matches or the regular expression
+        is not valid.
+
+        @return: Returns a generator of the matches of the regular
+        expression.
+        @rtype: Generator
+
+        @param pathGlob: The path glob for the files, which is relative to
+        the root report directory.
+        @type pathGlob: String
+        @param regex: The regular expression which is compiled with
+        re.MULTILINE if it is a string.
+        @type regex: String
+        @param maxHits: The maximum number of matches that are generated
+        for all the files. None means that all the matches are generated.
+        @type maxHits: Int
+        """
+        if (not hasattr(regex, "finditer")):
+            try:
+                regex = re.compile(regex, re.MULTILINE)
+            except re.error:
+                message = "The regular expression is not valid: %s." %(regex)
+                logging.getLogger(sx.MAIN_LOGGER_NAME).error(message)
+                return
+        # The files are written to the temporary directory before they are
+        # searched since the extractor cannot be used by more than one
+        # thread.
+        listOfFiles = []
+        for pathToFileInReport in self.__getPathsForGlob(pathGlob):
+            pathToFile = self.getPathForFile(pathToFileInReport)
+            if ((len(pathToFile) > 0) and (os.path.isfile(pathToFile))):
+                listOfFiles.append((pathToFileInReport, pathToFile))
+        if (not len(listOfFiles) > 0):
+            return
+        def searchFile(fileTuple):
+            (pathToFileInReport, pathToFile) = fileTuple
+            compressionType = readCompressionType(pathToFile)
+            if (compressionType == None):
+                return FileSearch.searchFile(pathToFile, regex, pathToFileInReport, maxHits)
+            elif (not isCompressionSupported(compressionType)):
+                message = "The %s compressed file cannot be searched since there is no decompressor installed: %s." %(compressionType, pathToFile)
+                logging.getLogger(sx.MAIN_LOGGER_NAME).error(message)
+                return []
+            try:
+                fin = CompressedFileReader(pathToFile, compressionType)
+            except (IOError, os.error):
+                message = "An error occured opening the file: %s." %(pathToFile)
+                logging.getLogger(sx.MAIN_LOGGER_NAME).error(message)
+                return []
+            try:
+                return FileSearch.searchStream(fin, regex, pathToFileInReport, maxHits)
+            finally:
+                fin.close()
+        hitsCount = 0
+        pool = ThreadPool(min(Report.SEARCH_THREADS, len(listOfFiles)))
+        try:
+            for listOfHits in pool.imap(searchFile, listOfFiles):
+                for hit in listOfHits:
+                    yield hit
+                    hitsCount += 1
+                    if ((not maxHits == None) and (hitsCount >= maxHits)):
+                        return
+        finally:
+            pool.terminate()
+            pool.join()
+
     def __getPathForDir(self, pathToDir):
         """
         This function will return the path to the directory. If
@@ -215,8 +1066,9 @@ class Report:
         @type pathToDir: String
         """
         if (len(pathToDir) > 0):
+            self.__extractOnDemand(pathToDir)
             src = os.path.join(self.__pathToExtractedReport, pathToDir).strip()
-            if (os.path.isdir(src)):
+            if (self.__getPathIndex().isDir(pathToDir)):
                 return src
         # This function will not make a copy of the directory.
         return ""
@@ -243,6 +1095,8 @@ class Report:
         @type pathToDir: String
         """
         fileDataMap = {}
+        if (self.__isArchiveBacked):
+            return self.__getArchiveDataFromDir(pathToDir)
         fullPathToDir = self.getPathForFile(pathToDir)
         # If a directory is requested with ending astericks then get all the
         # files in its subdirectories and root directory.
@@ -252,39 +1106,69 @@ class Report:
             # of the directory and in its sub directories.
             pathToDirMod = pathToDir.rstrip('/*')
             fullPathToDir = self.__getPathForDir(pathToDirMod)
-            if (os.path.exists(fullPathToDir)):
-                dirList = os.listdir(fullPathToDir)
-                for currentFilename in dirList:
-                    fullPathToCurrentFilename = os.path.join(fullPathToDir, currentFilename)
-                    if (os.path.isdir(fullPathToCurrentFilename)):
-                        subDirList = os.listdir(fullPathToCurrentFilename)
-                        for subFilename in subDirList:
-                            fullPathToSubFilename = os.path.join(fullPathToCurrentFilename, subFilename)
-                            if (os.path.isfile(fullPathToSubFilename)):
-                                splitPath = fullPathToSubFilename.split("%s/" %(self.__pathToExtractedReport))
-                                if (len(splitPath) == 2):
-                                    currentData = self.getDataFromFile(splitPath[1])
-                                    if (not currentData == None):
-                                        fileDataMap[splitPath[1]] = currentData
-                    elif (os.path.exists(fullPathToCurrentFilename)):
-                        splitPath = fullPathToCurrentFilename.split("%s/" %(self.__pathToExtractedReport))
-                        if (len(splitPath) == 2):
-                            currentData = self.getDataFromFile(splitPath[1])
-                            if (not currentData == None):
-                                fileDataMap[splitPath[1]] = currentData
-        elif (os.path.isdir(fullPathToDir)):
-            try:
-                # Add all files in this directory to the list and sort later.
-                dirList = os.listdir(fullPathToDir)
-                for currentFilename in dirList:
-                    # Skip directories
-                    if (not os.path.isdir(os.path.join(fullPathToDir, currentFilename))):
-                        currentData = self.getDataFromFile("%s/%s" %(pathToDir, currentFilename))
+            if (len(fullPathToDir) > 0):
+                pathIndex = self.__getPathIndex()
+                for currentFilename in pathIndex.listDir(pathToDirMod):
+                    pathToCurrentFilename = os.path.join(pathToDirMod, currentFilename)
+                    if (pathIndex.isDir(pathToCurrentFilename)):
+                        for subFilename in pathIndex.listDir(pathToCurrentFilename):
+                            pathToSubFilename = os.path.join(pathToCurrentFilename, subFilename)
+                            if (pathIndex.isFile(pathToSubFilename)):
+                                currentData = self.getDataFromFile(pathToSubFilename)
+                                if (not currentData == None):
+                                    fileDataMap[pathToSubFilename] = currentData
+                    elif (pathIndex.exists(pathToCurrentFilename)):
+                        currentData = self.getDataFromFile(pathToCurrentFilename)
                         if (not currentData == None):
-                            fileDataMap[currentFilename] = currentData
-            except OSError:
-                message = "There was an error getting a directory list for reports: %s." %(fullPathToDir)
-                logging.getLogger(sx.MAIN_LOGGER_NAME).warn(message)
+                            fileDataMap[pathToCurrentFilename] = currentData
+        elif ((len(fullPathToDir) > 0) and (self.__getPathIndex().isDir(pathToDir))):
+            pathIndex = self.__getPathIndex()
+            # Add all files in this directory to the list and sort later.
+            for currentFilename in pathIndex.listDir(pathToDir):
+                # Skip directories
+                if (not pathIndex.isDir(os.path.join(pathToDir, currentFilename))):
+                    currentData = self.getDataFromFile("%s/%s" %(pathToDir, currentFilename))
+                    if (not currentData == None):
+                        fileDataMap[currentFilename] = currentData
+        return fileDataMap
+
+    def __getArchiveDataFromDir(self, pathToDir):
+        """
+        Returns the same dictionary as getDataFromDir() with the data
+        read from the archive file.
+
+        @return: Returns a dictionary that contains the data for all
+        files in that directory.
+        @rtype: Dictionary
+
+        @param pathToDir: The path to the directory, which is relative to
+        the root report directory.
+        @type pathToDir: String
+        """
+        fileDataMap = {}
+        if (pathToDir.endswith('/*')):
+            # The keys are the paths relative to the root report directory
+            # for the files in the directory and in its sub directories.
+            pathToDirMod = os.path.normpath(pathToDir.rstrip('/*'))
+            listOfPaths = []
+            for name in self.__getArchiveDirListing(pathToDirMod):
+                path = os.path.join(pathToDirMod, name)
+                if (self.__isArchiveDir(path)):
+                    for subName in self.__getArchiveDirListing(path):
+                        listOfPaths.append(os.path.join(path, subName))
+                else:
+                    listOfPaths.append(path)
+            for path in listOfPaths:
+                currentData = self.getDataFromFile(path)
+                if (not currentData == None):
+                    fileDataMap[path] = currentData
+        elif (self.__isArchiveDir(pathToDir)):
+            for currentFilename in self.__getArchiveDirListing(pathToDir):
+                # Skip directories
+                if (not self.__isArchiveDir(os.path.join(pathToDir, currentFilename))):
+                    currentData = self.getDataFromFile("%s/%s" %(pathToDir, currentFilename))
+                    if (not currentData == None):
+                        fileDataMap[currentFilename] = currentData
         return fileDataMap
 
     def getFileSize(self, pathToFile):
@@ -302,11 +1186,14 @@ class Report:
         """
         # -1 means file does not exist.
         fileSize = -1
-        if (len(pathToFile) > 0):
-            src = os.path.join(self.__pathToExtractedReport, pathToFile)
-            if (os.path.exists(src)):
-                fileSize = os.path.getsize(src)
-                return fileSize
+        if ((len(pathToFile) > 0) and (self.__isArchiveBacked)):
+            member = self.__getArchiveMember(pathToFile)
+            if (not member == None):
+                fileSize = member.getSize()
+            return fileSize
+        elif (len(pathToFile) > 0):
+            self.__extractOnDemand(pathToFile)
+            fileSize = self.__getPathIndex().getSize(pathToFile)
         return fileSize
 
     def getPathForFile(self, pathToFile):
@@ -321,13 +1208,169 @@ class Report:
         the root report directory.
         @type pathToFile: String
         """
-        if (len(pathToFile) > 0):
+        if ((len(pathToFile) > 0) and (self.__isArchiveBacked)):
+            return self.__getArchivePathForFile(pathToFile)
+        elif (len(pathToFile) > 0):
+            self.__extractOnDemand(pathToFile)
             src = os.path.join(self.__pathToExtractedReport, pathToFile).strip()
             # Cannot check if file cause we have symlinks in report
-            if (os.path.exists(src)):
+            if (self.__getPathIndex().exists(pathToFile)):
                     return src
         return ""
 
+    def __createUniqueExtractDir(self, extractDir):
+        """
+        Creates and returns a path for the extraction directory that did
+        not exist. If the path exists then "-duplicate_<number>" is
+        appended to the path. The directory is created with os.mkdir()
+        which fails if the directory exists, so that reports extracted
+        at the same time by different processes never get the same
+        directory. An empty string is returned if no directory could be
+        created.
+
+        @return: Returns the path to the extraction directory that was
+        created.
+        @rtype: String
+
+        @param extractDir: The full path to directory for extraction.
+        @type extractDir: String
+        """
+        (head, tail) = os.path.split(extractDir)
+        try:
+            if (not os.access(head, os.F_OK)):
+                os.makedirs(head)
+        except (IOError, os.error):
+            # Another process could have created the directory.
+            if (not os.path.isdir(head)):
+                message =  "IO error occured on creating the directory: %s." %(head)
+                logging.getLogger(sx.MAIN_LOGGER_NAME).error(message)
+                return ""
+        for i in range(0, 100) :
+            pathToDir = extractDir
+            if (i > 0):
+                pathToDir = os.path.join(head, "%s-duplicate_%s" %(tail, str(i)))
+            try:
+                os.mkdir(pathToDir)
+                return pathToDir
+            except OSError, e:
+                if (not e.errno == errno.EEXIST):
+                    message =  "IO error occured on creating the directory: %s." %(pathToDir)
+                    logging.getLogger(sx.MAIN_LOGGER_NAME).error(message)
+                    return ""
+        message =  "There are too many duplicate directories for the directory: %s." %(extractDir)
+        logging.getLogger(sx.MAIN_LOGGER_NAME).error(message)
+        return ""
+
+    def moveExtractedReport(self, extractDir):
+        """
+        This function will rename the extracted report to the extract
+        dir. This is used by reports that can only name the extraction
+        directory after the report has been extracted. If the extract
+        dir exists then "-duplicate_<number>" is appended to the path.
+
+        @return: Returns True if the extracted report was renamed.
+        @rtype: Boolean
+
+        @param extractDir: The full path to directory that the
+        extracted report will be renamed to.
+        @type extractDir: String
+        """
+        if (not os.path.isdir(self.__pathToExtractedReport)):
+            return False
+        extractDir = self.__createUniqueExtractDir(extractDir)
+        if (not len(extractDir) > 0):
+            return False
+        try:
+            # The empty directory that was created is replaced by the rename.
+            os.rename(self.__pathToExtractedReport, extractDir)
+        except OSError:
+            message =  "There was an error renaming the directory %s to %s." %(self.__pathToExtractedReport, extractDir)
+            logging.getLogger(sx.MAIN_LOGGER_NAME).error(message)
+            try:
+                os.rmdir(extractDir)
+            except OSError:
+                pass
+            return False
+        # The paths in the index are relative to the extracted report so
+        # the index does not have to be created again.
+        pathIndex = self.__pathIndex
+        self.setPathToExtractedReport(extractDir)
+        if (not pathIndex == None):
+            pathIndex.setPathToRoot(extractDir)
+            self.__pathIndex = pathIndex
+        return True
+
+    def link(self, pathToExistingReport, extractDir):
+        """
+        Links the report to a report that was extracted before from a
+        file with the same contents instead of extracting it. A symbolic
+        link to the extracted report is created in the extract dir. If
+        the path exists then "-duplicate_<number>" is appended to the
+        path.
+
+        @return: Returns True if the report was linked to the extracted
+        report.
+        @rtype: Boolean
+
+        @param pathToExistingReport: The path to the report that was
+        extracted before.
+        @type pathToExistingReport: String
+        @param extractDir: The full path to directory for extraction.
+        @type extractDir: String
+        """
+        manifestMap = Report.readManifest(pathToExistingReport)
+        if ((manifestMap == None) or (not manifestMap.get("name") == self.getName())):
+            return False
+        pathToLink = self.__createUniqueExtractDir(os.path.join(extractDir, os.path.basename(pathToExistingReport)))
+        if (not len(pathToLink) > 0):
+            return False
+        try:
+            # The empty directory that was created is replaced by the link.
+            os.rmdir(pathToLink)
+            os.symlink(os.path.realpath(pathToExistingReport), pathToLink)
+        except OSError:
+            message =  "There was an error linking the directory %s to %s." %(pathToLink, pathToExistingReport)
+            logging.getLogger(sx.MAIN_LOGGER_NAME).error(message)
+            return False
+        self.setManifestAttributes(manifestMap.get("attributes"))
+        self.setPathToExtractedReport(pathToLink)
+        return True
+
+    def openArchive(self, extractor):
+        """
+        Opens the report so that the files in the report are read from
+        the archive file instead of being extracted. Any file that a
+        path is requested for is written to a temporary directory that
+        is removed when the report is cleaned.
+
+        @return: Returns True if the archive file was indexed and the
+        report can be read.
+        @rtype: Boolean
+
+        @param extractor: An extractor object that contains the path to the
+        file that will be read.
+        @type extractor: Extractor
+        """
+        message = "Reading the %s without extracting it: %s" %(self.getName(), extractor.getPathToFile())
+        logging.getLogger(sx.MAIN_LOGGER_NAME).status(message)
+        if (extractor.getMemberIndex() == None):
+            message = "The files in the archive could not be indexed: %s" %(extractor.getPathToFile())
+            logging.getLogger(sx.MAIN_LOGGER_NAME).error(message)
+            return False
+        try:
+            pathToReport = tempfile.mkdtemp(prefix="%s-" %(os.path.basename(extractor.getPathToFile())),
+                                            dir=Extractor.getPathToTempDir())
+        except (IOError, os.error):
+            message = "Could not create the temporary directory for the report: %s" %(extractor.getPathToFile())
+            logging.getLogger(sx.MAIN_LOGGER_NAME).error(message)
+            return False
+        self.__extractor = extractor
+        self.__extractedPathsMap = {}
+        self.__skippedFilesMap = {}
+        self.__isArchiveBacked = True
+        self.setPathToExtractedReport(pathToReport)
+        return True
+
     def extract(self, extractor, extractDir):
         """
         This function will extract the report to the extract
@@ -357,23 +1400,31 @@ class Report:
         logging.getLogger(sx.MAIN_LOGGER_NAME).status(message)
         if (not len(extractDir) > 0):
             return False
+        self.__extractor = extractor
+        self.__extractedPathsMap = {}
+        exclusionPolicy = extractor.getExclusionPolicy()
+        if (exclusionPolicy == None):
+            exclusionPolicy = ExclusionPolicy()
+            extractor.setExclusionPolicy(exclusionPolicy)
+        if (exclusionPolicy.isReportExcludePathGlobsIncluded()):
+            exclusionPolicy.addExcludePathGlobs(self.getExcludePathGlobs())
+        self.__skippedFilesMap = exclusionPolicy.getSkippedFilesMap()
+        if (not extractor.getIncludePathGlobs() == None):
+            if (self.getPathGlobs() == None):
+                # The report does not support extracting only some files.
+                extractor.setIncludePathGlobs(None)
+            else:
+                extractor.setIncludePathGlobs(extractor.getIncludePathGlobs() + self.getPathGlobs())
         # Check for duplicate extraction point and rename if it exists.
-        if os.path.exists(extractDir) :
-            for i in range(1, 100) :
-                (head, tail) = os.path.split(extractDir)
-                duplicatePath = os.path.join(head, "%s-duplicate_%s" %(tail, str(i)))
-                if (not os.path.exists(duplicatePath)) :
-                    # Directory does not exist so we can extract to this path
-                    extractDir = duplicatePath
-                    break;
+        extractDir = self.__createUniqueExtractDir(extractDir)
+        if (not len(extractDir) > 0):
+            return False
         # Set path to extraction point and temporary directory
         self.setPathToExtractedReport(extractDir)
         # Do the extraction of the file
-        try:
-            if not os.access(self.__pathToExtractedReport, os.F_OK):
-                os.makedirs(self.__pathToExtractedReport)
-        except (IOError, os.error):
-            message =  "IO error occured on creating the directory: %s." %(self.__pathToExtractedReport)
-            logging.getLogger(sx.MAIN_LOGGER_NAME).error(message)
+        if (not extractor.extract(self.__pathToExtractedReport, self.__stripDirectoriesDepth)):
             return False
-        return extractor.extract(self.__pathToExtractedReport, self.__stripDirectoriesDepth)
+        # Write the files that were skipped so they are known when the
+        # report is loaded again.
+        exclusionPolicy.writeManifest(self.__pathToExtractedReport)
+        return True
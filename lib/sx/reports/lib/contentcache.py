@@ -0,0 +1,163 @@
+#!/usr/bin/env python
+"""
+This is a cache of the data of the files that are read from the
+reports. The same files are read from a report by more than one plugin,
+so the lines of a file are kept in memory after the file is read the
+first time.
+
+@author    :  Shane Bradley
+@contact   :  sbradley@redhat.com
+@version   :  2.17
+@copyright :  GPLv2
+"""
+import threading
+
+class ContentCache:
+    """
+    This class is a cache of the lines of the files that were read from
+    the reports that lives for the whole run. The key for a file is the
+    path to the report, the path to the file in the report and the
+    modification time of the file so that a modified file is read again.
+
+    The lines are kept as a tuple so that they cannot be changed by the
+    callers they are shared with. The files that were used last are kept
+    until the size of the data in the cache is larger than the maximum
+    size.
+
+    @cvar MAX_SIZE: The default number of bytes of data that are kept in
+    memory.
+    @type MAX_SIZE: Int
+    """
+    MAX_SIZE = 64 * 1048576
+    __maxSize = MAX_SIZE
+    # Map of the key of a file to a tuple of the lines in the file and the
+    # size of the data.
+    __entriesMap = {}
+    # The keys in the order they were used with the last used key at the
+    # end.
+    __listOfKeys = []
+    __size = 0
+    __hits = 0
+    __misses = 0
+    # The files are read by the plugins pipeline thread at the same time
+    # the reports are extracted.
+    __lock = threading.Lock()
+
+    def getMaxSize():
+        return ContentCache.__maxSize
+    getMaxSize = staticmethod(getMaxSize)
+
+    def getSize():
+        return ContentCache.__size
+    getSize = staticmethod(getSize)
+
+    def getHits():
+        return ContentCache.__hits
+    getHits = staticmethod(getHits)
+
+    def getMisses():
+        return ContentCache.__misses
+    getMisses = staticmethod(getMisses)
+
+    def setMaxSize(maxSize):
+        """
+        Sets the number of bytes of data that are kept in memory. The
+        cache is disabled if the size is 0.
+
+        @param maxSize: The number of bytes of data that are kept in
+        memory.
+        @type maxSize: Int
+        """
+        ContentCache.__lock.acquire()
+        try:
+            ContentCache.__maxSize = max(maxSize, 0)
+            ContentCache.__evict(0)
+        finally:
+            ContentCache.__lock.release()
+    setMaxSize = staticmethod(setMaxSize)
+
+    def __evict(size):
+        """
+        Removes the files that were used least recently until there is
+        room for the size of data. The lock has to be held.
+
+        @param size: The number of bytes of data that will be added.
+        @type size: Int
+        """
+        while ((len(ContentCache.__listOfKeys) > 0) and
+               (ContentCache.__size + size > ContentCache.__maxSize)):
+            key = ContentCache.__listOfKeys.pop(0)
+            ContentCache.__size -= ContentCache.__entriesMap.pop(key)[1]
+    __evict = staticmethod(__evict)
+
+    def get(key):
+        """
+        Returns the tuple of the lines of the file. None is returned if
+        the file is not in the cache.
+
+        @return: Returns the tuple of the lines of the file.
+        @rtype: Tuple
+
+        @param key: A tuple of the path to the report, the path to the
+        file in the report and the modification time of the file.
+        @type key: Tuple
+        """
+        ContentCache.__lock.acquire()
+        try:
+            entry = ContentCache.__entriesMap.get(key)
+            if (entry == None):
+                ContentCache.__misses += 1
+                return None
+            ContentCache.__hits += 1
+            ContentCache.__listOfKeys.remove(key)
+            ContentCache.__listOfKeys.append(key)
+            return entry[0]
+        finally:
+            ContentCache.__lock.release()
+    get = staticmethod(get)
+
+    def add(key, listOfLines):
+        """
+        Adds the lines of the file to the cache and returns the tuple of
+        the lines of the file. The file is not kept in the cache if the
+        data is larger than the maximum size.
+
+        @return: Returns the tuple of the lines of the file.
+        @rtype: Tuple
+
+        @param key: A tuple of the path to the report, the path to the
+        file in the report and the modification time of the file.
+        @type key: Tuple
+        @param listOfLines: The lines of the file.
+        @type listOfLines: Array
+        """
+        lines = tuple(listOfLines)
+        size = sum(map(len, lines))
+        ContentCache.__lock.acquire()
+        try:
+            if ((size > ContentCache.__maxSize) or (ContentCache.__entriesMap.has_key(key))):
+                return lines
+            ContentCache.__evict(size)
+            ContentCache.__entriesMap[key] = (lines, size)
+            ContentCache.__listOfKeys.append(key)
+            ContentCache.__size += size
+        finally:
+            ContentCache.__lock.release()
+        return lines
+    add = staticmethod(add)
+
+    def removeReport(pathToReport):
+        """
+        Removes all the files of the report from the cache.
+
+        @param pathToReport: The path to the report.
+        @type pathToReport: String
+        """
+        ContentCache.__lock.acquire()
+        try:
+            for key in filter(lambda key: key[0] == pathToReport, ContentCache.__listOfKeys):
+                ContentCache.__listOfKeys.remove(key)
+                ContentCache.__size -= ContentCache.__entriesMap.pop(key)[1]
+        finally:
+            ContentCache.__lock.release()
+    removeReport = staticmethod(removeReport)
@@ -0,0 +1,253 @@
+#!/usr/bin/env python
+"""
+This is a search of the files in the reports with a regular
+expression. The regular expression is run over all the data in the file
+instead of over each line, so that large files such as the syslog files
+can be searched without reading each line into a string.
+
+@author    :  Shane Bradley
+@contact   :  sbradley@redhat.com
+@version   :  2.17
+@copyright :  GPLv2
+"""
+import os
+import mmap
+import zlib
+import logging
+
+import sx
+
+class SearchHit:
+    """
+    This class is a container for a match of a regular expression in a
+    file of a report.
+    """
+    def __init__(self, pathToFile, lineNumber, offset, line, match):
+        """
+        @param pathToFile: The path to the file, which is relative to the
+        root report directory.
+        @type pathToFile: String
+        @param lineNumber: The number of the line that the match starts
+        on. The first line is 1.
+        @type lineNumber: Int
+        @param offset: The number of bytes from the start of the file to
+        the start of the match.
+        @type offset: Long
+        @param line: The line that the match starts on without the
+        newline.
+        @type line: String
+        @param match: The data that matched the regular expression.
+        @type match: String
+        """
+        self.__pathToFile = pathToFile
+        self.__lineNumber = lineNumber
+        self.__offset = offset
+        self.__line = line
+        self.__match = match
+
+    def __str__(self):
+        return "%s:%d:%s" %(self.__pathToFile, self.__lineNumber, self.__line)
+
+    def getPathToFile(self):
+        return self.__pathToFile
+
+    def getLineNumber(self):
+        return self.__lineNumber
+
+    def getOffset(self):
+        return self.__offset
+
+    def getLine(self):
+        return self.__line
+
+    def getMatch(self):
+        return self.__match
+
+class FileSearch:
+    """
+    This class searches the data in a file with a compiled regular
+    expression. Files that are not compressed are mapped into memory with
+    mmap so that the file is not read into a string. Compressed files are
+    decompressed a chunk at a time and each chunk is searched up to the
+    last complete line in the chunk.
+
+    @cvar CHUNK_SIZE: The number of bytes that are read at a time from a
+    file that is not mapped into memory.
+    @type CHUNK_SIZE: Int
+    @cvar COUNT_SIZE: The number of bytes of the buffer that newlines are
+    counted in at a time, so that the data between matches is not copied
+    all at once.
+    @type COUNT_SIZE: Int
+    """
+    CHUNK_SIZE = 1048576
+    COUNT_SIZE = 1048576
+
+    def __countLines(buffer, start, end):
+        """
+        Returns the number of newlines in the buffer between the start and
+        the end.
+
+        @return: Returns the number of newlines in the buffer between the
+        start and the end.
+        @rtype: Int
+
+        @param buffer: The data that is searched.
+        @type buffer: String
+        @param start: The offset in the buffer to start counting at.
+        @type start: Long
+        @param end: The offset in the buffer to stop counting at.
+        @type end: Long
+        """
+        count = 0
+        while (start < end):
+            nextStart = min(start + FileSearch.COUNT_SIZE, end)
+            count += buffer[start:nextStart].count("\n")
+            start = nextStart
+        return count
+    __countLines = staticmethod(__countLines)
+
+    def searchBuffer(buffer, regex, pathToFile, lineNumber=1, offset=0, maxHits=None):
+        """
+        Returns a list of the matches of the regular expression in the
+        buffer. The line numbers and offsets of the matches are counted
+        from the line number and offset of the start of the buffer.
+
+        @return: Returns a list of the matches of the regular expression
+        in the buffer.
+        @rtype: Array
+
+        @param buffer: The data that is searched which can be a string or
+        a mmap object.
+        @type buffer: String
+        @param regex: The compiled regular expression.
+        @type regex: RegexObject
+        @param pathToFile: The path to the file, which is relative to the
+        root report directory.
+        @type pathToFile: String
+        @param lineNumber: The line number of the start of the buffer.
+        @type lineNumber: Int
+        @param offset: The offset in the file of the start of the buffer.
+        @type offset: Long
+        @param maxHits: The maximum number of matches that are returned.
+        None means that all the matches are returned.
+        @type maxHits: Int
+        """
+        listOfHits = []
+        if ((not maxHits == None) and (not maxHits > 0)):
+            return listOfHits
+        # The newlines are only counted between the matches so the whole
+        # buffer is not counted if the matches are at the start.
+        lastStart = 0
+        for match in regex.finditer(buffer):
+            start = match.start()
+            lineNumber += FileSearch.__countLines(buffer, lastStart, start)
+            lastStart = start
+            lineStart = buffer.rfind("\n", 0, start) + 1
+            lineEnd = buffer.find("\n", start)
+            if (lineEnd < 0):
+                lineEnd = len(buffer)
+            line = buffer[lineStart:lineEnd]
+            if (line.endswith("\r")):
+                line = line[:-1]
+            listOfHits.append(SearchHit(pathToFile, lineNumber, offset + start, line, match.group(0)))
+            if ((not maxHits == None) and (len(listOfHits) >= maxHits)):
+                break
+        return listOfHits
+    searchBuffer = staticmethod(searchBuffer)
+
+    def searchFile(pathToFile, regex, pathToFileInReport, maxHits=None):
+        """
+        Returns a list of the matches of the regular expression in the
+        file. An empty list is returned if the file cannot be read.
+
+        @return: Returns a list of the matches of the regular expression
+        in the file.
+        @rtype: Array
+
+        @param pathToFile: The full path to the file.
+        @type pathToFile: String
+        @param regex: The compiled regular expression.
+        @type regex: RegexObject
+        @param pathToFileInReport: The path to the file, which is relative
+        to the root report directory.
+        @type pathToFileInReport: String
+        @param maxHits: The maximum number of matches that are returned.
+        None means that all the matches are returned.
+        @type maxHits: Int
+        """
+        try:
+            if (not os.path.getsize(pathToFile) > 0):
+                # An empty file cannot be mapped into memory.
+                return []
+            fin = open(pathToFile, "rb")
+            try:
+                buffer = mmap.mmap(fin.fileno(), 0, access=mmap.ACCESS_READ)
+                try:
+                    return FileSearch.searchBuffer(buffer, regex, pathToFileInReport, maxHits=maxHits)
+                finally:
+                    buffer.close()
+            finally:
+                fin.close()
+        except (IOError, os.error, mmap.error, ValueError):
+            message = "An error occured searching the file: %s." %(pathToFile)
+            logging.getLogger(sx.MAIN_LOGGER_NAME).error(message)
+        return []
+    searchFile = staticmethod(searchFile)
+
+    def searchStream(fin, regex, pathToFileInReport, maxHits=None):
+        """
+        Returns a list of the matches of the regular expression in the
+        data that is read from the file object. The data is read a chunk
+        at a time and each chunk is only searched up to the last newline
+        in the chunk and the rest is searched with the next chunk, so a
+        match can span lines but not chunks. The offsets of the matches
+        are offsets in the data that is read, which is the decompressed
+        data for a compressed file.
+
+        @return: Returns a list of the matches of the regular expression
+        in the data.
+        @rtype: Array
+
+        @param fin: The file object that the data is read from.
+        @type fin: File
+        @param regex: The compiled regular expression.
+        @type regex: RegexObject
+        @param pathToFileInReport: The path to the file, which is relative
+        to the root report directory.
+        @type pathToFileInReport: String
+        @param maxHits: The maximum number of matches that are returned.
+        None means that all the matches are returned.
+        @type maxHits: Int
+        """
+        listOfHits = []
+        lineNumber = 1
+        offset = 0
+        pendingData = ""
+        while ((maxHits == None) or (len(listOfHits) < maxHits)):
+            try:
+                data = fin.read(FileSearch.CHUNK_SIZE)
+            except (IOError, os.error, EOFError, zlib.error):
+                message = "An error occured searching the file: %s." %(pathToFileInReport)
+                logging.getLogger(sx.MAIN_LOGGER_NAME).error(message)
+                break
+            if (not len(data) > 0):
+                data = pendingData
+                pendingData = ""
+                end = len(data)
+            else:
+                data = pendingData + data
+                end = data.rfind("\n") + 1
+                pendingData = data[end:]
+                data = data[:end]
+            if (not len(data) > 0):
+                if (not len(pendingData) > 0):
+                    break
+                continue
+            remainingHits = None
+            if (not maxHits == None):
+                remainingHits = maxHits - len(listOfHits)
+            listOfHits += FileSearch.searchBuffer(data, regex, pathToFileInReport, lineNumber, offset, remainingHits)
+            lineNumber += data.count("\n")
+            offset += len(data)
+        return listOfHits
+    searchStream = staticmethod(searchStream)
@@ -0,0 +1,336 @@
+#!/usr/bin/env python
+"""
+This is an index of the paths in an extracted report. The paths of a
+report are looked up many times by the plugins, so the directories of
+the report are only read once instead of each time a path is looked up.
+
+@author    :  Shane Bradley
+@contact   :  sbradley@redhat.com
+@version   :  2.17
+@copyright :  GPLv2
+"""
+import os
+import os.path
+import stat
+import fnmatch
+import logging
+
+import sx
+
+class PathIndex:
+    """
+    This class is an index of the files and directories in an extracted
+    report. The directories are walked the first time a path is looked up
+    and the type and size of each path is kept in memory. Symbolic links
+    are followed like os.path.exists() does, but directories that are
+    symbolic links are not walked so paths in them are looked up on the
+    file system.
+
+    If the root directory of the report does not exist then all the
+    paths are looked up on the file system.
+
+    @cvar MAX_NORMALIZED_PATHS: The maximum number of paths that are kept
+    in the map of the paths that were looked up to the normalized paths.
+    @type MAX_NORMALIZED_PATHS: Int
+    """
+    MAX_NORMALIZED_PATHS = 65536
+
+    def __init__(self, pathToRoot):
+        """
+        @param pathToRoot: The path to the root directory of the
+        extracted report.
+        @type pathToRoot: String
+        """
+        self.__pathToRoot = pathToRoot
+        # Map of the path relative to the root directory to a tuple of
+        # True if the path is a directory and the size of the file. None
+        # means the root directory has not been walked.
+        self.__pathsMap = None
+        # Map of the path to a directory relative to the root directory to
+        # a list of the names in the directory.
+        self.__childrenMap = {}
+        # The paths of the directories that are symbolic links.
+        self.__linkedDirsSet = set()
+        # Map of the paths that were looked up to the normalized path, since
+        # the same paths are looked up many times.
+        self.__normalizedPathsMap = {}
+
+    def __str__(self):
+        return self.__pathToRoot
+
+    def getPathToRoot(self):
+        return self.__pathToRoot
+
+    def setPathToRoot(self, pathToRoot):
+        """
+        Sets the path to the root directory after the extracted report was
+        moved. The paths in the index are relative to the root directory
+        so the index does not change.
+
+        @param pathToRoot: The path to the root directory of the
+        extracted report.
+        @type pathToRoot: String
+        """
+        self.__pathToRoot = pathToRoot
+        self.__normalizedPathsMap = {}
+
+    def __normalize(self, pathToFile):
+        """
+        Returns the path relative to the root directory without any extra
+        slashes. None is returned if the path is not in the root directory.
+
+        @return: Returns the path relative to the root directory.
+        @rtype: String
+
+        @param pathToFile: The path to the file, which is relative to the
+        root directory.
+        @type pathToFile: String
+        """
+        if (self.__normalizedPathsMap.has_key(pathToFile)):
+            return self.__normalizedPathsMap.get(pathToFile)
+        fullPathToFile = os.path.normpath(os.path.join(self.__pathToRoot, pathToFile.strip()))
+        pathToRoot = os.path.normpath(self.__pathToRoot).rstrip("/")
+        relativePath = None
+        if (fullPathToFile == os.path.normpath(self.__pathToRoot)):
+            relativePath = ""
+        elif (fullPathToFile.startswith("%s/" %(pathToRoot))):
+            relativePath = fullPathToFile[len(pathToRoot) + 1:]
+        if (len(self.__normalizedPathsMap) >= PathIndex.MAX_NORMALIZED_PATHS):
+            self.__normalizedPathsMap = {}
+        self.__normalizedPathsMap[pathToFile] = relativePath
+        return relativePath
+
+    def __scan(self, pathToDir):
+        """
+        Adds the files and directories in the directory to the index and
+        walks the sub directories. Directories that are symbolic links are
+        added but not walked.
+
+        @param pathToDir: The path to the directory, which is relative to
+        the root directory.
+        @type pathToDir: String
+        """
+        listOfDirs = [pathToDir]
+        while (len(listOfDirs) > 0):
+            pathToDir = listOfDirs.pop()
+            fullPathToDir = os.path.join(self.__pathToRoot, pathToDir)
+            try:
+                listOfNames = os.listdir(fullPathToDir)
+            except OSError:
+                message = "There was an error getting a directory list for the report: %s." %(fullPathToDir)
+                logging.getLogger(sx.MAIN_LOGGER_NAME).debug(message)
+                listOfNames = []
+            self.__childrenMap[pathToDir] = listOfNames
+            for name in listOfNames:
+                pathToFile = os.path.join(pathToDir, name)
+                try:
+                    fileStat = os.lstat(os.path.join(self.__pathToRoot, pathToFile))
+                    isLink = stat.S_ISLNK(fileStat.st_mode)
+                    if (isLink):
+                        fileStat = os.stat(os.path.join(self.__pathToRoot, pathToFile))
+                except OSError:
+                    # A symbolic link that points at nothing does not exist.
+                    continue
+                isDir = stat.S_ISDIR(fileStat.st_mode)
+                self.__pathsMap[pathToFile] = (isDir, fileStat.st_size)
+                if ((isDir) and (isLink)):
+                    self.__linkedDirsSet.add(pathToFile)
+                elif (isDir):
+                    listOfDirs.append(pathToFile)
+
+    def __getPathsMap(self):
+        """
+        Returns the map of the paths in the index. The root directory is
+        walked if it has not been walked. None is returned if the root
+        directory does not exist.
+
+        @return: Returns the map of the paths in the index.
+        @rtype: Dictionary
+        """
+        if (self.__pathsMap == None):
+            try:
+                rootStat = os.stat(self.__pathToRoot)
+            except OSError:
+                return None
+            if (not stat.S_ISDIR(rootStat.st_mode)):
+                return None
+            self.__pathsMap = {"":(True, rootStat.st_size)}
+            self.__childrenMap = {}
+            self.__linkedDirsSet = set()
+            self.__scan("")
+        return self.__pathsMap
+
+    def __isInLinkedDir(self, pathToFile):
+        """
+        Returns True if the path is in a directory that is a symbolic link
+        and was not walked.
+
+        @return: Returns True if the path is in a directory that is a
+        symbolic link.
+        @rtype: Boolean
+
+        @param pathToFile: The normalized path to the file.
+        @type pathToFile: String
+        """
+        if (not len(self.__linkedDirsSet) > 0):
+            return False
+        head = os.path.dirname(pathToFile)
+        while (len(head) > 0):
+            if (head in self.__linkedDirsSet):
+                return True
+            head = os.path.dirname(head)
+        return False
+
+    def __lookup(self, pathToFile):
+        """
+        Returns a tuple of True if the path is a directory and the size of
+        the file. None is returned if the path does not exist.
+
+        @return: Returns a tuple of True if the path is a directory and the
+        size of the file.
+        @rtype: Tuple
+
+        @param pathToFile: The path to the file, which is relative to the
+        root directory.
+        @type pathToFile: String
+        """
+        relativePath = self.__normalize(pathToFile)
+        pathsMap = self.__getPathsMap()
+        if ((relativePath == None) or (pathsMap == None) or (self.__isInLinkedDir(relativePath))):
+            try:
+                fileStat = os.stat(os.path.join(self.__pathToRoot, pathToFile.strip()))
+            except OSError:
+                return None
+            return (stat.S_ISDIR(fileStat.st_mode), fileStat.st_size)
+        fileTuple = pathsMap.get(relativePath)
+        if ((not fileTuple == None) and (pathToFile.strip().endswith("/")) and (not fileTuple[0])):
+            # A path that ends with a slash has to be a directory.
+            return None
+        return fileTuple
+
+    def exists(self, pathToFile):
+        return (not self.__lookup(pathToFile) == None)
+
+    def isDir(self, pathToFile):
+        fileTuple = self.__lookup(pathToFile)
+        return ((not fileTuple == None) and (fileTuple[0]))
+
+    def isFile(self, pathToFile):
+        fileTuple = self.__lookup(pathToFile)
+        return ((not fileTuple == None) and (not fileTuple[0]))
+
+    def getSize(self, pathToFile):
+        """
+        Returns the size of the file in bytes. -1 is returned if the path
+        does not exist.
+
+        @return: Returns the size of the file in bytes.
+        @rtype: Long
+
+        @param pathToFile: The path to the file, which is relative to the
+        root directory.
+        @type pathToFile: String
+        """
+        fileTuple = self.__lookup(pathToFile)
+        if (fileTuple == None):
+            return -1
+        return fileTuple[1]
+
+    def listDir(self, pathToDir):
+        """
+        Returns a list of the names in the directory like os.listdir(). An
+        empty list is returned if the path is not a directory.
+
+        @return: Returns a list of the names in the directory.
+        @rtype: Array
+
+        @param pathToDir: The path to the directory, which is relative to
+        the root directory.
+        @type pathToDir: String
+        """
+        relativePath = self.__normalize(pathToDir)
+        pathsMap = self.__getPathsMap()
+        if ((relativePath == None) or (pathsMap == None) or (relativePath in self.__linkedDirsSet) or
+            (self.__isInLinkedDir(relativePath))):
+            try:
+                return os.listdir(os.path.join(self.__pathToRoot, pathToDir.strip()))
+            except OSError:
+                return []
+        return list(self.__childrenMap.get(relativePath, []))
+
+    def glob(self, pathGlob):
+        """
+        Returns a sorted list of the paths to the files that match the
+        path glob with fnmatch. Directories are not returned and the files
+        in directories that are symbolic links are not matched.
+
+        @return: Returns a sorted list of the paths to the files that
+        match the path glob.
+        @rtype: Array
+
+        @param pathGlob: The path glob, which is relative to the root
+        directory.
+        @type pathGlob: String
+        """
+        pathsMap = self.__getPathsMap()
+        if (pathsMap == None):
+            return []
+        pathGlob = pathGlob.strip().strip("/")
+        listOfPaths = []
+        for (pathToFile, fileTuple) in pathsMap.items():
+            if ((not fileTuple[0]) and (fnmatch.fnmatch(pathToFile, pathGlob))):
+                listOfPaths.append(pathToFile)
+        listOfPaths.sort()
+        return listOfPaths
+
+    def update(self, pathToFile):
+        """
+        Reads the path from the file system again after the path was
+        written, so that files that were extracted after the report was
+        extracted are in the index. Nothing is done if the root directory
+        has not been walked.
+
+        @param pathToFile: The path to the file or directory, which is
+        relative to the root directory.
+        @type pathToFile: String
+        """
+        relativePath = self.__normalize(pathToFile)
+        if ((self.__pathsMap == None) or (relativePath == None) or (not len(relativePath) > 0)):
+            return
+        # The paths that were in the directory are removed before the
+        # directory is walked again.
+        prefix = "%s/" %(relativePath)
+        for path in self.__pathsMap.keys():
+            if ((path == relativePath) or (path.startswith(prefix))):
+                del self.__pathsMap[path]
+                self.__linkedDirsSet.discard(path)
+                if (self.__childrenMap.has_key(path)):
+                    del self.__childrenMap[path]
+        # The parent directories are added if they were created.
+        head = os.path.dirname(relativePath)
+        listOfDirs = []
+        while ((len(head) > 0) and (not self.__pathsMap.has_key(head))):
+            listOfDirs.insert(0, head)
+            head = os.path.dirname(head)
+        for path in listOfDirs + [relativePath]:
+            (parent, name) = os.path.split(path)
+            if (parent in self.__linkedDirsSet):
+                return
+            if (not name in self.__childrenMap.setdefault(parent, [])):
+                self.__childrenMap[parent].append(name)
+            try:
+                fileStat = os.lstat(os.path.join(self.__pathToRoot, path))
+                isLink = stat.S_ISLNK(fileStat.st_mode)
+                if (isLink):
+                    fileStat = os.stat(os.path.join(self.__pathToRoot, path))
+            except OSError:
+                self.__childrenMap[parent].remove(name)
+                return
+            isDir = stat.S_ISDIR(fileStat.st_mode)
+            self.__pathsMap[path] = (isDir, fileStat.st_size)
+            if ((isDir) and (isLink)):
+                self.__linkedDirsSet.add(path)
+            elif ((isDir) and (path == relativePath)):
+                self.__scan(path)
+            elif (isDir):
+                self.__childrenMap.setdefault(path, [])
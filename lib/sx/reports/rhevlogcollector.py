@@ -48,6 +48,12 @@ class Rhevlogcollector(Report) :
     def getHostname(self):
         return self.__hostname
 
+    def getManifestAttributes(self):
+        return {"hostname":self.__hostname}
+
+    def setManifestAttributes(self, attributesMap):
+        self.__hostname = attributesMap.get("hostname", self.__hostname)
+
     def extract(self, extractor, extractDir):
         """
         This function will extract the report to the extract
@@ -12,6 +12,7 @@ This file contains the container for sosreport report object.
 """
 import string
 import os.path
+import shutil
 import logging
 import re
 
@@ -36,6 +37,57 @@ class Sosreport(sx.reports.Report) :
                                    Sosreport.REPORT_NAME,
                                    "A container for sosreport files", stripDirectoriesDepth=1)
         self.__hostname = ""
+        # The uname and date that were read from the manifest of the
+        # report. None means that they are read from the report.
+        self.__uname = None
+        self.__date = None
+
+    def getManifestAttributes(self):
+        """
+        Returns a map of the hostname, uname and date of the report that
+        are written to the manifest of the report.
+
+        @return: Returns a map of the attributes of the report that are
+        written to the manifest.
+        @rtype: Dictionary
+        """
+        return {"hostname":self.getHostname(), "uname":self.getUname(), "date":self.getDate()}
+
+    def setManifestAttributes(self, attributesMap):
+        """
+        Sets the hostname, uname and date of the report that were read
+        from the manifest of the report.
+
+        @param attributesMap: A map of the attributes of the report.
+        @type attributesMap: Dictionary
+        """
+        self.__hostname = attributesMap.get("hostname", "")
+        self.__uname = attributesMap.get("uname")
+        self.__date = attributesMap.get("date")
+
+    def getPathGlobs(self):
+        """
+        Returns a list of path globs for the files that the functions of
+        this report read.
+
+        @return: Returns a list of path globs for the files that the
+        functions of this report read.
+        @rtype: Array
+        """
+        return [Sosreport.TYPE_DETECTION_FILE, "sos_commands/kernel/uname_-a", "sos_commands/general/*",
+                "date", "uptime", "etc/redhat-release", "sos_commands/rpm/*", "installed-rpms"]
+
+    def getExcludePathGlobs(self):
+        """
+        Returns a list of path globs for the process accounting files and
+        core files that are not extracted by default.
+
+        @return: Returns a list of path globs for the files that are not
+        extracted by default.
+        @rtype: Array
+        """
+        return ["var/account/pacct*", "var/crash/*", "var/spool/abrt/*",
+                "var/lib/systemd/coredump/*", "*/core.[0-9]*"]
 
     def getUname(self) :
         """
@@ -44,6 +96,8 @@ class Sosreport(sx.reports.Report) :
         @return: Returns a string of the "uname -a" data.
         @rtype String
         """
+        if (not self.__uname == None):
+            return self.__uname
         unameAData = self.getDataFromFile("sos_commands/kernel/uname_-a")
         if (not unameAData == None) :
             if (len(unameAData) > 0):
@@ -59,6 +113,8 @@ class Sosreport(sx.reports.Report) :
         the report was generated.
         @rtype: String
         """
+        if (not self.__date == None):
+            return self.__date
         dateData = self.getDataFromFile("sos_commands/general/date")
         if (dateData == None):
             dateData = self.getDataFromFile("date")
@@ -173,22 +229,60 @@ class Sosreport(sx.reports.Report) :
         @param extractDir: The full path to directory for extraction.
         @type extractDir: String
         """
-        fileContents = extractor.getDataFromFile("/sos_commands/kernel/uname_-a")
-        if (len(fileContents) > 0):
-            self.__hostname = string.strip(string.split(fileContents[0])[1])
-        else:
-            fileContents = extractor.getDataFromFile("sos_commands/general/hostname")
-            if (len(fileContents) > 0):
-                self.__hostname = string.strip(fileContents[0])
-            else:
-                self.__hostname = "unknown_hostname"
-        # Now call the parent function to finish the extraction
-        sx.reports.Report.extract(self, extractor, os.path.join(extractDir, self.__hostname))
+        # The report is extracted to a temporary directory first so that
+        # the tarball is only read once. Then the hostname is read from
+        # the extracted files and the directory is renamed to the hostname.
+        (head, tail) = os.path.split(extractor.getPathToFile())
+        pathToPreviousReport = self.getPathToExtractedReport()
+        isMoved = False
+        try:
+            sx.reports.Report.extract(self, extractor, os.path.join(extractDir, ".extracting-%s" %(tail)))
+            if (not self.getPathToExtractedReport() == pathToPreviousReport):
+                self.__hostname = self.getHostname()
+                isMoved = self.moveExtractedReport(os.path.join(extractDir, self.__hostname))
+        except:
+            self.__restoreTmpExtractedReport(extractDir, pathToPreviousReport, tail)
+            raise
+        if ((not isMoved) and (not self.__restoreTmpExtractedReport(extractDir, pathToPreviousReport, tail))):
+            return False
         if (os.path.exists(os.path.join(self.getPathToExtractedReport(),
                                         Sosreport.TYPE_DETECTION_FILE))):
             return True
         return False
 
+    def __restoreTmpExtractedReport(self, extractDir, pathToPreviousReport, filename):
+        """
+        Renames the temporary directory that the report was extracted to
+        after the extraction or the rename to the hostname failed. The
+        directory is renamed to the name of the report file so that it is
+        not hidden from later runs. If the directory cannot be renamed
+        then it is removed. Returns True if the directory was renamed.
+
+        @return: Returns True if the temporary directory was renamed.
+        @rtype: Boolean
+
+        @param extractDir: The full path to directory for extraction.
+        @type extractDir: String
+        @param pathToPreviousReport: The path to the extracted report
+        before the report was extracted.
+        @type pathToPreviousReport: String
+        @param filename: The name of the report file.
+        @type filename: String
+        """
+        pathToTmpExtractedReport = self.getPathToExtractedReport()
+        if ((pathToTmpExtractedReport == pathToPreviousReport) or
+            (not os.path.basename(pathToTmpExtractedReport).startswith(".extracting-")) or
+            (not os.path.isdir(pathToTmpExtractedReport))):
+            return False
+        if (self.moveExtractedReport(os.path.join(extractDir, filename))):
+            message = "The extracted report could not be renamed to the hostname so it was renamed to: %s." %(self.getPathToExtractedReport())
+            logging.getLogger(sx.MAIN_LOGGER_NAME).warning(message)
+            return True
+        message = "The temporary directory for the report that could not be extracted will be removed: %s." %(pathToTmpExtractedReport)
+        logging.getLogger(sx.MAIN_LOGGER_NAME).error(message)
+        shutil.rmtree(pathToTmpExtractedReport, ignore_errors=True)
+        return False
+
 
 
 
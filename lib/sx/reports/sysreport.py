@@ -35,6 +35,33 @@ class Sysreport(sx.reports.Report) :
                                    Sysreport.REPORT_NAME,
                                    "A container for sysreport files")
         self.__hostname = ""
+        # The uname and date that were read from the manifest of the
+        # report. None means that they are read from the report.
+        self.__uname = None
+        self.__date = None
+
+    def getManifestAttributes(self):
+        """
+        Returns a map of the hostname, uname and date of the report that
+        are written to the manifest of the report.
+
+        @return: Returns a map of the attributes of the report that are
+        written to the manifest.
+        @rtype: Dictionary
+        """
+        return {"hostname":self.getHostname(), "uname":self.getUname(), "date":self.getDate()}
+
+    def setManifestAttributes(self, attributesMap):
+        """
+        Sets the hostname, uname and date of the report that were read
+        from the manifest of the report.
+
+        @param attributesMap: A map of the attributes of the report.
+        @type attributesMap: Dictionary
+        """
+        self.__hostname = attributesMap.get("hostname", "")
+        self.__uname = attributesMap.get("uname")
+        self.__date = attributesMap.get("date")
 
     # ##########################################################################
     # Helper functions
@@ -49,6 +76,8 @@ class Sysreport(sx.reports.Report) :
         the report was generated.
         @rtype: String
         """
+        if (not self.__date == None):
+            return self.__date
         dateData = self.getDataFromFile("date")
         # Return empty string if data object was not found.
         date = ""
@@ -64,6 +93,8 @@ class Sysreport(sx.reports.Report) :
         @return: Returns a string of the "uname -a" data.
         @rtype String
         """
+        if (not self.__uname == None):
+            return self.__uname
         unameData = self.getDataFromFile("uname")
         if (not unameData == None) :
             if (len(unameData) > 1):
@@ -14,12 +14,15 @@ import sys
 import string
 import os
 import os.path
-import shutil
 import logging
+import multiprocessing
+import itertools
+import json
 
 import sx
 from sx.logwriter import LogWriter
-from sx.tools import FileUtil
+from sx.tools import FileTransfer
+from sx.tools import TrashCan
 from sx import SXConfigurationFiles
 
 from sx import ArchiveLayout
@@ -27,8 +30,15 @@ from sx import ArchivedLayout
 from sx import ModifiedArchiveLayout
 from sx import ModifiedArchivedLayout
 from sx.extractors import Extractor
+from sx.extractors.lib.memberindex import MemberIndexCache
+from sx.extractors.lib.exclusionpolicy import ExclusionPolicy
+from sx.extractors.lib.contentstore import ContentStore
+from sx.extractors.lib.fingerprintindex import FingerprintIndex
+from sx.extractors.lib.decompressor import DecompressorsHelper
 from sx.reports import Report
+from sx.reports.lib.contentcache import ContentCache
 from sx.plugins import PluginsHelper
+from sx.plugins import PluginsPipeline
 from sx.modulesloader import ReportsLoader
 from sx.modulesloader import ExtractorsLoader
 
@@ -36,7 +46,45 @@ from sx.analysisreport import AnalysisReport
 from sx.analysisreport import ARSection
 from sx.analysisreport import ARSectionItem
 
+def extractReport(reportExtractionItem):
+    """
+    This function will extract a report in a process of the process
+    pool that is used when more than 1 job is enabled. The function has
+    to be a module function so that it can be called by the process
+    pool.
+
+    @return: Returns a tuple of the index of the report, the report
+    object which now has the path to the extracted report and True if
+    the report was extracted.
+    @rtype: Tuple
+
+    @param reportExtractionItem: A tuple of the index of the report, the
+    report object, the extractor object and the path to the directory
+    the report will be extracted to.
+    @type reportExtractionItem: Tuple
+    """
+    (index, report, extractor, pathToExtractedReports) = reportExtractionItem
+    try:
+        result = report.extract(extractor, pathToExtractedReports)
+        if (result):
+            # The manifest is written while the other reports are extracted
+            # so that the report can be loaded again without searching it.
+            report.writeManifest()
+        return (index, report, result)
+    except Exception, e:
+        message = "There was an error extracting the report: %s: %s" %(extractor.getPathToFile(), str(e))
+        logging.getLogger(sx.MAIN_LOGGER_NAME).error(message)
+    return (index, report, False)
+
 class SXConsole:
+    """
+    @cvar NESTED_REPORTS_FILENAME: The name of the file in the
+    extracted reports directory that maps the name of each report that
+    was in another report to the name of the report it was in.
+    @type NESTED_REPORTS_FILENAME: String
+    """
+    NESTED_REPORTS_FILENAME = ".sx_nested_reports.json"
+
     def __init__(self, optionsMap, uid):
         self.__optionsMap = optionsMap
         self.__uid = uid
@@ -71,7 +119,20 @@ class SXConsole:
             message = "There was an error creating the user configuration directory. sxconsole will proceed without it."
             logging.getLogger(sx.MAIN_LOGGER_NAME).warning(message)
 
+        # The index of the files in each report file is always cached for
+        # the run, but is only written to disk if enabled.
+        MemberIndexCache.setDiskCacheEnabled(self.__optionsMap.get("enableIndexCache"))
+        # The files that are read from the reports are kept in memory up to
+        # the size of the content cache.
+        ContentCache.setMaxSize(max(self.__optionsMap.get("contentCacheSize", ContentCache.MAX_SIZE / 1048576), 0) * 1048576)
+        # Find the decompressors that are installed before any report is
+        # extracted so they are only checked once.
+        DecompressorsHelper.probe()
+
         self.__al = None
+        # The pipeline that the reports are added to as they are extracted
+        # if the setup of the plugins is pipelined.
+        self.__pluginsPipeline = None
         # Archive Layout
         if (self.__validateOptions(self.getUID(), self.__optionsMap.get("pathToExtractedReports"))):
             try:
@@ -196,6 +257,23 @@ class SXConsole:
                     pluginOptionsMap[pluginName] = {pluginOptionName:pluginOptionValue}
         return pluginOptionsMap
 
+    def __getExclusionPolicy(self):
+        """
+        Returns a new policy for the files that will not be extracted
+        from a report which is created from the command line options. A
+        new policy is needed for each report since the size of the files
+        extracted from the report is counted.
+
+        @return: Returns a new policy for the files that will not be
+        extracted from a report.
+        @rtype: ExclusionPolicy
+        """
+        megabyte = 1024 * 1024
+        return ExclusionPolicy(self.__optionsMap.get("excludePathGlobs", []),
+                               max(self.__optionsMap.get("maxFileSize", 0), 0) * megabyte,
+                               max(self.__optionsMap.get("maxReportSize", 0), 0) * megabyte,
+                               (not self.__optionsMap.get("disableDefaultExcludes", False)))
+
     def __initializeDirStructure(self, pathToCompressedReports, pathToExtractedReports):
         """
         Returns True if the directories created exists.
@@ -220,7 +298,7 @@ class SXConsole:
         return True
 
     def __extractReports(self, al, pathToExtractedReports, listOfReports,
-                         pathToReportsDirectory, includeUserDefinedModules) :
+                         pathToReportsDirectory, includeUserDefinedModules, listOfPathGlobs=None) :
 
         # Create the reporter object based on layout of the paths
         if (al == None):
@@ -246,6 +324,12 @@ class SXConsole:
             message = "The list of reports are being analyzed to verify that they are known report types."
             logging.getLogger(sx.MAIN_LOGGER_NAME).status(message)
             listOfReports = self.__getListOfReports(listOfReports, pathToReportsDirectory)
+            if (self.__optionsMap.get("triage")):
+                reportsOpened = self.__open(listOfReports, al.getPathToCompressedReports(),
+                                            al.getPathToExtractedReports(), includeUserDefinedModules)
+                message = "There was %d reports opened without being extracted." %(len(reportsOpened))
+                logging.getLogger(sx.MAIN_LOGGER_NAME).info(message)
+                return reportsOpened
             message = "The reports will be extracted to the following directory: %s" %(al.getPathToExtractedReports())
             logging.getLogger(sx.MAIN_LOGGER_NAME).info(message)
             message = "Extracting %d reports."%(len(listOfReports))
@@ -253,13 +337,14 @@ class SXConsole:
             message = "This process could take a while on large reports."
             logging.getLogger(sx.MAIN_LOGGER_NAME).info(message)
             reportsExtracted = self.__extract(listOfReports, al.getPathToCompressedReports(),
-                                              al.getPathToExtractedReports(), includeUserDefinedModules)
+                                              al.getPathToExtractedReports(), includeUserDefinedModules,
+                                              listOfPathGlobs)
             message = "There was %d reports extracted to the directory: %s" %(len(reportsExtracted), al.getPathToExtractedReports())
             logging.getLogger(sx.MAIN_LOGGER_NAME).info(message)
         return reportsExtracted
 
     def __extract(self, listOfUnextractedReports, pathToCompressedReports,
-                  pathToExtractedReports, includeUserDefinedModules) :
+                  pathToExtractedReports, includeUserDefinedModules, listOfPathGlobs=None) :
         """
         This function will extract all the reports in the array if
         they are a known type. It will return a list of report objects.
@@ -280,6 +365,10 @@ class SXConsole:
         @param includeUserDefinedModules: If True then user defined
         reports/plugins are enabled.
         @type includeUserDefinedModules: Boolean
+        @param listOfPathGlobs: If not None then only the files that
+        match the path globs are extracted from the reports. The other
+        files are extracted when they are read.
+        @type listOfPathGlobs: Array
         """
         # Zero out the list because this is new load of reports
         listOfReports = []
@@ -290,48 +379,373 @@ class SXConsole:
         extractorsLoader = ExtractorsLoader()
         reportsLoader = ReportsLoader()
 
-        for pathToFilename in listOfUnextractedReports:
+        # Find the report type of each file before any file is extracted.
+        # The reports that are in a report are written out of the report
+        # file and added to the list so that all the reports are extracted
+        # at the same time.
+        listOfReportExtractionItems = []
+        # Map of the index of a report that was in a report to the index of
+        # the report it was in.
+        parentIndexesMap = {}
+        # The indexes of the reports that contain reports that could not be
+        # written out of the report file.
+        listOfUnwrittenIndexes = []
+        # A report file that has the same fingerprint as a report that was
+        # extracted before is linked to that report instead of extracted.
+        fingerprintIndex = None
+        if (not self.__optionsMap.get("forceExtraction")):
+            fingerprintIndex = FingerprintIndex(self.__al.getPathToFingerprintIndex())
+        verifyChecksum = self.__optionsMap.get("verifyChecksum", False)
+        # Map of the index of a report to the fingerprint of the report file.
+        fingerprintsMap = {}
+        # Map of the index of a report to the path of the report that was
+        # extracted before from a file with the same fingerprint.
+        linkedReportsMap = {}
+        listOfUnextractedReports = map(lambda pathToFilename: (pathToFilename, -1), listOfUnextractedReports)
+        while (len(listOfUnextractedReports) > 0):
+            (pathToFilename, parentIndex) = listOfUnextractedReports.pop(0)
             report = reportsLoader.getReport(pathToFilename, includeUserDefinedModules)
             if (not report == None):
                 # The reason I have to find extractor again is because I moved
                 # the file from orginal location so I dont want an extractor in
                 # object if the file it extracts no longer exists.
                 extractor = extractorsLoader.getExtractor(pathToFilename, includeUserDefinedModules)
-                if (report.extract(extractor, pathToExtractedReports)):
+                if (not listOfPathGlobs == None):
+                    extractor.setIncludePathGlobs(listOfPathGlobs)
+                extractor.setExclusionPolicy(self.__getExclusionPolicy())
+                if (self.__optionsMap.get("dedup")):
+                    extractor.setContentStore(ContentStore(self.__al.getPathToContentStore()))
+                index = len(listOfReportExtractionItems)
+                if (parentIndex >= 0):
+                    parentIndexesMap[index] = parentIndex
+                listOfReportExtractionItems.append((index, report, extractor, pathToExtractedReports))
+                if (not fingerprintIndex == None):
+                    fingerprintsMap[index] = FingerprintIndex.getFingerprint(pathToFilename)
+                    pathToExistingReport = fingerprintIndex.find(fingerprintsMap.get(index), report.getName(),
+                                                                 pathToFilename, verifyChecksum)
+                    if (len(pathToExistingReport) > 0):
+                        linkedReportsMap[index] = pathToExistingReport
+                if (report.includesOtherReports()):
+                    listOfNestedReports = self.__writeNestedReports(report, extractor, pathToCompressedReports,
+                                                                    includeUserDefinedModules)
+                    if (listOfNestedReports == None):
+                        # The reports in the report will be found after the
+                        # report is extracted.
+                        listOfUnwrittenIndexes.append(index)
+                    else:
+                        listOfUnextractedReports += map(lambda pathToNestedReport: (pathToNestedReport, index), listOfNestedReports)
+
+        # The reports that were extracted before are linked first. A report
+        # is extracted if it cannot be linked.
+        listOfLinkedResults = []
+        indexes = linkedReportsMap.keys()
+        indexes.sort()
+        for index in indexes:
+            report = listOfReportExtractionItems[index][1]
+            pathToExistingReport = linkedReportsMap.get(index)
+            if (report.link(pathToExistingReport, pathToExtractedReports)):
+                message = "The %s was extracted before and is linked to the extracted report: %s" %(report.getName(), pathToExistingReport)
+                logging.getLogger(sx.MAIN_LOGGER_NAME).status(message)
+                listOfLinkedResults.append((index, report, True))
+            else:
+                del linkedReportsMap[index]
+        listOfUnlinkedItems = filter(lambda item: not linkedReportsMap.has_key(item[0]), listOfReportExtractionItems)
+        # The report files are moved to the compressed reports directory
+        # while they are extracted, so that if the data has to be copied to
+        # another file system it is copied at the same time.
+        transfersMap = {}
+        for (index, report, extractor, pathToExtractDir) in listOfReportExtractionItems:
+            pathToFilename = extractor.getPathToFile()
+            fileTransfer = FileTransfer(pathToFilename, os.path.join(pathToCompressedReports, os.path.basename(pathToFilename)))
+            if (fileTransfer.start()):
+                transfersMap[index] = fileTransfer
+        # The results are in the order that the reports finish extracting so
+        # that each report is moved as soon as it is extracted.
+        jobs = min(self.__optionsMap.get("jobs", 1), len(listOfUnlinkedItems))
+        pool = None
+        if (jobs > 1):
+            message = "The reports will be extracted with %d jobs." %(jobs)
+            logging.getLogger(sx.MAIN_LOGGER_NAME).info(message)
+            # The processes are not forked while the plugins pipeline is
+            # running the setup since the thread could be holding a lock.
+            if (not self.__pluginsPipeline == None):
+                self.__pluginsPipeline.wait()
+            pool = multiprocessing.Pool(jobs)
+            resultsIterator = pool.imap_unordered(extractReport, listOfUnlinkedItems)
+        else:
+            resultsIterator = itertools.imap(extractReport, listOfUnlinkedItems)
+        mapOfExtractedReports = {}
+        # The reports are added to the plugins pipeline in the order they
+        # were given, so the plugins are setup on the reports in the same
+        # order as when the pipeline is not used.
+        setOfFinishedIndexes = set()
+        nextPipelineIndex = 0
+        try:
+            for i in range(0, len(listOfReportExtractionItems)):
+                if (i < len(listOfLinkedResults)):
+                    (index, report, result) = listOfLinkedResults[i]
+                elif (pool == None):
+                    (index, report, result) = resultsIterator.next()
+                else:
+                    # A timeout is required so that control-c is not ignored
+                    # while waiting on the results.
+                    (index, report, result) = resultsIterator.next(sys.maxint)
+                pathToFilename = listOfReportExtractionItems[index][2].getPathToFile()
+                if (result):
+                    message = "Extracted %d of %d reports: %s" %(i + 1, len(listOfReportExtractionItems), pathToFilename)
+                    if (linkedReportsMap.has_key(index)):
+                        message = "Linked %d of %d reports: %s" %(i + 1, len(listOfReportExtractionItems), pathToFilename)
+                    logging.getLogger(sx.MAIN_LOGGER_NAME).status(message)
                     # Add the report to the list of valid reports that were found.
-                    listOfReports.append(report)
-                    # Move the file if it was extracted correctly.
+                    mapOfExtractedReports[index] = report
+                    # Move the file if it was extracted correctly. An
+                    # existing file is not overwritten.
                     pathToNewFilename = os.path.join(pathToCompressedReports, os.path.basename(pathToFilename))
-                    if (not self.__moveReport(pathToFilename, pathToNewFilename)):
+                    isMoved = os.path.isfile(pathToNewFilename)
+                    if (transfersMap.has_key(index)):
+                        isMoved = transfersMap.pop(index).finish()
+                    if (not isMoved):
                         message = "There was an error moving the file: %s\n\t  to %s." %(pathToFilename, pathToNewFilename)
                         logging.getLogger(sx.MAIN_LOGGER_NAME).error(message)
-                        # If the report contains or could contain other known
-                        # report types then we will see if any of the files
-                        # within that report can be added to the list of reports
-                        # that need to be extracted.
-                    if (report.includesOtherReports()):
-                        pathToExtractedReport = report.getPathToExtractedReport()
-                        # List of full path to files within the report that was
-                        # extracted. Just top dir for now, will not goto deep it
-                        # for now. I also moving these out which might be
-                        # desired.
-                        listOfFilesInExtractedReports = []
-                        for currentFilename in os.listdir(pathToExtractedReport):
-                            listOfFilesInExtractedReports.append(os.path.join(pathToExtractedReport, currentFilename))
-                        if (len(listOfFilesInExtractedReports) > 0):
-                            message =  "The %s report contains %d files and the %s report will be analyzed " %(report.getName(),
-                                                                                                               len(listOfUnextractedReports),
-                                                                                                               report.getName())
-                            message += "to see if contain any other known report types."
-                            logging.getLogger(sx.MAIN_LOGGER_NAME).status(message)
-                            # Now do a little recursion
-                            reportsWithinReportList += self.__extract(listOfFilesInExtractedReports, pathToCompressedReports,
-                                                                      pathToExtractedReports, includeUserDefinedModules)
+                    elif (not report.getExtractor() == None):
+                        # The files that were not extracted are read from
+                        # the file at its new location.
+                        report.getExtractor().setPathToFile(pathToNewFilename)
+                        # Only the reports that have all their files
+                        # extracted are linked to by later runs.
+                        if ((not fingerprintIndex == None) and (report.getExtractor().getIncludePathGlobs() == None)):
+                            checksum = ""
+                            if (verifyChecksum):
+                                checksum = FingerprintIndex.getChecksum(pathToNewFilename)
+                            fingerprintIndex.add(fingerprintsMap.get(index), report.getName(),
+                                                 report.getPathToExtractedReport(), pathToNewFilename, checksum)
                 else:
-                    message = "There was an error extracting the report: %s." %(str(extractor))
+                    message = "There was an error extracting the report: %s." %(str(listOfReportExtractionItems[index][2]))
                     logging.getLogger(sx.MAIN_LOGGER_NAME).error(message)
+                    if (transfersMap.has_key(index)):
+                        transfersMap.pop(index).cancel()
+                if (not self.__pluginsPipeline == None):
+                    setOfFinishedIndexes.add(index)
+                    while (nextPipelineIndex in setOfFinishedIndexes):
+                        if (mapOfExtractedReports.has_key(nextPipelineIndex)):
+                            self.__pluginsPipeline.add(mapOfExtractedReports.get(nextPipelineIndex))
+                        nextPipelineIndex += 1
+        finally:
+            if (not pool == None):
+                pool.terminate()
+                pool.join()
+            # The files of the reports that were not extracted are left
+            # where they are.
+            for fileTransfer in transfersMap.values():
+                fileTransfer.cancel()
+            if (not fingerprintIndex == None):
+                fingerprintIndex.write()
+
+        # Keep the reports in the order they were given.
+        indexes = mapOfExtractedReports.keys()
+        indexes.sort()
+        for index in indexes:
+            report = mapOfExtractedReports.get(index)
+            listOfReports.append(report)
+            if (mapOfExtractedReports.has_key(parentIndexesMap.get(index))):
+                report.setParentReport(mapOfExtractedReports.get(parentIndexesMap.get(index)))
+            # If the report contains or could contain other known
+            # report types and they could not be written out of the
+            # report file then we will see if any of the files within
+            # that report can be added to the list of reports that need
+            # to be extracted.
+            if ((report.includesOtherReports()) and (index in listOfUnwrittenIndexes)):
+                pathToExtractedReport = report.getPathToExtractedReport()
+                # List of full path to files within the report that was
+                # extracted. Just top dir for now, will not goto deep it
+                # for now. I also moving these out which might be
+                # desired.
+                listOfFilesInExtractedReports = []
+                for currentFilename in os.listdir(pathToExtractedReport):
+                    listOfFilesInExtractedReports.append(os.path.join(pathToExtractedReport, currentFilename))
+                if (len(listOfFilesInExtractedReports) > 0):
+                    message =  "The %s report contains %d files and the %s report will be analyzed " %(report.getName(),
+                                                                                                       len(listOfUnextractedReports),
+                                                                                                       report.getName())
+                    message += "to see if contain any other known report types."
+                    logging.getLogger(sx.MAIN_LOGGER_NAME).status(message)
+                    # Now do a little recursion
+                    listOfChildReports = self.__extract(listOfFilesInExtractedReports, pathToCompressedReports,
+                                                        pathToExtractedReports, includeUserDefinedModules,
+                                                        listOfPathGlobs)
+                    for childReport in listOfChildReports:
+                        if (childReport.getParentReport() == None):
+                            childReport.setParentReport(report)
+                    reportsWithinReportList += listOfChildReports
         # Add reports extracted that were in other reports
         listOfReports += reportsWithinReportList
+        self.__writeNestedReportsMap(pathToExtractedReports, listOfReports)
+        return listOfReports
+
+    def __writeNestedReports(self, report, extractor, pathToCompressedReports, includeUserDefinedModules):
+        """
+        Writes the files in a report that are other reports to the
+        compressed reports directory without extracting the report. The
+        data is streamed out of the report file so the files are only
+        written once. The files that are reports are not extracted with
+        the report. None is returned if the extractor cannot write a
+        file without extracting the report.
+
+        @return: Returns the list of paths to the reports that were
+        written.
+        @rtype: Array
+
+        @param report: The report that contains other reports.
+        @type report: Report
+        @param extractor: The extractor for the report file.
+        @type extractor: Extractor
+        @param pathToCompressedReports: The path to the directory the
+        reports are written to.
+        @type pathToCompressedReports: String
+        @param includeUserDefinedModules: If True then user defined
+        reports/plugins are enabled.
+        @type includeUserDefinedModules: Boolean
+        """
+        memberIndex = extractor.getMemberIndex()
+        if (memberIndex == None):
+            return None
+        extractorsLoader = ExtractorsLoader()
+        reportsLoader = ReportsLoader()
+        listOfNestedReports = []
+        for member in memberIndex.getMembers():
+            # Only the files in the root directory of the report are
+            # checked.
+            relativePath = extractor.getRelativePath(member.getName(), report.getStripDirectoriesDepth())
+            if ((not member.isFile()) or (not len(relativePath) > 0) or (relativePath.find("/") >= 0) or
+                (extractorsLoader.getExtractor(relativePath, includeUserDefinedModules) == None)):
+                continue
+            pathToNestedReport = os.path.join(pathToCompressedReports, relativePath)
+            if (os.path.exists(pathToNestedReport)):
+                message = "The file already exists and the file will be extracted with the %s: %s." %(report.getName(), pathToNestedReport)
+                logging.getLogger(sx.MAIN_LOGGER_NAME).debug(message)
+                continue
+            elif (not extractor.extractMemberToFile(member, pathToNestedReport)):
+                if (os.path.exists(pathToNestedReport)):
+                    os.remove(pathToNestedReport)
+                if (not len(listOfNestedReports) > 0):
+                    return None
+                message = "The file could not be written and will be extracted with the %s: %s." %(report.getName(), relativePath)
+                logging.getLogger(sx.MAIN_LOGGER_NAME).warning(message)
+                continue
+            elif (reportsLoader.getReport(pathToNestedReport, includeUserDefinedModules) == None):
+                # The file is not a report so it is extracted with the report.
+                os.remove(pathToNestedReport)
+                continue
+            extractor.getExclusionPolicy().skip(relativePath, member.getSize(), ExclusionPolicy.REASON_NESTED_REPORT)
+            listOfNestedReports.append(pathToNestedReport)
+        if (len(listOfNestedReports) > 0):
+            message = "The %s contains %d reports that will be extracted: %s" %(report.getName(), len(listOfNestedReports),
+                                                                                extractor.getPathToFile())
+            logging.getLogger(sx.MAIN_LOGGER_NAME).status(message)
+        return listOfNestedReports
+
+    def __writeNestedReportsMap(self, pathToExtractedReports, listOfReports):
+        """
+        Adds the reports that were in another report to the file that
+        maps the name of each extracted report to the name of the
+        report it was in, so that the relationship is known when the
+        reports are loaded again.
+
+        @param pathToExtractedReports: The path to the extracted reports
+        directory.
+        @type pathToExtractedReports: String
+        @param listOfReports: The list of reports that were extracted.
+        @type listOfReports: Array
+        """
+        nestedReportsMap = self.__readNestedReportsMap(pathToExtractedReports)
+        for report in listOfReports:
+            if (not report.getParentReport() == None):
+                nestedReportsMap[os.path.basename(report.getPathToExtractedReport())] = os.path.basename(report.getParentReport().getPathToExtractedReport())
+        if (not len(nestedReportsMap.keys()) > 0):
+            return
+        pathToNestedReportsMap = os.path.join(pathToExtractedReports, SXConsole.NESTED_REPORTS_FILENAME)
+        try:
+            fout = open(pathToNestedReportsMap, "w")
+            try:
+                json.dump(nestedReportsMap, fout, encoding="latin-1")
+            finally:
+                fout.close()
+        except (IOError, os.error, UnicodeError):
+            message = "There was an error writing the file: %s." %(pathToNestedReportsMap)
+            logging.getLogger(sx.MAIN_LOGGER_NAME).error(message)
+
+    def __readNestedReportsMap(self, pathToExtractedReports):
+        """
+        Returns a map of the name of each extracted report that was in
+        another report to the name of the report it was in. An empty map
+        is returned if no report was in another report.
+
+        @return: Returns a map of the name of each extracted report that
+        was in another report to the name of the report it was in.
+        @rtype: Dictionary
+
+        @param pathToExtractedReports: The path to the extracted reports
+        directory.
+        @type pathToExtractedReports: String
+        """
+        nestedReportsMap = {}
+        pathToNestedReportsMap = os.path.join(pathToExtractedReports, SXConsole.NESTED_REPORTS_FILENAME)
+        if (not os.path.isfile(pathToNestedReportsMap)):
+            return nestedReportsMap
+        try:
+            fin = open(pathToNestedReportsMap, "r")
+            try:
+                for (childName, parentName) in json.load(fin).items():
+                    nestedReportsMap[childName.encode("latin-1")] = parentName.encode("latin-1")
+            finally:
+                fin.close()
+        except (IOError, os.error, ValueError, AttributeError, UnicodeError):
+            message = "There was an error reading the file: %s." %(pathToNestedReportsMap)
+            logging.getLogger(sx.MAIN_LOGGER_NAME).debug(message)
+        return nestedReportsMap
+
+    def __open(self, listOfUnopenedReports, pathToCompressedReports,
+               pathToExtractedReports, includeUserDefinedModules):
+        """
+        This function will open all the reports in the array if they
+        are a known type so that the files are read from the report
+        files instead of being extracted. The report files are not
+        moved. Reports that contain other reports are extracted since the
+        reports in them have to be extracted as well.
+
+        @return: Returns a list of all the report objects that were
+        successfully opened or extracted.
+        @rtype: Array
+
+        @param listOfUnopenedReports: An array of all the reports to
+        attempt to open.
+        @type listOfUnopenedReports: List
+        @param includeUserDefinedModules: If True then user defined
+        reports/plugins are enabled.
+        @type includeUserDefinedModules: Boolean
+        """
+        listOfReports = []
+        listOfReportsToExtract = []
+        extractorsLoader = ExtractorsLoader()
+        reportsLoader = ReportsLoader()
+        for pathToFilename in listOfUnopenedReports:
+            report = reportsLoader.getReport(pathToFilename, includeUserDefinedModules)
+            if (report == None):
+                continue
+            elif (report.includesOtherReports()):
+                listOfReportsToExtract.append(pathToFilename)
+                continue
+            extractor = extractorsLoader.getExtractor(pathToFilename, includeUserDefinedModules)
+            if (report.openArchive(extractor)):
+                listOfReports.append(report)
+            else:
+                message = "There was an error opening the report: %s." %(pathToFilename)
+                logging.getLogger(sx.MAIN_LOGGER_NAME).error(message)
+        if (len(listOfReportsToExtract) > 0):
+            message = "There was %d reports that contain other reports that will be extracted." %(len(listOfReportsToExtract))
+            logging.getLogger(sx.MAIN_LOGGER_NAME).info(message)
+            listOfReports += self.__extract(listOfReportsToExtract, pathToCompressedReports,
+                                            pathToExtractedReports, includeUserDefinedModules)
         return listOfReports
 
     def __load(self, pathToExtractedReports, includeUserDefinedModules):
@@ -361,49 +775,38 @@ class SXConsole:
                 continue
             else:
                 pathToFilename = os.path.join(pathToExtractedReports, filename)
+                # The manifest of the report is used if there is one so the
+                # report does not have to be searched to find its type.
+                report = None
+                manifestMap = Report.readManifest(pathToFilename)
+                if (not manifestMap == None):
+                    report = reportsLoader.getReportByName(manifestMap.get("name"), includeUserDefinedModules)
+                if (not report == None):
+                    report.setPathToExtractedReport(pathToFilename)
+                    report.setManifestAttributes(manifestMap.get("attributes"))
+                    listOfReports.append(report)
+                    continue
                 report = reportsLoader.getReport(pathToFilename, includeUserDefinedModules)
                 if (not report == None) :
                     report.setPathToExtractedReport(pathToFilename)
                     listOfReports.append(report)
+                    # Write the manifest so the report is not searched the
+                    # next time it is loaded.
+                    report.writeManifest()
+        # Set the report that each report was in.
+        nestedReportsMap = self.__readNestedReportsMap(pathToExtractedReports)
+        reportsMap = {}
+        for report in listOfReports:
+            reportsMap[os.path.basename(report.getPathToExtractedReport())] = report
+        for report in listOfReports:
+            parentName = nestedReportsMap.get(os.path.basename(report.getPathToExtractedReport()))
+            if (reportsMap.has_key(parentName)):
+                report.setParentReport(reportsMap.get(parentName))
         return listOfReports
 
     # ##############################################################################
-    # Helper functions for moving files to different location.
+    # Helper functions for finding the report files.
     # ##############################################################################
-    def __moveReport(self, src, dst):
-        """
-        This function will move the file file that will be extracted
-        to a new location. If there is a file that already exists for
-        that path then then the file will not be moved or overwrite
-        the existing file.
-
-        @return: Returns True if a file exists for the provided dst
-        path. Returns False if file does not exist.
-        @rtype: String
-
-        @param dst: Path to location where the extractor file will be
-        moved to.
-        @type dst: String
-        """
-        # The directories should be created before moving.
-        if (not os.path.exists(src)):
-            message = "The file does not exist: %s." %(src)
-            logging.getLogger(sx.MAIN_LOGGER_NAME).error(message)
-            return False
-        elif (os.path.exists(dst)):
-            message = "The file already exists and will not overwrite the existing file: %s." %(dst)
-            logging.getLogger(sx.MAIN_LOGGER_NAME).debug(message)
-        else:
-            try:
-                shutil.move(src, dst)
-            except (IOError, os.error):
-                message = "Cannot move the file %s to %s." %(src, dst)
-                logging.getLogger(sx.MAIN_LOGGER_NAME).error(message)
-        # If the file exists then return True and set the new path to file.
-        if (os.path.isfile(dst)):
-            return True
-        return False
-
     def __getListOfReports(self, cmdLineListOfReports, cmdLineReportPath):
         """
         This function returns a list of paths to reports based on
@@ -463,41 +866,53 @@ class SXConsole:
         return listOfReports
 
 
+    def __removeEmptyDir(self, pathToDir):
+        """
+        Removes the directory if it is empty. The directory is not
+        walked to count the files since rmdir fails if the directory is
+        not empty.
+
+        @param pathToDir: The path to the directory.
+        @type pathToDir: String
+        """
+        try:
+            os.rmdir(pathToDir)
+        except OSError:
+            message = "There was an error removing the non-empty directory: %s." %(pathToDir)
+            logging.getLogger(sx.MAIN_LOGGER_NAME).debug(message)
+
     def __cleanup(self, listOfReportsExtracted):
         # #######################################################################
         # Remove the compressed and extraction directory since nothing was
         # extracted and we do not want empty directories. This is ran after the
         # run() method is ran.
         # #######################################################################
-        # Remove the compressed directory if it is empty.
-        if ((os.path.exists(self.__al.getPathToCompressedReports())) and (not len(listOfReportsExtracted) > 0)):
-            if (not FileUtil.dirFileCount(self.__al.getPathToCompressedReports()) > 0):
-                try:
-                    os.rmdir(self.__al.getPathToCompressedReports())
-                except OSError:
-                    message = "There was an error removing the non-empty directory: %s." %(self.__al.getPathToCompressedReports())
-                    logging.getLogger(sx.MAIN_LOGGER_NAME).debug(message)
+        # Remove the compressed directory if it is empty. The report files
+        # are not moved when they are read without being extracted.
+        if ((os.path.exists(self.__al.getPathToCompressedReports())) and
+            ((not len(listOfReportsExtracted) > 0) or (self.__optionsMap.get("triage")))):
+            self.__removeEmptyDir(self.__al.getPathToCompressedReports())
         # Remove the extraction directory if it is empty.
         if ((os.path.exists(self.__al.getPathToExtractedReports())) and (not len(listOfReportsExtracted) > 0)):
-            if (not FileUtil.dirFileCount(self.__al.getPathToExtractedReports()) > 0):
-                try:
-                    os.rmdir(self.__al.getPathToExtractedReports())
-                except OSError:
-                    message = "There was an error removing the non-empty directory: %s." %(self.__al.getPathToExtractedReports())
-                    logging.getLogger(sx.MAIN_LOGGER_NAME).debug(message)
+            self.__removeEmptyDir(self.__al.getPathToExtractedReports())
         # #######################################################################
         # Remove all the temporary files created by the extraction. The
-        # temporary directory created by Extraction classes, usually directory
-        # /tmp/sx-*. All tarballs extract to here.
+        # directories are moved to the trash and removed in the background so
+        # that sxconsole does not wait on directories with a large number of
+        # files to be removed.
         # #######################################################################
-        Extractor.clean()
+        message = "The content cache had %d hits and %d misses for the files read from the reports." %(ContentCache.getHits(),
+                                                                                                    ContentCache.getMisses())
+        logging.getLogger(sx.MAIN_LOGGER_NAME).debug(message)
+        trashCan = TrashCan(self.__al.getPathToTrash())
+        Extractor.clean(trashCan)
         # #######################################################################
         # The plugins are done running and post-sxconsole action is done.
         # Remove tmp files since we are done with reportExtractor object
         # #######################################################################
         for report in listOfReportsExtracted:
-            report.clean()
-
+            report.clean(trashCan)
+        trashCan.empty()
 
     # #######################################################################
     # The main functino to do the setup, extraction and analyzing.
@@ -514,37 +929,59 @@ class SXConsole:
         listOfEnabledPlugins = []
         if (not self.__al == None):
             # #######################################################################
+            # Get list of enabled plugins so that only the files they read are
+            # extracted if selective extraction is enabled.
+            # #######################################################################
+            pluginsHelper = PluginsHelper()
+            listOfEnabledPlugins = pluginsHelper.getEnabledPluginsList(self.__al.getPathToExtractedReports(),
+                                                                       self.__optionsMap.get("enableAllPlugins"),
+                                                                       self.__optionsMap.get("disableAllPlugins"),
+                                                                       self.__optionsMap.get("enablePlugins"),
+                                                                       self.__optionsMap.get("disablePlugins"),
+                                                                       self.__getPluginOptions(self.__optionsMap.get("pluginOptions")),
+                                                                       (not self.__optionsMap.get("disableUserDefinedModules")))
+            listOfPathGlobs = None
+            if (self.__optionsMap.get("selectiveExtraction")):
+                listOfPathGlobs = pluginsHelper.getPathGlobs(listOfEnabledPlugins)
+                if (listOfPathGlobs == None):
+                    message = "All the files in the reports will be extracted since the enabled plugins require all the files."
+                    logging.getLogger(sx.MAIN_LOGGER_NAME).info(message)
+                else:
+                    message = "Only the files that the enabled plugins read will be extracted from the reports."
+                    logging.getLogger(sx.MAIN_LOGGER_NAME).info(message)
+            # #######################################################################
+            # Start the setup of the plugins that can be setup on each report as
+            # soon as it is extracted if the pipeline is enabled.
+            # #######################################################################
+            if ((self.__optionsMap.get("pipeline")) and (not len(self.__optionsMap.get("pathToExtractedReports")) > 0) and
+                (not self.__optionsMap.get("triage"))):
+                self.__pluginsPipeline = PluginsPipeline(listOfEnabledPlugins)
+                self.__pluginsPipeline.start()
+            # #######################################################################
             # Get the list of extracted reports that were extracted or loaded.
             # #######################################################################
             listOfReportsExtracted = self.__extractReports(self.__al,
                                                            self.__optionsMap.get("pathToExtractedReports"),
                                                            self.__optionsMap.get("listOfReports"),
                                                            self.__optionsMap.get("reportPath"),
-                                                           (not self.__optionsMap.get("disableUserDefinedModules")))
+                                                           (not self.__optionsMap.get("disableUserDefinedModules")),
+                                                           listOfPathGlobs)
 
             # Set archive location if there was reports load/extracted.
             if (len(listOfReportsExtracted) > 0):
                 # #######################################################################
                 # Run the plugins on the extracted reports
                 # #######################################################################
-                # Get list of enabled plugins.
-                pluginsHelper = PluginsHelper()
-                # For now this map is empty
-                listOfEnabledPlugins = pluginsHelper.getEnabledPluginsList(self.__al.getPathToExtractedReports(),
-                                                                           self.__optionsMap.get("enableAllPlugins"),
-                                                                           self.__optionsMap.get("disableAllPlugins"),
-                                                                           self.__optionsMap.get("enablePlugins"),
-                                                                           self.__optionsMap.get("disablePlugins"),
-                                                                           self.__getPluginOptions(self.__optionsMap.get("pluginOptions")),
-                                                                           (not self.__optionsMap.get("disableUserDefinedModules")))
                 # Print a list of enabled plugins.
                 if (len(listOfEnabledPlugins) > 0) :
                     message = "There was %d plugins enabled." %(len(listOfEnabledPlugins))
                     logging.getLogger(sx.MAIN_LOGGER_NAME).info(message)
                     # Generate map of all plugins reports that were created after they run.
-                    pluginsHelper.generatePluginReports(listOfReportsExtracted, listOfEnabledPlugins)
+                    pluginsHelper.generatePluginReports(listOfReportsExtracted, listOfEnabledPlugins, self.__pluginsPipeline)
                 else:
                     logging.getLogger(sx.MAIN_LOGGER_NAME).info("Skipping plugins since there was no plugins enabled.")
+            elif (not self.__pluginsPipeline == None):
+                self.__pluginsPipeline.close()
 
             self.__cleanup(listOfReportsExtracted)
             return listOfEnabledPlugins
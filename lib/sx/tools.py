@@ -18,6 +18,11 @@ import shutil
 import hashlib
 import datetime
 import textwrap
+import time
+import errno
+import fcntl
+import tempfile
+import threading
 
 # Import sx first so we can spit out message
 import sx
@@ -653,6 +658,418 @@ class FileUtil:
             logging.getLogger(sx.MAIN_LOGGER_NAME).error(message)
     touch = staticmethod(touch)
 
+class FileTransfer:
+    """
+    This class moves a file to another path. The file is renamed if the
+    paths are on the same file system, then it is hard linked or
+    reflinked, and the data is only copied if none of those work. The
+    data is copied by a thread so that the file can be read, such as by
+    an extractor, while it is copied. The source file is not removed
+    until the transfer is finished.
+
+    @cvar FICLONE: The ioctl request that creates a reflink of a file on
+    Linux.
+    @type FICLONE: Int
+    @cvar CHUNK_SIZE: The number of bytes that are copied at a time.
+    @type CHUNK_SIZE: Int
+    @cvar MAX_COPIES: The largest number of files that are copied at the
+    same time.
+    @type MAX_COPIES: Int
+    """
+    FICLONE = 0x40049409
+    CHUNK_SIZE = 4 * 1048576
+    MAX_COPIES = 2
+    METHOD_RENAME = "rename"
+    METHOD_HARDLINK = "hardlink"
+    METHOD_REFLINK = "reflink"
+    METHOD_COPY = "copy"
+    METHOD_MOVE = "move"
+    # Limits the number of files that are copied at the same time.
+    __copySemaphore = threading.BoundedSemaphore(MAX_COPIES)
+
+    def __init__(self, pathToSrc, pathToDst):
+        """
+        @param pathToSrc: The path to the file that will be moved.
+        @type pathToSrc: String
+        @param pathToDst: The path the file will be moved to.
+        @type pathToDst: String
+        """
+        self.__pathToSrc = pathToSrc
+        self.__pathToDst = pathToDst
+        # The method that is used to move the file. Empty string means the
+        # transfer was not started.
+        self.__method = ""
+        self.__thread = None
+        self.__pathToTmpFile = ""
+        self.__isCancelled = False
+        self.__isCopied = False
+        self.__bytesCopied = 0
+        self.__elapsedTime = 0.0
+
+    def __str__(self):
+        return "%s -> %s" %(self.__pathToSrc, self.__pathToDst)
+
+    def getPathToSrc(self):
+        return self.__pathToSrc
+
+    def getPathToDst(self):
+        return self.__pathToDst
+
+    def getMethod(self):
+        return self.__method
+
+    def getBytesCopied(self):
+        return self.__bytesCopied
+
+    def getThroughput(self):
+        """
+        Returns the number of bytes copied a second. 0 is returned if
+        the data was not copied.
+
+        @return: Returns the number of bytes copied a second.
+        @rtype: Float
+        """
+        if (not self.__elapsedTime > 0):
+            return 0.0
+        return self.__bytesCopied / self.__elapsedTime
+
+    def reflink(pathToSrcFile, pathToDstFile):
+        """
+        Returns True if a reflink of the file was created. The file
+        system has to support reflinks.
+
+        @return: Returns True if a reflink of the file was created.
+        @rtype: Boolean
+
+        @param pathToSrcFile: The path to the file.
+        @type pathToSrcFile: String
+        @param pathToDstFile: The path to the reflink that is created.
+        @type pathToDstFile: String
+        """
+        try:
+            fin = open(pathToSrcFile, "rb")
+            try:
+                fout = open(pathToDstFile, "wb")
+                try:
+                    fcntl.ioctl(fout.fileno(), FileTransfer.FICLONE, fin.fileno())
+                finally:
+                    fout.close()
+            finally:
+                fin.close()
+            return True
+        except (IOError, os.error):
+            if (os.path.exists(pathToDstFile)):
+                try:
+                    os.remove(pathToDstFile)
+                except OSError:
+                    pass
+        return False
+    reflink = staticmethod(reflink)
+
+    def __startTransfer(self):
+        """
+        Creates the destination file without changing the source
+        file. A hard link is used if possible, then a reflink, and then
+        the data is copied by a thread. Returns True if the transfer was
+        started.
+
+        @return: Returns True if the transfer was started.
+        @rtype: Boolean
+        """
+        if (os.path.isdir(self.__pathToSrc)):
+            # Directories are moved when the transfer is finished.
+            self.__method = FileTransfer.METHOD_MOVE
+            return True
+        try:
+            os.link(self.__pathToSrc, self.__pathToDst)
+            self.__method = FileTransfer.METHOD_HARDLINK
+            return True
+        except OSError:
+            pass
+        if (FileTransfer.reflink(self.__pathToSrc, self.__pathToDst)):
+            self.__method = FileTransfer.METHOD_REFLINK
+            return True
+        (head, tail) = os.path.split(self.__pathToDst)
+        try:
+            # The data is copied to a temporary file so that a partial
+            # file is never at the destination path.
+            (fd, self.__pathToTmpFile) = tempfile.mkstemp(prefix=".%s." %(tail), dir=head)
+            os.close(fd)
+        except (IOError, os.error):
+            message = "Cannot create the file to copy %s to in the directory: %s." %(self.__pathToSrc, head)
+            logging.getLogger(sx.MAIN_LOGGER_NAME).error(message)
+            return False
+        self.__method = FileTransfer.METHOD_COPY
+        self.__thread = threading.Thread(target=self.__copy)
+        self.__thread.setDaemon(True)
+        self.__thread.start()
+        return True
+
+    def __copy(self):
+        """
+        Copies the data of the source file to the temporary file. This
+        function is ran by the thread that copies the file.
+        """
+        FileTransfer.__copySemaphore.acquire()
+        try:
+            startTime = time.time()
+            try:
+                fin = open(self.__pathToSrc, "rb")
+                try:
+                    fout = open(self.__pathToTmpFile, "wb")
+                    try:
+                        while (not self.__isCancelled):
+                            data = fin.read(FileTransfer.CHUNK_SIZE)
+                            if (not len(data) > 0):
+                                break
+                            fout.write(data)
+                            self.__bytesCopied += len(data)
+                    finally:
+                        fout.close()
+                finally:
+                    fin.close()
+                shutil.copystat(self.__pathToSrc, self.__pathToTmpFile)
+                self.__isCopied = (not self.__isCancelled)
+            except (IOError, os.error):
+                self.__isCopied = False
+            self.__elapsedTime = time.time() - startTime
+        finally:
+            FileTransfer.__copySemaphore.release()
+
+    def __join(self):
+        if (not self.__thread == None):
+            # A timeout is required so that control-c is not ignored while
+            # waiting on the thread.
+            while (self.__thread.isAlive()):
+                self.__thread.join(1)
+
+    def start(self):
+        """
+        Starts the transfer. The source file is not changed until the
+        transfer is finished so it can be read while the transfer is
+        running. Returns False if the source file does not exist, the
+        destination path exists, or the transfer could not be started.
+
+        @return: Returns True if the transfer was started.
+        @rtype: Boolean
+        """
+        if (not os.path.exists(self.__pathToSrc)):
+            message = "The file does not exist: %s." %(self.__pathToSrc)
+            logging.getLogger(sx.MAIN_LOGGER_NAME).error(message)
+            return False
+        elif (os.path.lexists(self.__pathToDst)):
+            message = "The file already exists and will not overwrite the existing file: %s." %(self.__pathToDst)
+            logging.getLogger(sx.MAIN_LOGGER_NAME).debug(message)
+            return False
+        try:
+            if (os.stat(self.__pathToSrc).st_dev == os.stat(os.path.dirname(os.path.abspath(self.__pathToDst))).st_dev):
+                # The file is renamed when the transfer is finished.
+                self.__method = FileTransfer.METHOD_RENAME
+                return True
+        except OSError:
+            message = "Cannot move the file %s to %s." %(self.__pathToSrc, self.__pathToDst)
+            logging.getLogger(sx.MAIN_LOGGER_NAME).error(message)
+            return False
+        return self.__startTransfer()
+
+    def finish(self):
+        """
+        Waits for the data to be copied, moves the file to the
+        destination path and removes the source file. Returns True if
+        the file is at the destination path.
+
+        @return: Returns True if the file is at the destination path.
+        @rtype: Boolean
+        """
+        if (self.__method == FileTransfer.METHOD_RENAME):
+            try:
+                os.rename(self.__pathToSrc, self.__pathToDst)
+                return True
+            except OSError:
+                # The paths could be on different mounts of the same file
+                # system.
+                if (not self.__startTransfer()):
+                    return False
+        if (self.__method == FileTransfer.METHOD_MOVE):
+            try:
+                shutil.move(self.__pathToSrc, self.__pathToDst)
+                return True
+            except (IOError, os.error):
+                message = "Cannot move the file %s to %s." %(self.__pathToSrc, self.__pathToDst)
+                logging.getLogger(sx.MAIN_LOGGER_NAME).error(message)
+                return False
+        elif (self.__method == FileTransfer.METHOD_COPY):
+            self.__join()
+            try:
+                if (not self.__isCopied):
+                    raise IOError(errno.EIO, "The file was not copied.")
+                os.rename(self.__pathToTmpFile, self.__pathToDst)
+            except (IOError, os.error):
+                message = "Cannot copy the file %s to %s." %(self.__pathToSrc, self.__pathToDst)
+                logging.getLogger(sx.MAIN_LOGGER_NAME).error(message)
+                self.cancel()
+                return False
+            message = "The file was copied in %.1f seconds(%s/s): %s." %(self.__elapsedTime,
+                                                                         FileUtil.convertBytesToString(self.getThroughput()),
+                                                                         self.__pathToDst)
+            logging.getLogger(sx.MAIN_LOGGER_NAME).info(message)
+        elif (not self.__method in [FileTransfer.METHOD_HARDLINK, FileTransfer.METHOD_REFLINK]):
+            return False
+        try:
+            os.remove(self.__pathToSrc)
+        except OSError:
+            message = "The file was moved, but the source file could not be removed: %s." %(self.__pathToSrc)
+            logging.getLogger(sx.MAIN_LOGGER_NAME).warning(message)
+        return True
+
+    def cancel(self):
+        """
+        Stops the transfer and removes any file that was created at the
+        destination path. The source file is not changed.
+        """
+        if (self.__method == FileTransfer.METHOD_COPY):
+            self.__isCancelled = True
+            self.__join()
+            if (os.path.exists(self.__pathToTmpFile)):
+                try:
+                    os.remove(self.__pathToTmpFile)
+                except OSError:
+                    pass
+        elif ((self.__method in [FileTransfer.METHOD_HARDLINK, FileTransfer.METHOD_REFLINK]) and
+              (os.path.exists(self.__pathToDst))):
+            try:
+                os.remove(self.__pathToDst)
+            except OSError:
+                pass
+        self.__method = ""
+
+    def move(pathToSrc, pathToDst):
+        """
+        Moves the file to the destination path and returns True if the
+        file is at the destination path.
+
+        @return: Returns True if the file is at the destination path.
+        @rtype: Boolean
+
+        @param pathToSrc: The path to the file that will be moved.
+        @type pathToSrc: String
+        @param pathToDst: The path the file will be moved to.
+        @type pathToDst: String
+        """
+        fileTransfer = FileTransfer(pathToSrc, pathToDst)
+        if (not fileTransfer.start()):
+            return False
+        return fileTransfer.finish()
+    move = staticmethod(move)
+
+class TrashCan:
+    """
+    This class removes directory trees in the background so that the
+    time it takes to remove a tree with a large number of files is not
+    added to the run. A tree is renamed into the trash directory, which
+    is fast since no files are removed, and the trash directory is
+    emptied by a process that keeps running after sxconsole exits. A
+    tree that is left in the trash directory because the process was
+    stopped is removed the next time the trash directory is emptied.
+    """
+    def __init__(self, pathToTrash):
+        """
+        @param pathToTrash: The path to the trash directory.
+        @type pathToTrash: String
+        """
+        self.__pathToTrash = pathToTrash
+        # The trees that could not be renamed into the trash directory
+        # which are removed where they are.
+        self.__listOfPaths = []
+        self.__count = 0
+
+    def __str__(self):
+        return self.__pathToTrash
+
+    def getPathToTrash(self):
+        return self.__pathToTrash
+
+    def add(self, pathToDir):
+        """
+        Moves the directory tree to the trash directory so that it is
+        removed when the trash directory is emptied. If the tree cannot
+        be renamed into the trash directory, such as when it is on
+        another file system, then it is removed where it is.
+
+        @param pathToDir: The path to the directory tree.
+        @type pathToDir: String
+        """
+        if (not os.path.lexists(pathToDir)):
+            return
+        self.__count += 1
+        pathToTrashedDir = os.path.join(self.__pathToTrash, "%s.%d.%d" %(os.path.basename(pathToDir.rstrip("/")),
+                                                                         os.getpid(), self.__count))
+        try:
+            if (not os.path.isdir(self.__pathToTrash)):
+                os.makedirs(self.__pathToTrash)
+            os.rename(pathToDir, pathToTrashedDir)
+        except OSError:
+            self.__listOfPaths.append(pathToDir)
+
+    def __remove(listOfPaths):
+        for path in listOfPaths:
+            if ((os.path.isdir(path)) and (not os.path.islink(path))):
+                shutil.rmtree(path, ignore_errors=True)
+            else:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+    __remove = staticmethod(__remove)
+
+    def empty(self, background=True):
+        """
+        Removes the trees in the trash directory, which includes any
+        tree that was left by an earlier run, and the trees that could
+        not be renamed into the trash directory.
+
+        @param background: If True then the trees are removed by a
+        process that is not waited on. The trees are removed before this
+        function returns if the process cannot be created.
+        @type background: Boolean
+        """
+        listOfPaths = self.__listOfPaths
+        self.__listOfPaths = []
+        if (os.path.isdir(self.__pathToTrash)):
+            try:
+                for filename in os.listdir(self.__pathToTrash):
+                    listOfPaths.append(os.path.join(self.__pathToTrash, filename))
+            except OSError:
+                pass
+        if (not len(listOfPaths) > 0):
+            return
+        if (background):
+            try:
+                pid = os.fork()
+            except OSError:
+                pid = -1
+            if (pid == 0):
+                # The process that removes the trees is forked from a new
+                # session so that it is not waited on and is not stopped
+                # with sxconsole.
+                try:
+                    os.setsid()
+                    if (os.fork() == 0):
+                        devnull = os.open(os.devnull, os.O_RDWR)
+                        for fd in [0, 1, 2]:
+                            os.dup2(devnull, fd)
+                        os.closerange(3, 1024)
+                        TrashCan.__remove(listOfPaths)
+                except:
+                    pass
+                os._exit(0)
+            elif (pid > 0):
+                os.waitpid(pid, 0)
+                message = "There was %d directories that will be removed in the background." %(len(listOfPaths))
+                logging.getLogger(sx.MAIN_LOGGER_NAME).debug(message)
+                return
+        TrashCan.__remove(listOfPaths)
+
 class StringUtil:
 
     def wrapParagraph(s, width=98, newline=True):
@@ -20,7 +20,7 @@ if __name__ == "__main__":
         url="https://fedorahosted.org/sx",
         description="Tool to extract reports and run plug-ins against those extracted reports.",
         license="GPLv2",
-        packages=["sx", "sx.plugins", "sx.plugins.lib",  "sx.reports", "sx.extractors",
+        packages=["sx", "sx.plugins", "sx.plugins.lib",  "sx.reports", "sx.reports.lib", "sx.extractors", "sx.extractors.lib",
                   "sx.plugins.lib.clusterha", "sx.plugins.lib.storage", "sx.plugins.lib.log",
                   "sx.plugins.lib.kernel", "sx.plugins.lib.networking", "sx.plugins.lib.general",
                   "sx.plugins.lib.rpm", "sx.plugins.lib.gluster"],